@@ -21,19 +21,104 @@ class Settings:
     # Server configuration
     HOST: str = os.getenv("HOST", "0.0.0.0")
     PORT: int = int(os.getenv("PORT", "8000"))
+    WORKERS: int = int(os.getenv("WORKERS", "0"))  # run.py --production; 0 = one per CPU
+    KEEP_ALIVE_SECONDS: int = int(os.getenv("KEEP_ALIVE_SECONDS", "75"))  # longer than a load balancer's idle timeout
+    SERVER_BACKLOG: int = int(os.getenv("SERVER_BACKLOG", "4096"))  # pending connections the socket queues
+    SHUTDOWN_GRACE_SECONDS: int = int(os.getenv("SHUTDOWN_GRACE_SECONDS", "30"))  # for in-flight requests and syncs to wind down
     
     # Sync configuration
     SYNC_INTERVAL_SECONDS: int = int(os.getenv("SYNC_INTERVAL_SECONDS", "300"))  # 5 minutes
     AUTO_SYNC_ENABLED: bool = os.getenv("AUTO_SYNC_ENABLED", "False").lower() == "true"
+    DRIFT_CHECK_INTERVAL_SECONDS: int = int(os.getenv("DRIFT_CHECK_INTERVAL_SECONDS", "0"))  # 0 = disabled
+    SYNC_DIRECTION: str = os.getenv("SYNC_DIRECTION", "one_way")  # "one_way" or "bidirectional" (three-way merge)
+    MERGE_CONFLICT_POLICY: str = os.getenv("MERGE_CONFLICT_POLICY", "source")  # "source", "destination" or "newest"
+
+    # Storage configuration
+    DB_BACKEND: str = os.getenv("DB_BACKEND", "sqlite")  # "sqlite" (shared across workers) or "memory"
+    DATABASE_PATH: str = os.getenv("DATABASE_PATH", "task_sync.db")
+
+    # Warm-start snapshot of the memory store (DB_BACKEND=memory); empty disables
+    SNAPSHOT_PATH: str = os.getenv("SNAPSHOT_PATH", "task_sync.snapshot")
+    SNAPSHOT_INTERVAL_SECONDS: int = int(os.getenv("SNAPSHOT_INTERVAL_SECONDS", "60"))  # min time between writes
+
+    # Snapshot diff: "merkle", "numpy" (needs NumPy) or "auto" (numpy from DIFF_VECTOR_MIN_TASKS up)
+    DIFF_MODE: str = os.getenv("DIFF_MODE", "auto")
+    DIFF_VECTOR_MIN_TASKS: int = int(os.getenv("DIFF_VECTOR_MIN_TASKS", "50000"))
+
+    # Sharded planning: convert and diff in this many processes (GitHub to GitHub); 0 or 1 = off
+    SYNC_SHARDS: int = int(os.getenv("SYNC_SHARDS", "0"))
+    PUSH_RATE_PER_MINUTE: int = int(os.getenv("PUSH_RATE_PER_MINUTE", "0"))  # destination writes, 0 = unpaced
+    PUSH_DEADLINE_SECONDS: int = int(os.getenv("PUSH_DEADLINE_SECONDS", "0"))  # per sync; the rest carries over, 0 = none
+
+    # Dead-letter queue for failed pushes: retry backoff doubles from the base up to the max
+    DLQ_MAX_ATTEMPTS: int = int(os.getenv("DLQ_MAX_ATTEMPTS", "5"))  # then quarantined until replayed
+    DLQ_RETRY_BASE_SECONDS: int = int(os.getenv("DLQ_RETRY_BASE_SECONDS", "60"))
+    DLQ_RETRY_MAX_SECONDS: int = int(os.getenv("DLQ_RETRY_MAX_SECONDS", "3600"))
+    DLQ_RETRY_INTERVAL_SECONDS: int = int(os.getenv("DLQ_RETRY_INTERVAL_SECONDS", "0"))  # targeted retries between syncs, 0 = off
+
+    # Change log of applied changes (/api/changes); empty disables
+    CHANGE_LOG_DIR: str = os.getenv("CHANGE_LOG_DIR", "change_log")
+    CHANGE_LOG_SEGMENT_BYTES: int = int(os.getenv("CHANGE_LOG_SEGMENT_BYTES", str(16 * 1024 * 1024)))
+    CHANGE_LOG_RETENTION_BYTES: int = int(os.getenv("CHANGE_LOG_RETENTION_BYTES", str(1024 * 1024 * 1024)))  # 0 = no size limit
+    CHANGE_LOG_RETENTION_HOURS: float = float(os.getenv("CHANGE_LOG_RETENTION_HOURS", "168"))  # 0 = no age limit
+    CHANGE_LOG_COMPACT: bool = os.getenv("CHANGE_LOG_COMPACT", "True").lower() == "true"  # latest record per task in closed segments
+
+    # Incremental source fetches (only issues updated since the high-water mark)
+    INCREMENTAL_FETCH: str = os.getenv("INCREMENTAL_FETCH", "auto")  # "auto" (memory store with a snapshot), "on" or "off"
+    INCREMENTAL_FULL_FETCH_SECONDS: int = int(os.getenv("INCREMENTAL_FULL_FETCH_SECONDS", "3600"))  # full fetch (sees deletions) at least this often
+
+    # Write-ahead journal of push operations (lets interrupted syncs resume)
+    JOURNAL_DIR: str = os.getenv("JOURNAL_DIR", "sync_journal")
+    JOURNAL_CHECKPOINT_EVERY: int = int(os.getenv("JOURNAL_CHECKPOINT_EVERY", "20"))  # fsync interval (ops)
+
+    # Leader election (only the lease holder runs scheduled syncs)
+    LEADER_LEASE_SECONDS: int = int(os.getenv("LEADER_LEASE_SECONDS", str(SYNC_INTERVAL_SECONDS * 2)))
+    # Sync lock: one pushing run at a time across workers; renewed while held, expires if its worker dies
+    SYNC_LOCK_SECONDS: int = int(os.getenv("SYNC_LOCK_SECONDS", "60"))
     
     # Source and destination configuration (can be extended)
     SOURCE_API_URL: Optional[str] = os.getenv("SOURCE_API_URL")
     DESTINATION_API_URL: Optional[str] = os.getenv("DESTINATION_API_URL")
 
     # GitHub Integration
+    GITHUB_API_URL: str = os.getenv("GITHUB_API_URL", "https://api.github.com")  # GitHub Enterprise: https://host/api/v3
     GITHUB_TOKEN: Optional[str] = os.getenv("GITHUB_TOKEN")
+    GITHUB_TOKENS: Optional[str] = os.getenv("GITHUB_TOKENS")  # more tokens: "tok,tok@owner/repo|owner/other"
+    GITHUB_APP_ID: Optional[str] = os.getenv("GITHUB_APP_ID")
+    GITHUB_APP_PRIVATE_KEY_PATH: Optional[str] = os.getenv("GITHUB_APP_PRIVATE_KEY_PATH")
+    GITHUB_APP_INSTALLATION_IDS: Optional[str] = os.getenv("GITHUB_APP_INSTALLATION_IDS")  # "id,id@owner/repo"
     GITHUB_SOURCE_REPO: Optional[str] = os.getenv("GITHUB_SOURCE_REPO")  # Format: "owner/repo"
     GITHUB_DEST_REPO: Optional[str] = os.getenv("GITHUB_DEST_REPO")  # Format: "owner/repo"
+    GITHUB_METADATA_TTL_SECONDS: int = int(os.getenv("GITHUB_METADATA_TTL_SECONDS", "600"))  # labels/milestones/assignees
+
+    # Outbound HTTP timeouts (seconds)
+    HTTP_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    HTTP_READ_TIMEOUT: float = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+
+    # Circuit breaker per integration endpoint (state in /api/health)
+    BREAKER_WINDOW: int = int(os.getenv("BREAKER_WINDOW", "20"))  # recent calls considered
+    BREAKER_MIN_CALLS: int = int(os.getenv("BREAKER_MIN_CALLS", "5"))
+    BREAKER_FAILURE_RATE: float = float(os.getenv("BREAKER_FAILURE_RATE", "0.5"))  # failed or slow share that opens it
+    BREAKER_SLOW_CALL_MS: int = int(os.getenv("BREAKER_SLOW_CALL_MS", "10000"))
+    BREAKER_OPEN_SECONDS: float = float(os.getenv("BREAKER_OPEN_SECONDS", "30"))  # before a half-open probe
+
+    # Page decoding / Task conversion pool: "inline", "thread" or "process"
+    CONVERT_POOL: str = os.getenv("CONVERT_POOL", "thread")
+    CONVERT_POOL_WORKERS: int = int(os.getenv("CONVERT_POOL_WORKERS", "0"))  # 0 = min(4, CPU count)
+
+    # Event-loop lag monitor (see /api/metrics/loop)
+    LOOP_MONITOR_ENABLED: bool = os.getenv("LOOP_MONITOR_ENABLED", "True").lower() == "true"
+    LOOP_MONITOR_INTERVAL_MS: int = int(os.getenv("LOOP_MONITOR_INTERVAL_MS", "50"))
+    LOOP_LAG_THRESHOLD_MS: int = int(os.getenv("LOOP_LAG_THRESHOLD_MS", "100"))  # stack captured beyond this
+
+    # On-demand sync profiles (POST /api/sync?profile=sample)
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", "sync_profiles")
+    PROFILE_KEEP: int = int(os.getenv("PROFILE_KEEP", "20"))
+    PROFILE_SAMPLE_INTERVAL_MS: int = int(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+
+    # Tracing spans (see /api/traces)
+    TRACE_BUFFER_SPANS: int = int(os.getenv("TRACE_BUFFER_SPANS", "20000"))  # ring buffer size, 0 = disabled
+    TRACE_EXPORT_DIR: str = os.getenv("TRACE_EXPORT_DIR", "")  # write each finished trace as OTLP/JSON
 
     # Integration mode
     SOURCE_TYPE: str = os.getenv("SOURCE_TYPE", "mock")  # "mock" or "github"
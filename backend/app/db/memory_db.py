@@ -3,18 +3,36 @@ In-memory database for Task Sync Engine
 Simple temporary storage - can be replaced with real database later
 """
 
-from typing import Dict, List, Optional
+import uuid
+from typing import Any, Dict, List, Optional
+from collections import deque
 from app.models.task import Task
+from app.services.merkle import task_digest
+from app.services.snapshot import EncodedTask, Snapshot, decode_task, read_snapshot, write_snapshot
 
 
 class MemoryDB:
     """
     Simple in-memory database for storing tasks
     This is a temporary solution for MVP - replace with PostgreSQL/MongoDB later
+
+    Contents can be saved to and restored from a snapshot file. Tasks
+    restored from a snapshot stay encoded until they are first read.
     """
     
-    def __init__(self):
+    def __init__(self, max_history: int = 100):
         self._tasks: Dict[str, Task] = {}
+        self._encoded: Dict[str, EncodedTask] = {}
+        self._high_water_marks: Dict[str, str] = {}
+        self._tombstones: Dict[str, str] = {}
+        self._id_mappings: Dict[str, str] = {}
+        self._base_tasks: Dict[str, Task] = {}
+        self._dead_letters: Dict[str, Dict[str, Any]] = {}
+        self._history = deque(maxlen=max_history)
+        self._total_syncs = 0
+        self._last_sync_time: Optional[str] = None
+        self._state_version = 0
+        self._store_id = uuid.uuid4().hex[:8]
     
     def save_task(self, task: Task) -> Task:
         """
@@ -26,9 +44,34 @@ class MemoryDB:
         Returns:
             Task: Saved task
         """
+        self._encoded.pop(task.id, None)
         self._tasks[task.id] = task
         return task
+
+    def save_tasks(self, tasks: List[Task]):
+        """
+        Save many tasks at once
+
+        Args:
+            tasks: Tasks to save
+        """
+        for task in tasks:
+            self._tasks[task.id] = task
+        if self._encoded:
+            for task in tasks:
+                self._encoded.pop(task.id, None)
     
+    def save_encoded_tasks(self, records: List[tuple]):
+        """
+        Save tasks that are already JSON-encoded (decoded when first read)
+
+        Args:
+            records: (task ID, content digest, task JSON bytes) per task
+        """
+        for task_id, digest, data in records:
+            self._tasks.pop(task_id, None)
+            self._encoded[task_id] = (digest, data)
+
     def get_task(self, task_id: str) -> Optional[Task]:
         """
         Get a task by ID
@@ -39,6 +82,8 @@ class MemoryDB:
         Returns:
             Task or None if not found
         """
+        if task_id in self._encoded:
+            self._tasks[task_id] = decode_task(self._encoded.pop(task_id))
         return self._tasks.get(task_id)
     
     def get_all_tasks(self) -> List[Task]:
@@ -48,7 +93,35 @@ class MemoryDB:
         Returns:
             List of all tasks
         """
+        if self._encoded:
+            for task_id, encoded in self._encoded.items():
+                self._tasks[task_id] = decode_task(encoded)
+            self._encoded.clear()
         return list(self._tasks.values())
+
+    def task_ids(self) -> List[str]:
+        """
+        Get the IDs of all tasks without decoding them
+
+        Returns:
+            list: Task IDs
+        """
+        return list(self._tasks) + list(self._encoded)
+
+    def task_digests(self) -> Dict[str, bytes]:
+        """
+        Content digest of every task (for the source Merkle tree)
+
+        Restored tasks use the digest stored in the snapshot, so they are
+        not decoded.
+
+        Returns:
+            dict: Task ID -> digest
+        """
+        digests = {task_id: digest for task_id, (digest, _) in self._encoded.items()}
+        for task in self._tasks.values():
+            digests[task.id] = task_digest(task)
+        return digests
     
     def delete_task(self, task_id: str) -> bool:
         """
@@ -60,14 +133,132 @@ class MemoryDB:
         Returns:
             bool: True if deleted, False if not found
         """
+        if self._encoded.pop(task_id, None) is not None:
+            return True
         if task_id in self._tasks:
             del self._tasks[task_id]
             return True
         return False
     
+    def delete_tasks(self, task_ids: List[str]):
+        """
+        Delete many tasks at once
+
+        Args:
+            task_ids: Task IDs
+        """
+        for task_id in task_ids:
+            self._tasks.pop(task_id, None)
+            self._encoded.pop(task_id, None)
+
+    def save_id_mappings(self, mappings: Dict[str, str]):
+        """
+        Remember which destination task each source task was pushed to
+
+        Args:
+            mappings: Source task ID -> destination task ID
+        """
+        self._id_mappings.update(mappings)
+
+    def get_id_mappings(self) -> Dict[str, str]:
+        """
+        Get all source -> destination ID mappings
+
+        Returns:
+            dict: Source task ID -> destination task ID
+        """
+        return dict(self._id_mappings)
+
+    def add_tombstones(self, task_ids: List[str], deleted_at: str):
+        """
+        Remember that tasks were deleted at the source
+
+        Args:
+            task_ids: Deleted task IDs
+            deleted_at: ISO timestamp of detection
+        """
+        for task_id in task_ids:
+            self._tombstones[task_id] = deleted_at
+
+    def get_tombstones(self) -> Dict[str, str]:
+        """
+        Get all tombstones
+
+        Returns:
+            dict: Task ID -> ISO deletion timestamp
+        """
+        return dict(self._tombstones)
+
+    def remove_tombstones(self, task_ids: List[str]):
+        """
+        Forget tombstones (task reappeared or tombstone expired)
+
+        Args:
+            task_ids: Task IDs
+        """
+        for task_id in task_ids:
+            self._tombstones.pop(task_id, None)
+
+    def save_base_tasks(self, tasks: Dict[str, Task]):
+        """
+        Remember the last-synced version of task pairs (bidirectional sync)
+
+        Args:
+            tasks: Source task ID -> merged task both sides now hold
+        """
+        self._base_tasks.update(tasks)
+
+    def get_base_tasks(self) -> Dict[str, Task]:
+        """
+        Get the last-synced version of every task pair
+
+        Returns:
+            dict: Source task ID -> base task
+        """
+        return dict(self._base_tasks)
+
+    def delete_base_tasks(self, task_ids: List[str]):
+        """
+        Forget base versions (pair deleted on one side)
+
+        Args:
+            task_ids: Source task IDs
+        """
+        for task_id in task_ids:
+            self._base_tasks.pop(task_id, None)
+
+    def save_dead_letters(self, entries: Dict[str, Dict[str, Any]]):
+        """
+        Add or replace dead-letter entries (failed pushes)
+
+        Args:
+            entries: Key -> entry
+        """
+        self._dead_letters.update(entries)
+
+    def get_dead_letters(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get every dead-letter entry
+
+        Returns:
+            dict: Key -> entry
+        """
+        return dict(self._dead_letters)
+
+    def delete_dead_letters(self, keys: List[str]):
+        """
+        Remove dead-letter entries (pushed or resolved)
+
+        Args:
+            keys: Entry keys
+        """
+        for key in keys:
+            self._dead_letters.pop(key, None)
+
     def clear(self):
         """Clear all tasks from the database"""
         self._tasks.clear()
+        self._encoded.clear()
     
     def count(self) -> int:
         """
@@ -76,4 +267,134 @@ class MemoryDB:
         Returns:
             int: Number of tasks
         """
-        return len(self._tasks)
+        return len(self._tasks) + len(self._encoded)
+
+    def set_high_water_marks(self, marks: Dict[str, Optional[str]]):
+        """
+        Update high-water marks (None removes a mark)
+
+        Args:
+            marks: Name -> ISO timestamp
+        """
+        for name, value in marks.items():
+            if value is None:
+                self._high_water_marks.pop(name, None)
+            else:
+                self._high_water_marks[name] = value
+
+    def get_high_water_marks(self) -> Dict[str, str]:
+        """
+        Get the high-water marks
+
+        Returns:
+            dict: Name -> ISO timestamp (e.g. "source": newest updated_at synced)
+        """
+        return dict(self._high_water_marks)
+
+    def load_snapshot(self, path: str) -> Optional[Snapshot]:
+        """
+        Replace the store's contents with a snapshot
+
+        Covers tasks, ID mappings, tombstones, high-water marks, base
+        versions and dead letters.
+
+        Args:
+            path: Snapshot file path
+
+        Returns:
+            Snapshot or None if there is no snapshot file
+
+        Raises:
+            ValueError: The snapshot is unreadable
+        """
+        snapshot = read_snapshot(path)
+        if snapshot is None:
+            return None
+        self._tasks = {}
+        self._encoded = snapshot.tasks
+        self._id_mappings = snapshot.id_mappings
+        self._tombstones = snapshot.tombstones
+        self._high_water_marks = snapshot.high_water_marks
+        self._base_tasks = {task_id: Task.model_validate(data) for task_id, data in snapshot.base_tasks.items()}
+        self._dead_letters = snapshot.dead_letters
+        return snapshot
+
+    def snapshot_writer(self, path: str):
+        """
+        Capture the current contents and return a function that writes them
+
+        The copies are taken immediately, so the returned writer can run in
+        a thread while the store keeps changing.
+
+        Args:
+            path: Snapshot file path
+
+        Returns:
+            callable: Writes the snapshot and returns its size in bytes
+        """
+        captured = (
+            dict(self._tasks), dict(self._encoded), dict(self._id_mappings),
+            dict(self._tombstones), dict(self._high_water_marks), dict(self._base_tasks),
+            dict(self._dead_letters)
+        )
+        return lambda: write_snapshot(path, *captured)
+
+    def record_sync(self, record: Dict[str, Any], completed_sync: bool = False):
+        """
+        Append a sync record to the history
+
+        Records of completed sync runs also bump the sync counter and last
+        sync time, whatever their push outcome.
+
+        Args:
+            record: Sync record (as stored in history)
+            completed_sync: Whether the record ends a full sync run
+                            (not an error, resume or dead-letter retry)
+        """
+        self._history.append(record)
+        if completed_sync:
+            self._total_syncs += 1
+            self._last_sync_time = record["timestamp"]
+
+    def get_history(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get the most recent sync records, oldest first
+
+        Args:
+            limit: Number of records to return
+
+        Returns:
+            list: Recent sync records
+        """
+        return list(self._history)[-limit:]
+
+    def bump_state_version(self) -> int:
+        """
+        Mark the sync state (tasks, history, counters) as changed
+
+        Returns:
+            int: New version
+        """
+        self._state_version += 1
+        return self._state_version
+
+    def get_state_version(self) -> str:
+        """
+        Get the sync state version (used for HTTP ETags)
+
+        Returns:
+            str: Store ID and version counter
+        """
+        return f"{self._store_id}.{self._state_version}"
+
+    def get_sync_counters(self) -> Dict[str, Any]:
+        """
+        Get the sync counters
+
+        Returns:
+            dict: total_syncs and last_sync_time (ISO string or None)
+        """
+        return {
+            "total_syncs": self._total_syncs,
+            "last_sync_time": self._last_sync_time
+        }
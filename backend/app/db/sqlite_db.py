@@ -0,0 +1,458 @@
+"""
+SQLite database for Task Sync Engine
+Persistent storage shared by every worker process on the same host
+"""
+
+import json
+import sqlite3
+import threading
+import uuid
+from typing import Any, Dict, List, Optional
+
+from app.models.task import Task
+from app.services.merkle import task_digest
+
+
+class SQLiteDB:
+    """
+    SQLite-backed task store
+
+    Drop-in replacement for MemoryDB. Tasks, sync history and engine
+    counters live in a single database file, so several uvicorn workers
+    pointed at the same file see the same state.
+    """
+
+    def __init__(self, path: str, max_history: int = 100):
+        self.path = path
+        self.max_history = max_history
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=30000")
+        self._init_schema()
+
+    def _init_schema(self):
+        """Create tables if they do not exist yet"""
+        with self._lock:
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id TEXT PRIMARY KEY,
+                    data TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS sync_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    record TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS engine_state (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+                CREATE TABLE IF NOT EXISTS id_mappings (
+                    source_id TEXT PRIMARY KEY,
+                    dest_id TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS tombstones (
+                    id TEXT PRIMARY KEY,
+                    deleted_at TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS base_tasks (
+                    id TEXT PRIMARY KEY,
+                    data TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS dead_letters (
+                    key TEXT PRIMARY KEY,
+                    entry TEXT NOT NULL
+                );
+                """
+            )
+            # Identifies this database file, so versions never repeat after a reset
+            self._conn.execute(
+                "INSERT OR IGNORE INTO engine_state (key, value) VALUES ('store_id', ?)",
+                (uuid.uuid4().hex[:8],)
+            )
+
+    def save_task(self, task: Task) -> Task:
+        """
+        Save a task to the database
+
+        Args:
+            task: Task to save
+
+        Returns:
+            Task: Saved task
+        """
+        self.save_tasks([task])
+        return task
+
+    def save_tasks(self, tasks: List[Task]):
+        """
+        Save many tasks in a single transaction
+
+        Args:
+            tasks: Tasks to save
+        """
+        self._write_many(
+            "INSERT INTO tasks (id, data) VALUES (?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET data = excluded.data",
+            [(task.id, task.model_dump_json()) for task in tasks]
+        )
+
+    def save_encoded_tasks(self, records: List[tuple]):
+        """
+        Save tasks that are already JSON-encoded, in a single transaction
+
+        Args:
+            records: (task ID, content digest, task JSON bytes) per task
+        """
+        self._write_many(
+            "INSERT INTO tasks (id, data) VALUES (?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET data = excluded.data",
+            [(task_id, data.decode("utf-8")) for task_id, _, data in records]
+        )
+
+    def _write_many(self, sql: str, rows: List[tuple]):
+        """Run one statement for many rows inside a single transaction"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(sql, rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        """
+        Get a task by ID
+
+        Args:
+            task_id: Task ID
+
+        Returns:
+            Task or None if not found
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return Task.model_validate_json(row[0]) if row else None
+
+    def get_all_tasks(self) -> List[Task]:
+        """
+        Get all tasks
+
+        Returns:
+            List of all tasks
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM tasks").fetchall()
+        return [Task.model_validate_json(row[0]) for row in rows]
+
+    def task_ids(self) -> List[str]:
+        """
+        Get the IDs of all tasks without decoding them
+
+        Returns:
+            list: Task IDs
+        """
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT id FROM tasks").fetchall()]
+
+    def task_digests(self) -> Dict[str, bytes]:
+        """
+        Content digest of every task (for the source Merkle tree)
+
+        Returns:
+            dict: Task ID -> digest
+        """
+        return {task.id: task_digest(task) for task in self.get_all_tasks()}
+
+    def delete_task(self, task_id: str) -> bool:
+        """
+        Delete a task by ID
+
+        Args:
+            task_id: Task ID
+
+        Returns:
+            bool: True if deleted, False if not found
+        """
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        return cursor.rowcount > 0
+
+    def delete_tasks(self, task_ids: List[str]):
+        """
+        Delete many tasks in a single transaction
+
+        Args:
+            task_ids: Task IDs
+        """
+        self._write_many("DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id in task_ids])
+
+    def save_id_mappings(self, mappings: Dict[str, str]):
+        """
+        Remember which destination task each source task was pushed to
+
+        Args:
+            mappings: Source task ID -> destination task ID
+        """
+        self._write_many(
+            "INSERT OR REPLACE INTO id_mappings (source_id, dest_id) VALUES (?, ?)",
+            list(mappings.items())
+        )
+
+    def get_id_mappings(self) -> Dict[str, str]:
+        """
+        Get all source -> destination ID mappings
+
+        Returns:
+            dict: Source task ID -> destination task ID
+        """
+        with self._lock:
+            return dict(self._conn.execute("SELECT source_id, dest_id FROM id_mappings").fetchall())
+
+    def add_tombstones(self, task_ids: List[str], deleted_at: str):
+        """
+        Remember that tasks were deleted at the source
+
+        Args:
+            task_ids: Deleted task IDs
+            deleted_at: ISO timestamp of detection
+        """
+        self._write_many(
+            "INSERT OR REPLACE INTO tombstones (id, deleted_at) VALUES (?, ?)",
+            [(task_id, deleted_at) for task_id in task_ids]
+        )
+
+    def get_tombstones(self) -> Dict[str, str]:
+        """
+        Get all tombstones
+
+        Returns:
+            dict: Task ID -> ISO deletion timestamp
+        """
+        with self._lock:
+            return dict(self._conn.execute("SELECT id, deleted_at FROM tombstones").fetchall())
+
+    def remove_tombstones(self, task_ids: List[str]):
+        """
+        Forget tombstones (task reappeared or tombstone expired)
+
+        Args:
+            task_ids: Task IDs
+        """
+        self._write_many("DELETE FROM tombstones WHERE id = ?", [(task_id,) for task_id in task_ids])
+
+    def save_base_tasks(self, tasks: Dict[str, Task]):
+        """
+        Remember the last-synced version of task pairs (bidirectional sync)
+
+        Args:
+            tasks: Source task ID -> merged task both sides now hold
+        """
+        self._write_many(
+            "INSERT OR REPLACE INTO base_tasks (id, data) VALUES (?, ?)",
+            [(task_id, task.model_dump_json()) for task_id, task in tasks.items()]
+        )
+
+    def get_base_tasks(self) -> Dict[str, Task]:
+        """
+        Get the last-synced version of every task pair
+
+        Returns:
+            dict: Source task ID -> base task
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT id, data FROM base_tasks").fetchall()
+        return {task_id: Task.model_validate_json(data) for task_id, data in rows}
+
+    def delete_base_tasks(self, task_ids: List[str]):
+        """
+        Forget base versions (pair deleted on one side)
+
+        Args:
+            task_ids: Source task IDs
+        """
+        self._write_many("DELETE FROM base_tasks WHERE id = ?", [(task_id,) for task_id in task_ids])
+
+    def save_dead_letters(self, entries: Dict[str, Dict[str, Any]]):
+        """
+        Add or replace dead-letter entries (failed pushes)
+
+        Args:
+            entries: Key -> entry
+        """
+        self._write_many(
+            "INSERT OR REPLACE INTO dead_letters (key, entry) VALUES (?, ?)",
+            [(key, json.dumps(entry)) for key, entry in entries.items()]
+        )
+
+    def get_dead_letters(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get every dead-letter entry
+
+        Returns:
+            dict: Key -> entry
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT key, entry FROM dead_letters").fetchall()
+        return {key: json.loads(entry) for key, entry in rows}
+
+    def delete_dead_letters(self, keys: List[str]):
+        """
+        Remove dead-letter entries (pushed or resolved)
+
+        Args:
+            keys: Entry keys
+        """
+        self._write_many("DELETE FROM dead_letters WHERE key = ?", [(key,) for key in keys])
+
+    def clear(self):
+        """Clear all tasks from the database"""
+        with self._lock:
+            self._conn.execute("DELETE FROM tasks")
+
+    def count(self) -> int:
+        """
+        Count total tasks
+
+        Returns:
+            int: Number of tasks
+        """
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def set_high_water_marks(self, marks: Dict[str, Optional[str]]):
+        """
+        Update high-water marks (None removes a mark)
+
+        Args:
+            marks: Name -> ISO timestamp
+        """
+        self._write_many(
+            "INSERT INTO engine_state (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            [(f"hwm:{name}", value) for name, value in marks.items() if value is not None]
+        )
+        self._write_many(
+            "DELETE FROM engine_state WHERE key = ?",
+            [(f"hwm:{name}",) for name, value in marks.items() if value is None]
+        )
+
+    def get_high_water_marks(self) -> Dict[str, str]:
+        """
+        Get the high-water marks
+
+        Returns:
+            dict: Name -> ISO timestamp (e.g. "source": newest updated_at synced)
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM engine_state WHERE key LIKE 'hwm:%'").fetchall()
+        return {key[len("hwm:"):]: value for key, value in rows}
+
+    def record_sync(self, record: Dict[str, Any], completed_sync: bool = False):
+        """
+        Append a sync record to the shared history
+
+        Records of completed sync runs also bump the sync counter and last
+        sync time, whatever their push outcome.
+
+        Args:
+            record: Sync record (as stored in history)
+            completed_sync: Whether the record ends a full sync run
+                            (not an error, resume or dead-letter retry)
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("INSERT INTO sync_history (record) VALUES (?)", (json.dumps(record),))
+                self._conn.execute(
+                    "DELETE FROM sync_history WHERE id <= (SELECT MAX(id) FROM sync_history) - ?",
+                    (self.max_history,)
+                )
+                if completed_sync:
+                    self._conn.execute(
+                        "INSERT INTO engine_state (key, value) VALUES ('total_syncs', '1') "
+                        "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+                    )
+                    self._conn.execute(
+                        "INSERT INTO engine_state (key, value) VALUES ('last_sync_time', ?) "
+                        "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                        (record["timestamp"],)
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def get_history(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get the most recent sync records, oldest first
+
+        Args:
+            limit: Number of records to return
+
+        Returns:
+            list: Recent sync records
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT record FROM sync_history ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [json.loads(row[0]) for row in reversed(rows)]
+
+    def bump_state_version(self) -> int:
+        """
+        Mark the sync state (tasks, history, counters) as changed
+
+        The version lives in the shared file, so every worker derives the
+        same ETags from it.
+
+        Returns:
+            int: New version
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT INTO engine_state (key, value) VALUES ('state_version', '1') "
+                    "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+                )
+                version = self._conn.execute(
+                    "SELECT value FROM engine_state WHERE key = 'state_version'"
+                ).fetchone()[0]
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return int(version)
+
+    def get_state_version(self) -> str:
+        """
+        Get the sync state version (used for HTTP ETags)
+
+        Returns:
+            str: Store ID and version counter
+        """
+        with self._lock:
+            rows = dict(self._conn.execute(
+                "SELECT key, value FROM engine_state WHERE key IN ('store_id', 'state_version')"
+            ).fetchall())
+        return f"{rows.get('store_id')}.{rows.get('state_version') or 0}"
+
+    def get_sync_counters(self) -> Dict[str, Any]:
+        """
+        Get the shared sync counters
+
+        Returns:
+            dict: total_syncs and last_sync_time (ISO string or None)
+        """
+        with self._lock:
+            rows = dict(self._conn.execute(
+                "SELECT key, value FROM engine_state WHERE key IN ('total_syncs', 'last_sync_time')"
+            ).fetchall())
+        return {
+            "total_syncs": int(rows.get("total_syncs") or 0),
+            "last_sync_time": rows.get("last_sync_time")
+        }
@@ -3,12 +3,135 @@ GitHub Issues Integration
 Connects to GitHub API to fetch and sync issues
 """
 
+import asyncio
 import requests
-from typing import List, Optional
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 
+from app.config import settings
+from app.integrations.github_metadata import RepoMetadataCache
+from app.integrations.github_tokens import GITHUB_API_URL, Credential, NoCredentialError, TokenPool
 from app.models.task import Task
+from app.services import fast_json
+from app.services.circuit_breaker import circuit_breakers
 from app.services.logger import logger
+from app.services.task_converter import TaskConverter
+from app.services.tracing import tracer
+
+
+# Map GitHub state to our status
+STATUS_MAP = {
+    "open": "todo",
+    "closed": "done"
+}
+
+# Task fields an issue update writes, and the issue field each one maps to
+ISSUE_FIELDS = {
+    "title": "title",
+    "description": "body",
+    "status": "state"
+}
+
+# Labels that carry priority (matched case-insensitively)
+PRIORITY_LABELS = {
+    "priority: high": "high",
+    "urgent": "high",
+    "priority: low": "low"
+}
+
+# Labels attached when pushing a task of this priority
+PRIORITY_TO_LABEL = {
+    "high": "priority: high",
+    "low": "priority: low"
+}
+
+
+@lru_cache(maxsize=4096)
+def label_priority(name: str) -> Optional[str]:
+    """
+    Priority carried by a label name, if any (cached per distinct name)
+
+    Args:
+        name: Label name as returned by GitHub
+
+    Returns:
+        str or None: "high", "low" or None
+    """
+    return PRIORITY_LABELS.get(name.lower())
+
+
+def convert_issue_to_task(issue: dict) -> Task:
+    """
+    Convert a GitHub issue to a Task object
+
+    Module-level so it can run inside a process pool.
+
+    Args:
+        issue: GitHub issue data
+
+    Returns:
+        Task: Converted task
+    """
+    # Determine priority from labels (high wins over low)
+    priority = "medium"  # default
+    label_names = [label["name"] for label in issue.get("labels", [])]
+    for name in label_names:
+        mapped = label_priority(name)
+        if mapped == "high":
+            priority = "high"
+            break
+        if mapped == "low":
+            priority = "low"
+
+    assignee = issue.get("assignee")
+    milestone = issue.get("milestone")
+
+    # Parse dates
+    created_at = datetime.fromisoformat(issue["created_at"].replace("Z", "+00:00"))
+    updated_at = datetime.fromisoformat(issue["updated_at"].replace("Z", "+00:00"))
+
+    return Task(
+        id=f"github-{issue['number']}",
+        title=issue["title"],
+        description=issue.get("body") or "",
+        status=STATUS_MAP.get(issue["state"], "todo"),
+        priority=priority,
+        assignee=assignee["login"] if assignee else None,
+        created_at=created_at,
+        updated_at=updated_at,
+        metadata={
+            "source": "github",
+            "github_number": issue["number"],
+            "github_url": issue["html_url"],
+            "github_state": issue["state"],
+            "labels": label_names,
+            # GitHub's assignee filter matches any of them; task.assignee is only the first
+            "assignees": [user["login"] for user in issue.get("assignees") or ()],
+            "milestone": milestone["title"] if milestone else None
+        }
+    )
+
+
+def decode_issue_page(raw: bytes) -> List[Task]:
+    """
+    Decode one page of the issues API and convert it to Tasks
+
+    Pull requests (which GitHub returns as issues) are dropped.
+
+    Args:
+        raw: Raw JSON response body
+
+    Returns:
+        List[Task]: Tasks from this page
+    """
+    issues = fast_json.loads(raw)
+    return [convert_issue_to_task(issue) for issue in issues if "pull_request" not in issue]
+
+
+def _budget_exhausted(response: requests.Response) -> bool:
+    """Whether GitHub refused a request because its credential's rate limit is used up"""
+    return response.status_code in (403, 429) and response.headers.get("X-RateLimit-Remaining") == "0"
 
 
 class GitHubIntegration:
@@ -17,63 +140,294 @@ class GitHubIntegration:
     Fetches issues from a GitHub repository and converts them to Tasks
     """
 
-    def __init__(self, token: str, repo_owner: str, repo_name: str):
+    def __init__(self, tokens: TokenPool, repo_owner: str, repo_name: str):
         """
         Initialize GitHub integration
 
         Args:
-            token: GitHub personal access token
+            tokens: Credential pool (shared by every integration)
             repo_owner: Repository owner (username or organization)
             repo_name: Repository name
         """
-        self.token = token
+        self.tokens = tokens
         self.repo_owner = repo_owner
         self.repo_name = repo_name
-        self.base_url = "https://api.github.com"
+        self.base_url = GITHUB_API_URL
         self.headers = {
-            "Authorization": f"token {token}",
             "Accept": "application/vnd.github.v3+json"
         }
+        self.repo_url = f"{self.base_url}/repos/{repo_owner}/{repo_name}"
+        self.breaker = circuit_breakers.get(f"github:{repo_owner}/{repo_name}")
+        self.metadata = RepoMetadataCache(self._request, self.repo_url, settings.GITHUB_METADATA_TTL_SECONDS)
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict] = None,
+        span_attributes: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> requests.Response:
+        """
+        Send an authenticated request to the GitHub API
+
+        Each request is recorded as an "http" span and goes through the
+        repository's circuit breaker: connection errors, timeouts, 5xx and
+        429 responses count as failures. Requests time out after
+        HTTP_CONNECT_TIMEOUT / HTTP_READ_TIMEOUT unless `timeout` is given.
+
+        The request is sent with the pooled credential that has the most
+        rate-limit headroom for this repository. If GitHub answers that the
+        credential's budget is used up, the request is sent again with
+        another credential that still has headroom. Credentials are borrowed
+        outside the breaker: a missing one is a configuration problem, not
+        a failure of the endpoint.
+
+        Args:
+            method: HTTP method
+            url: Full request URL
+            headers: Extra headers merged over the auth headers
+            span_attributes: Extra span attributes (e.g. page number)
+            **kwargs: Passed through to requests
+
+        Returns:
+            requests.Response: Raw response (status not checked)
 
-    def fetch_issues(self, state: str = "all") -> List[Task]:
+        Raises:
+            CircuitOpenError: The breaker is open; no request was sent
+            NoCredentialError: No pooled credential is scoped to this repository
         """
-        Fetch issues from GitHub repository
+        repo = f"{self.repo_owner}/{self.repo_name}"
+        path = url[len(self.base_url):] if url.startswith(self.base_url) else url
+        with tracer.span(
+            "http",
+            repo=repo,
+            method=method,
+            path=path.split("?", 1)[0],
+            **(span_attributes or {})
+        ) as span:
+            tried: set = set()
+            credential, token = self._borrow(repo, tried)
+            borrowed = True
+            try:
+                with self.breaker.guard() as outcome:
+                    kwargs.setdefault("timeout", (settings.HTTP_CONNECT_TIMEOUT, settings.HTTP_READ_TIMEOUT))
+                    while True:
+                        auth = {"Authorization": f"token {token}"}
+                        response = requests.request(method, url, headers={**self.headers, **auth, **(headers or {})}, **kwargs)
+                        self.tokens.release(credential, response.headers)
+                        borrowed = False
+                        if not (_budget_exhausted(response) and self.tokens.has_alternative(repo, tried)):
+                            break
+                        try:
+                            alternative, token = self._borrow(repo, tried)
+                        except NoCredentialError:
+                            break
+                        logger.warning(f"⚠️  GitHub credential {credential.name} is out of budget, retrying with {alternative.name}")
+                        credential, borrowed = alternative, True
+                    outcome.failed = response.status_code >= 500 or response.status_code == 429
+            finally:
+                if borrowed:
+                    self.tokens.release(credential)
+            span.set(status_code=response.status_code, bytes=len(response.content), credential=credential.name)
+            return response
+
+    def _borrow(self, repo: str, tried: set) -> Tuple[Credential, str]:
+        """
+        Borrow the best credential that has a usable token
+
+        A credential whose token cannot be produced (an App installation
+        token that failed to refresh) or that turns out not to cover the
+        repository once its token is known is handed back and skipped.
 
         Args:
-            state: Issue state - "open", "closed", or "all" (default: "all")
+            repo: "owner/repo"
+            tried: Names of credentials already used; extended here
 
         Returns:
-            List[Task]: List of tasks converted from GitHub issues
+            tuple: (borrowed credential, its token)
+
+        Raises:
+            NoCredentialError: No usable credential is left
+        """
+        while True:
+            credential = self.tokens.acquire(repo, exclude=tried)
+            tried.add(credential.name)
+            token = credential.token()
+            if token is not None and credential.covers(repo):
+                return credential, token
+            self.tokens.release(credential)
+            logger.warning(f"⚠️  GitHub credential {credential.name} has no usable token for {repo}, trying another")
+
+    def fetch_issue_pages(self, state: str = "all", query: Optional[Dict[str, Any]] = None) -> Iterator[bytes]:
         """
-        url = f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}/issues"
+        Fetch raw pages of issues, following GitHub's Link pagination
+
+        Args:
+            state: Issue state - "open", "closed", or "all" (default: "all")
+            query: Extra issues-API parameters (see split_filters); may override state
+
+        Yields:
+            bytes: Raw JSON body of each page
+        """
+        url = f"{self.repo_url}/issues"
         params = {
             "state": state,
-            "per_page": 100  # Max 100 issues per page
+            "per_page": 100,  # Max 100 issues per page
+            **(query or {})
         }
 
-        try:
-            logger.info(f"📥 Fetching issues from {self.repo_owner}/{self.repo_name}...")
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
+        logger.info(f"📥 Fetching issues from {self.repo_owner}/{self.repo_name}...")
+        page = 0
+        while url:
+            page += 1
+            try:
+                response = self._request("GET", url, params=params, span_attributes={"page": page})
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                logger.error(f"❌ Failed to fetch GitHub issues: {str(e)}")
+                raise Exception(f"GitHub API error: {str(e)}")
 
-            issues = response.json()
+            yield response.content
 
-            # Filter out pull requests (GitHub API returns PRs as issues)
-            issues = [issue for issue in issues if "pull_request" not in issue]
+            # The "next" link already carries the query string
+            url = response.links.get("next", {}).get("url")
+            params = None
 
-            logger.info(f"✅ Fetched {len(issues)} issues from GitHub")
+    def fetch_issues(self, state: str = "all", query: Optional[Dict[str, Any]] = None) -> List[Task]:
+        """
+        Fetch issues from GitHub repository
 
-            # Convert GitHub issues to Tasks
-            tasks = []
-            for issue in issues:
-                task = self._convert_issue_to_task(issue)
-                tasks.append(task)
+        Decodes and converts on the calling thread; async callers should
+        prefer iter_issue_chunks.
 
+        Args:
+            state: Issue state - "open", "closed", or "all" (default: "all")
+            query: Extra issues-API parameters (see split_filters)
+
+        Returns:
+            List[Task]: List of tasks converted from GitHub issues
+        """
+        tasks = []
+        for raw in self.fetch_issue_pages(state, query):
+            tasks.extend(decode_issue_page(raw))
+
+        logger.info(f"✅ Fetched {len(tasks)} issues from GitHub")
+        return tasks
+
+    async def iter_issue_chunks(
+        self,
+        converter: TaskConverter,
+        state: str = "all",
+        query: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[List[Task]]:
+        """
+        Fetch issues page by page and convert them in a worker pool
+
+        HTTP requests run in a thread, decoding and conversion run in the
+        converter's pool, and the next page is fetched while earlier pages
+        are still converting. Chunks are yielded in completion order.
+
+        Args:
+            converter: Pool used for decoding and conversion
+            state: Issue state - "open", "closed", or "all" (default: "all")
+            query: Extra issues-API parameters (see split_filters)
+
+        Yields:
+            List[Task]: Converted tasks, one chunk per page
+        """
+        pages = self.fetch_issue_pages(state, query)
+        pending = set()
+        total = 0
+        page = 0
+
+        while True:
+            raw = await asyncio.to_thread(next, pages, None)
+            if raw is None:
+                break
+            page += 1
+            pending.add(asyncio.ensure_future(self._convert_page(converter, raw, page)))
+
+            for future in [f for f in pending if f.done()]:
+                pending.discard(future)
+                chunk = future.result()
+                total += len(chunk)
+                yield chunk
+
+        for future in asyncio.as_completed(pending):
+            chunk = await future
+            total += len(chunk)
+            yield chunk
+
+        logger.info(f"✅ Fetched {total} issues from GitHub")
+
+    async def _convert_page(self, converter: TaskConverter, raw: bytes, page: int) -> List[Task]:
+        """Decode and convert one page in the pool, as a "convert" span"""
+        with tracer.span("convert", repo=f"{self.repo_owner}/{self.repo_name}", page=page, bytes=len(raw)) as span:
+            tasks = await converter.run(decode_issue_page, raw)
+            span.set(task_count=len(tasks))
             return tasks
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"❌ Failed to fetch GitHub issues: {str(e)}")
-            raise Exception(f"GitHub API error: {str(e)}")
+    def split_filters(self, filters: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Split SyncRule filters into issues-API parameters and a local remainder
+
+        Pushed down: state, status (issues only convert to todo/done, so it
+        maps exactly onto open/closed), labels, assignee, milestone (title
+        resolved through the metadata cache) and updated_since (as `since`).
+        Priority is derived from several labels and stays local.
+
+        Resolving a milestone may fetch the milestone list, so call this
+        off the event loop.
+
+        Args:
+            filters: SyncRule.filters
+
+        Returns:
+            tuple: (query parameters, residual filters to evaluate locally)
+        """
+        query: Dict[str, Any] = {}
+        residual = dict(filters)
+
+        def as_list(value: Any) -> List[str]:
+            values = value if isinstance(value, (list, tuple, set)) else str(value).split(",")
+            return [str(v).strip() for v in values if str(v).strip()]
+
+        # state and status both narrow open/closed
+        states = {"open", "closed"}
+        state = str(filters.get("state") or "all").lower()
+        if state in states:
+            states = {state}
+        if filters.get("status"):
+            statuses = {status.lower() for status in as_list(filters["status"])}
+            wanted = {github for github, ours in STATUS_MAP.items() if ours in statuses}
+            if wanted & states:
+                states &= wanted
+                residual.pop("status")
+        if state in ("open", "closed", "all"):
+            residual.pop("state", None)
+        if len(states) == 1:
+            query["state"] = next(iter(states))
+
+        if filters.get("labels"):
+            query["labels"] = ",".join(as_list(filters["labels"]))
+            residual.pop("labels")
+
+        if filters.get("assignee"):
+            query["assignee"] = str(filters["assignee"])
+            residual.pop("assignee")
+
+        if filters.get("milestone"):
+            number = self.metadata.milestone_number(str(filters["milestone"]))
+            if number is not None:
+                query["milestone"] = number
+                residual.pop("milestone")
+
+        if filters.get("updated_since"):
+            query["since"] = str(filters["updated_since"])
+            residual.pop("updated_since")
+
+        return query, residual
 
     def _convert_issue_to_task(self, issue: dict) -> Task:
         """
@@ -85,41 +439,7 @@ class GitHubIntegration:
         Returns:
             Task: Converted task
         """
-        # Map GitHub state to our status
-        status_map = {
-            "open": "todo",
-            "closed": "done"
-        }
-
-        # Determine priority from labels
-        priority = "medium"  # default
-        labels = [label["name"].lower() for label in issue.get("labels", [])]
-
-        if "priority: high" in labels or "urgent" in labels:
-            priority = "high"
-        elif "priority: low" in labels:
-            priority = "low"
-
-        # Parse dates
-        created_at = datetime.fromisoformat(issue["created_at"].replace("Z", "+00:00"))
-        updated_at = datetime.fromisoformat(issue["updated_at"].replace("Z", "+00:00"))
-
-        return Task(
-            id=f"github-{issue['number']}",
-            title=issue["title"],
-            description=issue.get("body") or "",
-            status=status_map.get(issue["state"], "todo"),
-            priority=priority,
-            created_at=created_at,
-            updated_at=updated_at,
-            metadata={
-                "source": "github",
-                "github_number": issue["number"],
-                "github_url": issue["html_url"],
-                "github_state": issue["state"],
-                "labels": [label["name"] for label in issue.get("labels", [])]
-            }
-        )
+        return convert_issue_to_task(issue)
 
     def create_issue(self, task: Task) -> dict:
         """
@@ -131,7 +451,7 @@ class GitHubIntegration:
         Returns:
             dict: Created issue data
         """
-        url = f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}/issues"
+        url = f"{self.repo_url}/issues"
 
         data = {
             "title": task.title,
@@ -139,15 +459,28 @@ class GitHubIntegration:
             "labels": []
         }
 
-        # Add priority label
-        if task.priority == "high":
-            data["labels"].append("priority: high")
-        elif task.priority == "low":
-            data["labels"].append("priority: low")
-
         try:
+            # Priority labels missing from the cached label list are created up front
+            self.metadata.ensure_labels(PRIORITY_TO_LABEL.values())
+            if task.priority in PRIORITY_TO_LABEL:
+                data["labels"].append(PRIORITY_TO_LABEL[task.priority])
+
+            # Only attach tags, assignees and milestones the repository knows
+            for tag in task.tags:
+                label = self.metadata.resolve_label(tag)
+                if label and label not in data["labels"]:
+                    data["labels"].append(label)
+            if task.assignee:
+                login = self.metadata.resolve_assignee(task.assignee)
+                if login:
+                    data["assignees"] = [login]
+            if task.metadata.get("milestone"):
+                number = self.metadata.milestone_number(task.metadata["milestone"])
+                if number is not None:
+                    data["milestone"] = number
+
             logger.info(f"📤 Creating GitHub issue: {task.title}")
-            response = requests.post(url, headers=self.headers, json=data)
+            response = self._request("POST", url, json=data)
             response.raise_for_status()
 
             issue = response.json()
@@ -159,28 +492,57 @@ class GitHubIntegration:
             logger.error(f"❌ Failed to create GitHub issue: {str(e)}")
             raise Exception(f"GitHub API error: {str(e)}")
 
-    def update_issue(self, issue_number: int, task: Task) -> dict:
+    def patch_body(self, task: Task, fields: Optional[List[str]] = None) -> bytes:
         """
-        Update an existing GitHub issue
+        Encode the PATCH body of an issue update
 
         Args:
-            issue_number: GitHub issue number
             task: Task with updated data
+            fields: Task fields to write (default: all of ISSUE_FIELDS);
+                    fields an issue does not store are left out
 
         Returns:
-            dict: Updated issue data
+            bytes: JSON body with only the written issue fields
         """
-        url = f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}/issues/{issue_number}"
-
         data = {
             "title": task.title,
             "body": task.description,
             "state": "open" if task.status != "done" else "closed"
         }
+        if fields is not None:
+            data = {ISSUE_FIELDS[field]: data[ISSUE_FIELDS[field]] for field in fields if field in ISSUE_FIELDS}
+        return fast_json.dumps(data).encode("utf-8")
+
+    def update_issue(
+        self,
+        issue_number: int,
+        task: Task,
+        fields: Optional[List[str]] = None,
+        body: Optional[bytes] = None
+    ) -> dict:
+        """
+        Update an existing GitHub issue
+
+        Only the given fields are sent, so an unchanged (possibly large)
+        issue body is not re-sent and edits made meanwhile to other fields
+        are not overwritten.
+
+        Args:
+            issue_number: GitHub issue number
+            task: Task with updated data
+            fields: Task fields to write (default: all of ISSUE_FIELDS)
+            body: PATCH body from patch_body(), if the caller already encoded it
+
+        Returns:
+            dict: Updated issue data
+        """
+        url = f"{self.repo_url}/issues/{issue_number}"
+        if body is None:
+            body = self.patch_body(task, fields)
 
         try:
             logger.info(f"📤 Updating GitHub issue #{issue_number}")
-            response = requests.patch(url, headers=self.headers, json=data)
+            response = self._request("PATCH", url, data=body, headers={"Content-Type": "application/json"})
             response.raise_for_status()
 
             issue = response.json()
@@ -0,0 +1,178 @@
+"""
+Repository metadata cache for the GitHub integration
+Resolves label names, milestone numbers and assignable users once per TTL,
+revalidating with ETags so unchanged metadata costs a 304
+"""
+
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import requests
+
+from app.services.logger import logger
+
+
+class _CachedResource:
+    """One cached list endpoint (labels, milestones or assignees)"""
+
+    def __init__(self, path: str, params: Optional[dict] = None):
+        self.path = path
+        self.params = params or {}
+        self.items: List[dict] = []
+        self.etag: Optional[str] = None
+        self.fetched_at = 0.0
+
+
+class RepoMetadataCache:
+    """
+    Per-repository cache of labels, milestones and assignable users
+
+    Each resource is refetched at most once per TTL. Refetches send the
+    previous ETag; a 304 reply only extends the entry's lifetime. Lookup
+    tables are rebuilt only when the data actually changed.
+    """
+
+    def __init__(self, request: Callable[..., requests.Response], repo_url: str, ttl_seconds: int = 600):
+        """
+        Initialize the cache
+
+        Args:
+            request: Integration request function (method, url, **kwargs)
+            repo_url: API URL of the repository
+            ttl_seconds: How long fetched metadata is trusted without revalidation
+        """
+        self._request = request
+        self.repo_url = repo_url
+        self.ttl_seconds = ttl_seconds
+        self._resources = {
+            "labels": _CachedResource("labels"),
+            "milestones": _CachedResource("milestones", {"state": "all"}),
+            "assignees": _CachedResource("assignees"),
+        }
+        self._labels: Dict[str, str] = {}  # lowercase name -> canonical name
+        self._milestones: Dict[str, int] = {}  # title -> number
+        self._assignees: Dict[str, str] = {}  # lowercase login -> login
+
+    def _refresh(self, kind: str) -> bool:
+        """
+        Refetch one resource if its TTL expired
+
+        Returns:
+            bool: True if the data changed
+        """
+        resource = self._resources[kind]
+        if time.monotonic() - resource.fetched_at < self.ttl_seconds:
+            return False
+
+        url = f"{self.repo_url}/{resource.path}"
+        headers = {"If-None-Match": resource.etag} if resource.etag else {}
+        params: Optional[dict] = {**resource.params, "per_page": 100}
+        items: List[dict] = []
+        etag = None
+
+        try:
+            while url:
+                response = self._request("GET", url, params=params, headers=headers)
+                if response.status_code == 304:
+                    resource.fetched_at = time.monotonic()
+                    return False
+                response.raise_for_status()
+                etag = etag or response.headers.get("ETag")
+                items.extend(response.json())
+                url = response.links.get("next", {}).get("url")
+                params = None
+                headers = {}
+        except requests.exceptions.RequestException as e:
+            logger.error(f"❌ Failed to fetch GitHub {kind}: {str(e)}")
+            raise Exception(f"GitHub API error: {str(e)}")
+
+        resource.items = items
+        resource.etag = etag
+        resource.fetched_at = time.monotonic()
+        logger.info(f"🗂️  Cached {len(items)} {kind} for {self.repo_url}")
+        return True
+
+    def _labels_table(self) -> Dict[str, str]:
+        if self._refresh("labels"):
+            self._labels = {label["name"].lower(): label["name"] for label in self._resources["labels"].items}
+        return self._labels
+
+    def _milestones_table(self) -> Dict[str, int]:
+        if self._refresh("milestones"):
+            self._milestones = {m["title"]: m["number"] for m in self._resources["milestones"].items}
+        return self._milestones
+
+    def _assignees_table(self) -> Dict[str, str]:
+        if self._refresh("assignees"):
+            self._assignees = {user["login"].lower(): user["login"] for user in self._resources["assignees"].items}
+        return self._assignees
+
+    def resolve_label(self, name: str) -> Optional[str]:
+        """
+        Resolve a label name case-insensitively
+
+        Returns:
+            str or None: The repository's spelling of the label
+        """
+        return self._labels_table().get(name.lower())
+
+    def milestone_number(self, title: str) -> Optional[int]:
+        """
+        Resolve a milestone title to its number
+
+        Returns:
+            int or None: Milestone number
+        """
+        return self._milestones_table().get(title)
+
+    def resolve_assignee(self, login: str) -> Optional[str]:
+        """
+        Check that a user can be assigned in this repository
+
+        Returns:
+            str or None: Canonical login if assignable
+        """
+        return self._assignees_table().get(login.lower())
+
+    def ensure_labels(self, names: Iterable[str], color: str = "ededed"):
+        """
+        Create any labels missing from the cached label list
+
+        The check runs against the label table itself, so a label deleted
+        on GitHub is recreated once the list is refetched after its TTL.
+
+        Args:
+            names: Label names that must exist
+            color: Color for newly created labels
+        """
+        labels = self._labels_table()
+        for name in names:
+            if name.lower() in labels:
+                continue
+            try:
+                response = self._request("POST", f"{self.repo_url}/labels", json={"name": name, "color": color})
+                # 422 means another writer created it in the meantime
+                if response.status_code != 422:
+                    response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                logger.error(f"❌ Failed to create GitHub label '{name}': {str(e)}")
+                raise Exception(f"GitHub API error: {str(e)}")
+            labels[name.lower()] = name
+            logger.info(f"🏷️  Created GitHub label '{name}'")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Cache contents and age per resource
+
+        Returns:
+            dict: Item counts and seconds since last validation
+        """
+        now = time.monotonic()
+        return {
+            kind: {
+                "items": len(resource.items),
+                "age_seconds": round(now - resource.fetched_at, 1) if resource.fetched_at else None,
+                "etag": resource.etag
+            }
+            for kind, resource in self._resources.items()
+        }
@@ -0,0 +1,324 @@
+"""
+GitHub credential pool
+Holds every configured GitHub credential (personal access tokens and GitHub
+App installations), tracks each one's remaining rate-limit budget from the
+X-RateLimit response headers and lends out the one with the most headroom
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+
+import requests
+
+from app.config import settings
+from app.services.logger import logger
+
+try:
+    import jwt  # PyJWT (with cryptography) signs GitHub App tokens
+except ImportError:  # pragma: no cover - optional dependency
+    jwt = None
+
+# api.github.com, a GitHub Enterprise server or a local fake (benchmarks/fake_github.py)
+GITHUB_API_URL = settings.GITHUB_API_URL.rstrip("/")
+
+# GitHub's hourly core limit for a token; assumed until a response reports it
+DEFAULT_LIMIT = 5000
+
+# Installation tokens live an hour; refresh this long before they expire
+REFRESH_MARGIN_SECONDS = 300
+
+# After a failed refresh, wait this long before trying again
+REFRESH_RETRY_SECONDS = 30
+
+
+class NoCredentialError(Exception):
+    """Raised when no pooled credential may access a repository"""
+
+    def __init__(self, repo: str):
+        self.repo = repo
+        super().__init__(f"No GitHub credential is scoped to {repo}")
+
+
+def parse_scope(entry: str) -> Tuple[str, Optional[Set[str]]]:
+    """
+    Split a credential entry into its value and repository scope
+
+    Args:
+        entry: "value" or "value@owner/repo|owner/other"
+
+    Returns:
+        tuple: (value, set of lowercase "owner/repo", or None for any repository)
+    """
+    value, _, scope = entry.strip().partition("@")
+    repos = {repo.strip().lower() for repo in scope.split("|") if repo.strip()}
+    return value.strip(), repos or None
+
+
+class Credential:
+    """
+    One token and its rate-limit budget as last reported by GitHub
+
+    Until the first response arrives the full hourly limit is assumed. Once
+    the reported reset time has passed the budget counts as full again.
+    """
+
+    kind = "token"
+
+    def __init__(self, name: str, token: Optional[str] = None, repos: Optional[Set[str]] = None):
+        self.name = name  # shown in /api/health; never the token itself
+        self.repos = repos  # None = any repository the token can reach
+        self._token = token
+        self.limit = DEFAULT_LIMIT
+        self.remaining = DEFAULT_LIMIT
+        self.reset_at = 0.0  # epoch seconds
+        self.in_flight = 0
+        self.requests = 0
+        self.exhausted = 0  # responses that reported the budget used up
+
+    def token(self) -> Optional[str]:
+        return self._token
+
+    def covers(self, repo: str) -> bool:
+        """Whether this credential may be used for a repository ("owner/repo")"""
+        return self.repos is None or repo.lower() in self.repos
+
+    def headroom(self, now: float) -> int:
+        """Requests left in the current window, minus those already in flight"""
+        remaining = self.limit if self.reset_at and now >= self.reset_at else self.remaining
+        return remaining - self.in_flight
+
+    def observe(self, headers: Mapping[str, str]):
+        """
+        Update the budget from a response's rate-limit headers
+
+        Args:
+            headers: Response headers (missing headers are ignored)
+        """
+        try:
+            if "X-RateLimit-Remaining" in headers:
+                self.remaining = int(headers["X-RateLimit-Remaining"])
+            if "X-RateLimit-Limit" in headers:
+                self.limit = int(headers["X-RateLimit-Limit"])
+            if "X-RateLimit-Reset" in headers:
+                self.reset_at = float(headers["X-RateLimit-Reset"])
+        except ValueError:
+            return
+        if self.remaining == 0:
+            self.exhausted += 1
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        headroom = max(0, self.headroom(now))
+        return {
+            "kind": self.kind,
+            "repos": sorted(self.repos) if self.repos is not None else None,
+            "limit": self.limit,
+            "remaining": headroom,
+            "utilization": round(1 - headroom / self.limit, 3) if self.limit else 0.0,
+            "resets_in_seconds": round(max(0.0, self.reset_at - now), 1),
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "exhausted": self.exhausted
+        }
+
+
+class AppInstallationCredential(Credential):
+    """
+    GitHub App installation token, minted from the App's private key
+
+    The token is fetched on first use and refreshed shortly before it
+    expires. Unless the credential was given an explicit scope, it covers
+    the repositories the installation was granted (any repository until
+    the first token reveals them). While it has no valid token and its
+    last refresh failed, it covers nothing, so requests go elsewhere.
+    """
+
+    kind = "app_installation"
+
+    def __init__(
+        self,
+        app_id: str,
+        private_key: str,
+        installation_id: str,
+        repos: Optional[Set[str]] = None,
+        base_url: str = GITHUB_API_URL
+    ):
+        super().__init__(f"app-installation-{installation_id}", repos=repos)
+        self.app_id = app_id
+        self.installation_id = installation_id
+        self.base_url = base_url
+        self._private_key = private_key
+        self._scoped = repos is not None
+        self._expires_at = 0.0
+        self._retry_at = 0.0  # no refresh attempt before this (after a failure)
+        self._refresh_lock = threading.Lock()
+
+    def token(self) -> Optional[str]:
+        with self._refresh_lock:
+            now = time.time()
+            if now >= self._expires_at - REFRESH_MARGIN_SECONDS and now >= self._retry_at:
+                try:
+                    self._refresh()
+                except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+                    self._retry_at = now + REFRESH_RETRY_SECONDS
+                    logger.error(f"❌ Could not refresh GitHub App installation token {self.installation_id}: {str(e)}")
+            return self._token if time.time() < self._expires_at else None
+
+    def covers(self, repo: str) -> bool:
+        # Cached state only: acquire() must never wait for a refresh
+        now = time.time()
+        if now >= self._expires_at and now < self._retry_at:
+            return False
+        return super().covers(repo)
+
+    def _refresh(self):
+        """Exchange a short-lived App JWT for a new installation token"""
+        now = int(time.time())
+        app_jwt = jwt.encode({"iat": now - 60, "exp": now + 540, "iss": self.app_id}, self._private_key, algorithm="RS256")
+        response = requests.post(
+            f"{self.base_url}/app/installations/{self.installation_id}/access_tokens",
+            headers={"Authorization": f"Bearer {app_jwt}", "Accept": "application/vnd.github.v3+json"},
+            timeout=(settings.HTTP_CONNECT_TIMEOUT, settings.HTTP_READ_TIMEOUT)
+        )
+        response.raise_for_status()
+        data = response.json()
+        self._token = data["token"]
+        self._expires_at = datetime.fromisoformat(data["expires_at"].replace("Z", "+00:00")).timestamp()
+        if not self._scoped and data.get("repository_selection") == "selected":
+            self.repos = {repo["full_name"].lower() for repo in data.get("repositories", [])}
+        logger.info(f"🔑 Refreshed GitHub App installation token {self.installation_id}")
+
+
+class TokenPool:
+    """
+    Shared pool of GitHub credentials
+
+    Each request borrows the credential with the most headroom among those
+    scoped to its repository (ties go to the one whose window resets
+    first) and reports the response headers back when it returns.
+    """
+
+    def __init__(self, credentials: List[Credential]):
+        self.credentials = credentials
+        self._lock = threading.Lock()
+
+    def acquire(self, repo: str, exclude: Optional[Set[str]] = None) -> Credential:
+        """
+        Borrow the credential with the most headroom for a repository
+
+        Args:
+            repo: "owner/repo"
+            exclude: Credential names not to use (e.g. one just rate-limited)
+
+        Returns:
+            Credential: Borrowed credential; hand it back with release()
+
+        Raises:
+            NoCredentialError: No credential is scoped to the repository
+        """
+        candidates = [
+            credential for credential in self.credentials
+            if credential.name not in (exclude or ()) and credential.covers(repo)
+        ]
+        if not candidates:
+            raise NoCredentialError(repo)
+        with self._lock:
+            now = time.time()
+            credential = max(candidates, key=lambda c: (c.headroom(now), -c.reset_at))
+            credential.in_flight += 1
+            credential.requests += 1
+            return credential
+
+    def release(self, credential: Credential, headers: Optional[Mapping[str, str]] = None):
+        """
+        Return a borrowed credential
+
+        Args:
+            credential: Credential from acquire()
+            headers: Response headers, if a response was received
+        """
+        with self._lock:
+            credential.in_flight -= 1
+            if headers is not None:
+                credential.observe(headers)
+
+    def has_alternative(self, repo: str, exclude: Set[str]) -> bool:
+        """Whether a credential for the repository, other than those excluded, still has headroom"""
+        now = time.time()
+        return any(
+            credential.name not in exclude and credential.covers(repo) and credential.headroom(now) > 0
+            for credential in self.credentials
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Utilisation of each credential and of the pool as a whole"""
+        with self._lock:
+            now = time.time()
+            credentials = {credential.name: credential.snapshot(now) for credential in self.credentials}
+        limit = sum(credential["limit"] for credential in credentials.values())
+        remaining = sum(credential["remaining"] for credential in credentials.values())
+        return {
+            "credentials": credentials,
+            "limit": limit,
+            "remaining": remaining,
+            "utilization": round(1 - remaining / limit, 3) if limit else 0.0
+        }
+
+
+def credentials_from_settings() -> List[Credential]:
+    """
+    Build the configured credentials
+
+    GITHUB_TOKEN comes first, then each GITHUB_TOKENS entry, then one
+    credential per GITHUB_APP_INSTALLATION_IDS entry (App credentials need
+    PyJWT with cryptography and are skipped with an error without it).
+
+    Returns:
+        list: Credentials
+    """
+    credentials: List[Credential] = []
+    entries = ([settings.GITHUB_TOKEN] if settings.GITHUB_TOKEN else []) + [
+        entry for entry in (settings.GITHUB_TOKENS or "").split(",") if entry.strip()
+    ]
+    for number, entry in enumerate(entries, start=1):
+        token, repos = parse_scope(entry)
+        credentials.append(Credential(f"token-{number}", token, repos))
+
+    installations = [entry for entry in (settings.GITHUB_APP_INSTALLATION_IDS or "").split(",") if entry.strip()]
+    if installations:
+        if not (settings.GITHUB_APP_ID and settings.GITHUB_APP_PRIVATE_KEY_PATH):
+            logger.error("❌ GITHUB_APP_INSTALLATION_IDS needs GITHUB_APP_ID and GITHUB_APP_PRIVATE_KEY_PATH")
+        elif jwt is None:
+            logger.error("❌ GitHub App credentials need PyJWT with cryptography (pip install 'pyjwt[crypto]')")
+        else:
+            with open(settings.GITHUB_APP_PRIVATE_KEY_PATH) as f:
+                private_key = f.read()
+            for entry in installations:
+                installation_id, repos = parse_scope(entry)
+                credentials.append(AppInstallationCredential(settings.GITHUB_APP_ID, private_key, installation_id, repos))
+    return credentials
+
+
+_token_pool: Optional[TokenPool] = None
+_token_pool_lock = threading.Lock()
+
+
+def get_token_pool() -> TokenPool:
+    """Shared credential pool, built from settings on first use"""
+    global _token_pool
+    with _token_pool_lock:
+        if _token_pool is None:
+            _token_pool = TokenPool(credentials_from_settings())
+            logger.info(f"🔑 GitHub credential pool ready ({len(_token_pool.credentials)} credentials)")
+        return _token_pool
+
+
+def token_pool_ready() -> bool:
+    """Whether the pool was built (without building it)"""
+    return _token_pool is not None
+
+
+def credentials_configured() -> bool:
+    """Whether any GitHub credential is configured"""
+    return bool(settings.GITHUB_TOKEN or settings.GITHUB_TOKENS or settings.GITHUB_APP_INSTALLATION_IDS)
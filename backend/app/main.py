@@ -11,8 +11,12 @@ import asyncio
 import os
 
 from app.config import settings
-from app.routes import sync, health, config
+from app.routes import sync, health, config, metrics, traces, events, changes
+from app.services.circuit_breaker import CircuitOpenError
 from app.services.logger import logger
+from app.services.leader_election import scheduler_lease
+from app.services.loop_monitor import loop_monitor
+from app.services.sync_engine import SyncInProgressError, ensure_sync_engine, get_sync_engine, sync_engine_ready
 
 # Create FastAPI app
 app = FastAPI(
@@ -34,6 +38,10 @@ app.add_middleware(
 app.include_router(health.router, prefix="/api", tags=["Health"])
 app.include_router(sync.router, prefix="/api", tags=["Sync"])
 app.include_router(config.router, prefix="/api", tags=["Configuration"])
+app.include_router(metrics.router, prefix="/api", tags=["Metrics"])
+app.include_router(traces.router, prefix="/api", tags=["Tracing"])
+app.include_router(events.router, prefix="/api", tags=["Events"])
+app.include_router(changes.router, prefix="/api", tags=["Changes"])
 
 # Serve frontend
 frontend_path = os.path.join(os.path.dirname(__file__), "../frontend")
@@ -52,34 +60,118 @@ async def startup_event():
     logger.info(f"🚀 {settings.APP_NAME} v{settings.VERSION} starting...")
     logger.info(f"📍 Server running at http://{settings.HOST}:{settings.PORT}")
     logger.info(f"🤖 Auto-sync mode: {'ENABLED' if settings.AUTO_SYNC_ENABLED else 'DISABLED'}")
+
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
     
+    # Build the engine in the background so the port opens immediately,
+    # then finish any sync that was interrupted by a restart
+    asyncio.create_task(resume_interrupted_syncs())
+
     # Start background sync if auto-sync is enabled (BOT MODE)
     if settings.AUTO_SYNC_ENABLED:
         asyncio.create_task(background_sync_task())
         logger.info(f"⏱️  Auto-sync interval: {settings.SYNC_INTERVAL_SECONDS} seconds")
 
+    if settings.DRIFT_CHECK_INTERVAL_SECONDS > 0:
+        asyncio.create_task(background_drift_check_task())
+        logger.info(f"🔎 Drift check interval: {settings.DRIFT_CHECK_INTERVAL_SECONDS} seconds")
+
+    if settings.DLQ_RETRY_INTERVAL_SECONDS > 0:
+        asyncio.create_task(background_dead_letter_task())
+        logger.info(f"📬 Dead-letter retry interval: {settings.DLQ_RETRY_INTERVAL_SECONDS} seconds")
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info(f"👋 {settings.APP_NAME} shutting down...")
+    loop_monitor.stop()
+    if sync_engine_ready():
+        sync_engine = get_sync_engine()
+        await sync_engine.drain(settings.SHUTDOWN_GRACE_SECONDS)
+        await sync_engine.save_snapshot(force=True)
+    await asyncio.to_thread(scheduler_lease.release)
+
+
+async def resume_interrupted_syncs():
+    """
+    Warm up the sync engine, then resume journaled syncs left unfinished
+    by a crash or restart (leader only)
+
+    If another worker is syncing, the resume waits for the sync lock.
+    """
+    while True:
+        try:
+            sync_engine = await ensure_sync_engine()
+            if await asyncio.to_thread(scheduler_lease.try_acquire):
+                await sync_engine.resume_interrupted()
+            return
+        except SyncInProgressError as e:
+            logger.info(f"⏸️  Resume waiting: {str(e)}")
+            await asyncio.sleep(max(1, settings.SYNC_LOCK_SECONDS / 3))
+        except Exception as e:
+            logger.error(f"❌ Resuming interrupted syncs failed: {str(e)}")
+            return
 
 
 async def background_sync_task():
     """
     BOT MODE: Autonomous background sync task
     Runs continuously at specified intervals
+
+    Every worker runs this loop, but only the holder of the scheduler
+    lease actually syncs; the others stay on standby.
     """
-    from app.services.sync_engine import SyncEngine
-    
-    sync_engine = SyncEngine()
     logger.info("🤖 Background sync task started (BOT MODE)")
     
     while True:
         try:
             await asyncio.sleep(settings.SYNC_INTERVAL_SECONDS)
+            if not await asyncio.to_thread(scheduler_lease.try_acquire):
+                logger.info("⏸️  Auto-sync skipped: another worker holds the scheduler lease")
+                continue
             logger.info("🔄 Auto-sync triggered by scheduler...")
+            sync_engine = await ensure_sync_engine()
             result = await sync_engine.sync()
             logger.info(f"✅ Auto-sync completed: {result['message']}")
+        except SyncInProgressError as e:
+            logger.info(f"⏸️  Auto-sync skipped: {str(e)}")
+        except CircuitOpenError as e:
+            logger.warning(f"⚡ Auto-sync skipped: {str(e)}")
         except Exception as e:
             logger.error(f"❌ Auto-sync failed: {str(e)}")
+
+
+async def background_drift_check_task():
+    """
+    Periodic anti-entropy check of the destination (leader only)
+    """
+    while True:
+        try:
+            await asyncio.sleep(settings.DRIFT_CHECK_INTERVAL_SECONDS)
+            if not await asyncio.to_thread(scheduler_lease.try_acquire):
+                continue
+            sync_engine = await ensure_sync_engine()
+            await sync_engine.check_drift()
+        except Exception as e:
+            logger.error(f"❌ Drift check failed: {str(e)}")
+
+
+async def background_dead_letter_task():
+    """
+    Periodic targeted retry of dead-lettered pushes that are due (leader only)
+    """
+    while True:
+        try:
+            await asyncio.sleep(settings.DLQ_RETRY_INTERVAL_SECONDS)
+            if not await asyncio.to_thread(scheduler_lease.try_acquire):
+                continue
+            sync_engine = await ensure_sync_engine()
+            await sync_engine.retry_dead_letters()
+        except SyncInProgressError as e:
+            logger.info(f"⏸️  Dead-letter retry skipped: {str(e)}")
+        except CircuitOpenError as e:
+            logger.warning(f"⚡ Dead-letter retry skipped: {str(e)}")
+        except Exception as e:
+            logger.error(f"❌ Dead-letter retry failed: {str(e)}")
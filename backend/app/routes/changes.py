@@ -0,0 +1,56 @@
+"""
+Change-data feed endpoint
+Lets downstream consumers tail the changes sync runs applied, from a cursor
+"""
+
+import asyncio
+import time
+
+from fastapi import APIRouter, HTTPException, Request
+
+from app.services.sync_engine import ensure_sync_engine
+
+router = APIRouter()
+
+MAX_LIMIT = 5000
+MAX_WAIT_SECONDS = 60
+POLL_INTERVAL_SECONDS = 0.5
+
+
+@router.get("/changes")
+async def get_changes(request: Request, cursor: int = 0, limit: int = 500, wait: float = 0):
+    """
+    Changes applied by sync runs, oldest first, from a cursor on
+
+    With `wait`, the request is held (long-poll) until a change at or after
+    the cursor is appended or the wait runs out. Consumers pass the
+    returned next_cursor on their next call.
+
+    Args:
+        cursor: First offset wanted (0 = from the start of the log)
+        limit: Maximum changes to return (up to 5000)
+        wait: Seconds to wait for new changes if there are none (up to 60)
+
+    Returns:
+        dict: changes, next_cursor, earliest_offset and truncated (True if
+              records before earliest_offset were dropped by retention)
+    """
+    sync_engine = await ensure_sync_engine()
+    change_log = sync_engine.change_log
+    if change_log is None:
+        raise HTTPException(status_code=404, detail="The change log is disabled (CHANGE_LOG_DIR is empty)")
+
+    limit = max(1, min(limit, MAX_LIMIT))
+    deadline = time.monotonic() + max(0.0, min(wait, MAX_WAIT_SECONDS))
+    result = await asyncio.to_thread(change_log.read, cursor, limit)
+    while not result["changes"] and time.monotonic() < deadline and not await request.is_disconnected():
+        await asyncio.sleep(POLL_INTERVAL_SECONDS)
+        # Checking the head is a directory listing and a stat; only read once it moved
+        if change_log.next_offset() > result["next_cursor"]:
+            result = await asyncio.to_thread(change_log.read, cursor, limit)
+
+    return {
+        "status": "ok",
+        **result,
+        "count": len(result["changes"])
+    }
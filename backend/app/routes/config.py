@@ -3,16 +3,15 @@ Settings and Configuration Management Routes
 Allows non-technical users to configure the system via UI
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
-import os
-import json
 
-router = APIRouter()
+from app.services.config_store import config_version, load_config, save_config
+from app.services.http_cache import STATIC, cached_json, content_etag, make_etag
+from app.services.rule_compiler import CompiledRule, RuleCompileError
 
-# Configuration file path
-CONFIG_FILE = "user_config.json"
+router = APIRouter()
 
 
 class AppSettings(BaseModel):
@@ -45,32 +44,115 @@ class SyncRule(BaseModel):
     schedule: Optional[str] = None  # cron expression
 
 
-def load_config() -> Dict[str, Any]:
-    """Load configuration from file"""
-    if os.path.exists(CONFIG_FILE):
-        with open(CONFIG_FILE, 'r') as f:
-            return json.load(f)
-    return {
-        "settings": {},
-        "integrations": [],
-        "sync_rules": []
-    }
-
-
-def save_config(config: Dict[str, Any]):
-    """Save configuration to file"""
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
+# Static catalogues: built once, served with a content ETag
+AVAILABLE_INTEGRATIONS_RESPONSE = {
+    "status": "ok",
+    "integrations": [
+        {
+            "type": "jira",
+            "name": "Jira",
+            "description": "Atlassian Jira project management",
+            "icon": "🎯",
+            "auth_types": ["api_key", "oauth"],
+            "required_fields": ["url", "email", "api_token"]
+        },
+        {
+            "type": "github",
+            "name": "GitHub Issues",
+            "description": "GitHub issue tracking",
+            "icon": "🐙",
+            "auth_types": ["token", "oauth"],
+            "required_fields": ["token", "owner", "repo"]
+        },
+        {
+            "type": "trello",
+            "name": "Trello",
+            "description": "Trello boards and cards",
+            "icon": "📋",
+            "auth_types": ["api_key"],
+            "required_fields": ["api_key", "token", "board_id"]
+        },
+        {
+            "type": "asana",
+            "name": "Asana",
+            "description": "Asana task management",
+            "icon": "✅",
+            "auth_types": ["token", "oauth"],
+            "required_fields": ["token", "workspace"]
+        },
+        {
+            "type": "linear",
+            "name": "Linear",
+            "description": "Linear issue tracking",
+            "icon": "📐",
+            "auth_types": ["api_key"],
+            "required_fields": ["api_key", "team"]
+        },
+        {
+            "type": "clickup",
+            "name": "ClickUp",
+            "description": "ClickUp project management",
+            "icon": "🖱️",
+            "auth_types": ["api_key"],
+            "required_fields": ["api_key", "list_id"]
+        }
+    ]
+}
+AVAILABLE_INTEGRATIONS_ETAG = content_etag(AVAILABLE_INTEGRATIONS_RESPONSE)
+
+FIELD_MAPPING_TEMPLATES_RESPONSE = {
+    "status": "ok",
+    "templates": [
+        {
+            "name": "Jira to GitHub",
+            "source": "jira",
+            "destination": "github",
+            "mappings": {
+                "summary": "title",
+                "description": "body",
+                "status": "state",
+                "priority": "labels",
+                "assignee": "assignees"
+            }
+        },
+        {
+            "name": "Trello to Asana",
+            "source": "trello",
+            "destination": "asana",
+            "mappings": {
+                "name": "name",
+                "desc": "notes",
+                "due": "due_on",
+                "labels": "tags"
+            }
+        },
+        {
+            "name": "GitHub to Jira",
+            "source": "github",
+            "destination": "jira",
+            "mappings": {
+                "title": "summary",
+                "body": "description",
+                "state": "status",
+                "labels": "labels"
+            }
+        }
+    ]
+}
+FIELD_MAPPING_TEMPLATES_ETAG = content_etag(FIELD_MAPPING_TEMPLATES_RESPONSE)
 
 
 @router.get("/settings")
-async def get_settings():
-    """Get current application settings"""
-    config = load_config()
-    return {
+async def get_settings(request: Request):
+    """
+    Get current application settings
+
+    Cached by ETag: answered with 304 until the config file is saved again.
+    """
+    return cached_json(request, make_etag("settings", config_version()), lambda: {
         "status": "ok",
-        "settings": config.get("settings", {})
-    }
+        "settings": load_config().get("settings", {})
+    })
 
 
 @router.put("/settings")
@@ -214,6 +296,11 @@ async def create_sync_rule(rule: SyncRule):
     
     rule_data = rule.dict()
     rule_data["id"] = f"rule_{len(config.get('sync_rules', []))}"
+
+    try:
+        CompiledRule(rule_data)
+    except RuleCompileError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     if "sync_rules" not in config:
         config["sync_rules"] = []
@@ -238,6 +325,10 @@ async def update_sync_rule(rule_id: str, rule: SyncRule):
         if r.get("id") == rule_id:
             rule_data = rule.dict()
             rule_data["id"] = rule_id
+            try:
+                CompiledRule(rule_data)
+            except RuleCompileError as e:
+                raise HTTPException(status_code=400, detail=str(e))
             rules[idx] = rule_data
             save_config(config)
             return {
@@ -264,111 +355,21 @@ async def delete_sync_rule(rule_id: str):
 
 
 @router.get("/available-integrations")
-async def get_available_integrations():
+async def get_available_integrations(request: Request):
     """
     Get list of available integrations
     Shows what platforms users can connect to
     """
-    return {
-        "status": "ok",
-        "integrations": [
-            {
-                "type": "jira",
-                "name": "Jira",
-                "description": "Atlassian Jira project management",
-                "icon": "🎯",
-                "auth_types": ["api_key", "oauth"],
-                "required_fields": ["url", "email", "api_token"]
-            },
-            {
-                "type": "github",
-                "name": "GitHub Issues",
-                "description": "GitHub issue tracking",
-                "icon": "🐙",
-                "auth_types": ["token", "oauth"],
-                "required_fields": ["token", "owner", "repo"]
-            },
-            {
-                "type": "trello",
-                "name": "Trello",
-                "description": "Trello boards and cards",
-                "icon": "📋",
-                "auth_types": ["api_key"],
-                "required_fields": ["api_key", "token", "board_id"]
-            },
-            {
-                "type": "asana",
-                "name": "Asana",
-                "description": "Asana task management",
-                "icon": "✅",
-                "auth_types": ["token", "oauth"],
-                "required_fields": ["token", "workspace"]
-            },
-            {
-                "type": "linear",
-                "name": "Linear",
-                "description": "Linear issue tracking",
-                "icon": "📐",
-                "auth_types": ["api_key"],
-                "required_fields": ["api_key", "team"]
-            },
-            {
-                "type": "clickup",
-                "name": "ClickUp",
-                "description": "ClickUp project management",
-                "icon": "🖱️",
-                "auth_types": ["api_key"],
-                "required_fields": ["api_key", "list_id"]
-            }
-        ]
-    }
+    return cached_json(request, AVAILABLE_INTEGRATIONS_ETAG, lambda: AVAILABLE_INTEGRATIONS_RESPONSE, STATIC)
 
 
 @router.get("/field-mappings/templates")
-async def get_field_mapping_templates():
+async def get_field_mapping_templates(request: Request):
     """
     Get pre-configured field mapping templates
     Users can select common mappings without coding
     """
-    return {
-        "status": "ok",
-        "templates": [
-            {
-                "name": "Jira to GitHub",
-                "source": "jira",
-                "destination": "github",
-                "mappings": {
-                    "summary": "title",
-                    "description": "body",
-                    "status": "state",
-                    "priority": "labels",
-                    "assignee": "assignees"
-                }
-            },
-            {
-                "name": "Trello to Asana",
-                "source": "trello",
-                "destination": "asana",
-                "mappings": {
-                    "name": "name",
-                    "desc": "notes",
-                    "due": "due_on",
-                    "labels": "tags"
-                }
-            },
-            {
-                "name": "GitHub to Jira",
-                "source": "github",
-                "destination": "jira",
-                "mappings": {
-                    "title": "summary",
-                    "body": "description",
-                    "state": "status",
-                    "labels": "labels"
-                }
-            }
-        ]
-    }
+    return cached_json(request, FIELD_MAPPING_TEMPLATES_ETAG, lambda: FIELD_MAPPING_TEMPLATES_RESPONSE, STATIC)
 
 
 @router.post("/setup/complete")
@@ -0,0 +1,64 @@
+"""
+Server-Sent Events endpoint
+Streams sync lifecycle and stats events to dashboards instead of polling
+"""
+
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Header, Request
+from fastapi.responses import StreamingResponse
+
+from app.services import fast_json
+from app.services.event_bus import event_bus
+from app.services.sync_engine import ensure_sync_engine
+
+router = APIRouter()
+
+HEARTBEAT_SECONDS = 15
+
+
+@router.get("/events")
+async def stream_events(request: Request, last_event_id: Optional[str] = Header(None)):
+    """
+    Stream dashboard events (text/event-stream)
+
+    Events:
+    - stats: total_syncs, last_sync_time, tasks_in_db (sent on connect and on change)
+    - sync_started, sync_progress (phase, counts), sync_completed (stats), sync_failed (error)
+
+    A comment line is sent every 15 seconds to keep proxies from closing
+    the connection. Browsers reconnect automatically and send
+    Last-Event-ID, from which buffered events are replayed.
+
+    Returns:
+        StreamingResponse: Event stream
+    """
+    try:
+        resume_from = int(last_event_id) if last_event_id else None
+    except ValueError:
+        resume_from = None
+
+    engine = await ensure_sync_engine()
+    subscription = event_bus.subscribe(resume_from)
+    initial_stats = await asyncio.to_thread(engine.get_stats)
+
+    async def stream():
+        try:
+            yield f"retry: 5000\nevent: stats\ndata: {fast_json.dumps(initial_stats)}\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield event.to_sse()
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
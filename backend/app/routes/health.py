@@ -5,6 +5,10 @@ Health check endpoint
 from fastapi import APIRouter
 from datetime import datetime
 from app.config import settings
+from app.integrations.github_tokens import get_token_pool, token_pool_ready
+from app.services.circuit_breaker import circuit_breakers
+from app.services.leader_election import scheduler_lease
+from app.services.sync_engine import sync_engine_ready
 
 router = APIRouter()
 
@@ -14,13 +18,22 @@ async def health_check():
     """
     Health check endpoint
     Returns system status and configuration
+
+    Status is "degraded" while any integration circuit breaker is not closed.
+    `github_tokens` reports the credential pool's rate-limit utilisation
+    once the GitHub integrations are in use.
     """
     return {
-        "status": "healthy",
+        "status": "degraded" if circuit_breakers.any_open() else "healthy",
         "app_name": settings.APP_NAME,
         "version": settings.VERSION,
         "timestamp": datetime.utcnow().isoformat(),
         "mode": "bot + user-tool" if settings.AUTO_SYNC_ENABLED else "user-tool",
         "auto_sync_enabled": settings.AUTO_SYNC_ENABLED,
-        "sync_interval_seconds": settings.SYNC_INTERVAL_SECONDS
+        "sync_interval_seconds": settings.SYNC_INTERVAL_SECONDS,
+        "worker_id": scheduler_lease.holder_id,
+        "scheduler_leader": scheduler_lease.is_leader,
+        "engine_ready": sync_engine_ready(),
+        "circuit_breakers": circuit_breakers.snapshot(),
+        "github_tokens": get_token_pool().snapshot() if token_pool_ready() else None
     }
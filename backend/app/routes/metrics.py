@@ -0,0 +1,81 @@
+"""
+Metrics endpoints
+Event-loop health and engine counters, as JSON and in Prometheus text format
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.integrations.github_tokens import get_token_pool, token_pool_ready
+from app.services.loop_monitor import loop_monitor
+from app.services.sync_engine import sync_engine_ready, get_sync_engine
+
+router = APIRouter()
+
+
+@router.get("/metrics/loop")
+async def get_loop_metrics():
+    """
+    Event-loop lag percentiles and the call sites that blocked the loop
+
+    Returns:
+        dict: Lag summary and offending call sites with their last stack
+    """
+    return {
+        "status": "ok",
+        "loop": loop_monitor.stats()
+    }
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Metrics in Prometheus text exposition format
+
+    Returns:
+        str: One sample per line
+    """
+    loop = loop_monitor.stats()
+    lines = [
+        "# HELP tasksync_event_loop_lag_seconds Event-loop scheduling lag over the recent window",
+        "# TYPE tasksync_event_loop_lag_seconds summary",
+    ]
+    for quantile, key in (("0.5", "p50"), ("0.9", "p90"), ("0.99", "p99")):
+        lines.append(f'tasksync_event_loop_lag_seconds{{quantile="{quantile}"}} {loop["lag_ms"][key] / 1000}')
+    lines += [
+        f"tasksync_event_loop_lag_seconds_max {loop['lag_ms']['max'] / 1000}",
+        "# HELP tasksync_event_loop_stalls_total Times the loop was blocked past the threshold",
+        "# TYPE tasksync_event_loop_stalls_total counter",
+        f"tasksync_event_loop_stalls_total {loop['stalls']}",
+        "# HELP tasksync_event_loop_blocking_sites_total Stalls attributed to each call site",
+        "# TYPE tasksync_event_loop_blocking_sites_total counter",
+    ]
+    for offender in loop["offenders"]:
+        site = offender["call_site"].replace("\\", "\\\\").replace('"', '\\"')
+        lines.append(f'tasksync_event_loop_blocking_sites_total{{site="{site}"}} {offender["count"]}')
+
+    if sync_engine_ready():
+        stats = get_sync_engine().get_stats()
+        lines += [
+            "# HELP tasksync_syncs_total Completed sync runs",
+            "# TYPE tasksync_syncs_total counter",
+            f"tasksync_syncs_total {stats.get('total_syncs', 0)}",
+            "# HELP tasksync_tasks Tasks in the local store",
+            "# TYPE tasksync_tasks gauge",
+            f"tasksync_tasks {stats.get('tasks_in_db', 0)}",
+        ]
+
+    if token_pool_ready():
+        pool = get_token_pool().snapshot()
+        lines += [
+            "# HELP tasksync_github_rate_limit_remaining Requests left in each credential's rate-limit window",
+            "# TYPE tasksync_github_rate_limit_remaining gauge",
+        ]
+        for name, credential in pool["credentials"].items():
+            lines.append(f'tasksync_github_rate_limit_remaining{{credential="{name}"}} {credential["remaining"]}')
+        lines += [
+            "# HELP tasksync_github_rate_limit_utilization Share of the pooled rate limit used",
+            "# TYPE tasksync_github_rate_limit_utilization gauge",
+            f"tasksync_github_rate_limit_utilization {pool['utilization']}",
+        ]
+    return "\n".join(lines) + "\n"
@@ -3,19 +3,55 @@ Sync endpoints - USER TOOL MODE
 These endpoints allow manual/user-triggered synchronization
 """
 
-from fastapi import APIRouter, HTTPException
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel
+from typing import List, Optional
 from datetime import datetime
 
-from app.services.sync_engine import SyncEngine
+from app.config import settings
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.http_cache import cached_json, make_etag
+from app.services.sync_engine import SyncInProgressError, ensure_sync_engine, new_sync_id
+from app.services.sync_profiler import PROFILE_MODES, ProfiledRun, profile_store
 from app.services.logger import logger
 
 router = APIRouter()
-sync_engine = SyncEngine()
+
+
+class DeadLetterReplay(BaseModel):
+    """Dead-letter entries to replay (all entries if omitted)"""
+    keys: Optional[List[str]] = None
+
+
+def _profiled(profile: Optional[str], sync_id: str) -> Optional[ProfiledRun]:
+    """Validate the profile option and build the profiler for one run"""
+    if not profile:
+        return None
+    if profile not in PROFILE_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid profile mode '{profile}' (expected one of {', '.join(PROFILE_MODES)})"
+        )
+    return ProfiledRun(profile_store, sync_id, profile, settings.PROFILE_SAMPLE_INTERVAL_MS / 1000)
+
+
+def _conflict(error: SyncInProgressError) -> HTTPException:
+    """409 for a run refused because another one holds the sync lock"""
+    return HTTPException(status_code=409, detail=str(error))
+
+
+def _unavailable(error: CircuitOpenError) -> HTTPException:
+    """503 with Retry-After for a call rejected by an open circuit breaker"""
+    return HTTPException(
+        status_code=503,
+        detail=str(error),
+        headers={"Retry-After": str(max(1, int(error.retry_after + 0.5)))}
+    )
 
 
 @router.post("/sync")
-async def trigger_sync():
+async def trigger_sync(profile: Optional[str] = None):
     """
     USER TOOL MODE: Manually trigger synchronization
     
@@ -23,43 +59,64 @@ async def trigger_sync():
     - Clicking a button in the UI
     - Making an API call
     - Running a script
+
+    Args:
+        profile: Run under a profiler - "sample" or "cprofile" (optional)
     
     Returns:
-        dict: Sync result with statistics
+        dict: Sync result with statistics (plus a profile summary if profiled)
     """
+    sync_id = new_sync_id()
+    run = _profiled(profile, sync_id)
     try:
         logger.info("🔄 Manual sync triggered by user (USER TOOL MODE)")
-        result = await sync_engine.sync()
+        sync_engine = await ensure_sync_engine()
+        if run is None:
+            result = await sync_engine.sync(sync_id)
+        else:
+            with run:
+                result = await sync_engine.sync(sync_id)
+            result["profile"] = run.summary()
         logger.info(f"✅ Manual sync completed: {result['message']}")
         return result
+    except SyncInProgressError as e:
+        logger.warning(f"⏸️  Manual sync refused: {str(e)}")
+        raise _conflict(e)
+    except CircuitOpenError as e:
+        logger.error(f"⚡ Manual sync failed: {str(e)}")
+        raise _unavailable(e)
     except Exception as e:
         logger.error(f"❌ Manual sync failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/sync/status")
-async def get_sync_status():
+async def get_sync_status(request: Request):
     """
     Get current synchronization status
+
+    Cached by ETag: answered with 304 until the next sync is recorded.
     
     Returns:
         dict: Current sync statistics and last sync time
     """
     try:
-        stats = sync_engine.get_stats()
-        return {
+        sync_engine = await ensure_sync_engine()
+        return cached_json(request, make_etag("status", sync_engine.state_version()), lambda: {
             "status": "ok",
-            "stats": stats,
+            "stats": sync_engine.get_stats(),
             "timestamp": datetime.utcnow().isoformat()
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/sync/history")
-async def get_sync_history(limit: Optional[int] = 10):
+async def get_sync_history(request: Request, limit: Optional[int] = 10):
     """
     Get synchronization history
+
+    Cached by ETag: answered with 304 until the next sync is recorded.
     
     Args:
         limit: Number of recent sync records to return
@@ -68,28 +125,164 @@ async def get_sync_history(limit: Optional[int] = 10):
         dict: List of recent sync operations
     """
     try:
-        history = sync_engine.get_history(limit)
-        return {
-            "status": "ok",
-            "history": history,
-            "count": len(history)
-        }
+        sync_engine = await ensure_sync_engine()
+
+        def build():
+            history = sync_engine.get_history(limit)
+            return {
+                "status": "ok",
+                "history": history,
+                "count": len(history)
+            }
+
+        return cached_json(request, make_etag("history", sync_engine.state_version(), limit), build)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/sync/dry-run")
-async def dry_run_sync():
+async def dry_run_sync(profile: Optional[str] = None):
     """
     Perform a dry-run sync (preview changes without applying)
+
+    Args:
+        profile: Run under a profiler - "sample" or "cprofile" (optional)
     
     Returns:
-        dict: Preview of what would be synced
+        dict: Preview of what would be synced (plus a profile summary if profiled)
     """
+    sync_id = f"dry-{new_sync_id()}"
+    run = _profiled(profile, sync_id)
     try:
         logger.info("🔍 Dry-run sync initiated")
-        result = await sync_engine.dry_run()
+        sync_engine = await ensure_sync_engine()
+        if run is None:
+            return await sync_engine.dry_run(sync_id)
+        with run:
+            result = await sync_engine.dry_run(sync_id)
+        result["profile"] = run.summary()
         return result
+    except CircuitOpenError as e:
+        logger.error(f"⚡ Dry-run failed: {str(e)}")
+        raise _unavailable(e)
     except Exception as e:
         logger.error(f"❌ Dry-run failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/sync/drift-check")
+async def drift_check():
+    """
+    Compare the destination against the last synced source snapshot
+
+    Only Merkle ranges whose hashes differ are inspected; nothing is pushed.
+
+    Returns:
+        dict: Drift report (missing, drifted and extra task IDs)
+    """
+    try:
+        sync_engine = await ensure_sync_engine()
+        report = await sync_engine.check_drift()
+        return {
+            "status": "ok",
+            "report": report
+        }
+    except CircuitOpenError as e:
+        logger.error(f"⚡ Drift check failed: {str(e)}")
+        raise _unavailable(e)
+    except Exception as e:
+        logger.error(f"❌ Drift check failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/sync/dead-letters")
+async def list_dead_letters(quarantined: Optional[bool] = None):
+    """
+    List failed pushes waiting for a retry or quarantined
+
+    Args:
+        quarantined: Only quarantined (true) or only scheduled (false) entries
+
+    Returns:
+        dict: Entries with failure reason, attempts and next retry time
+    """
+    try:
+        sync_engine = await ensure_sync_engine()
+        entries = sync_engine.dead_letters.list(quarantined)
+        return {
+            "status": "ok",
+            "dead_letters": entries,
+            "count": len(entries)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/sync/dead-letters/replay")
+async def replay_dead_letters(replay: Optional[DeadLetterReplay] = None):
+    """
+    Push dead-lettered operations now, including quarantined ones
+
+    Args:
+        replay: Entry keys to replay (default: every entry)
+
+    Returns:
+        dict: Retry record (pushed and failed counts)
+    """
+    try:
+        sync_engine = await ensure_sync_engine()
+        keys = replay.keys if replay and replay.keys is not None else [
+            entry["key"] for entry in sync_engine.dead_letters.list()
+        ]
+        logger.info(f"📬 Replaying {len(keys)} dead-lettered pushes")
+        return {
+            "status": "ok",
+            "result": await sync_engine.retry_dead_letters(keys)
+        }
+    except SyncInProgressError as e:
+        logger.warning(f"⏸️  Dead-letter replay refused: {str(e)}")
+        raise _conflict(e)
+    except CircuitOpenError as e:
+        logger.error(f"⚡ Dead-letter replay failed: {str(e)}")
+        raise _unavailable(e)
+    except Exception as e:
+        logger.error(f"❌ Dead-letter replay failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/sync/profiles")
+async def list_profiles():
+    """
+    List stored sync profiles
+
+    Returns:
+        dict: Profiles, newest first
+    """
+    profiles = profile_store.list()
+    return {
+        "status": "ok",
+        "profiles": profiles,
+        "count": len(profiles)
+    }
+
+
+@router.get("/sync/profiles/{sync_id}", response_class=PlainTextResponse)
+async def get_profile(sync_id: str):
+    """
+    Get the collapsed stacks recorded for one sync run
+
+    The output feeds flamegraph.pl, speedscope or inferno directly.
+
+    Args:
+        sync_id: Sync run ID (dry runs are prefixed with "dry-")
+
+    Returns:
+        str: One "frame;frame;frame count" line per stack
+    """
+    try:
+        collapsed = profile_store.get(sync_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if collapsed is None:
+        raise HTTPException(status_code=404, detail=f"No profile for sync {sync_id}")
+    return collapsed
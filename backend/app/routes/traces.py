@@ -0,0 +1,51 @@
+"""
+Trace endpoints
+Inspect and export the spans recorded for recent sync runs
+"""
+
+from fastapi import APIRouter, HTTPException
+from typing import Optional
+
+from app.services.tracing import tracer
+
+router = APIRouter()
+
+
+@router.get("/traces")
+async def list_traces(limit: Optional[int] = 20):
+    """
+    List the most recent traces still in the span buffer
+
+    Args:
+        limit: Number of traces to return
+
+    Returns:
+        dict: Trace summaries, newest first
+    """
+    traces = tracer.recent_traces(limit)
+    return {
+        "status": "ok",
+        "traces": traces,
+        "count": len(traces)
+    }
+
+
+@router.get("/traces/{trace_or_sync_id}")
+async def get_trace(trace_or_sync_id: str, format: str = "json"):
+    """
+    Export one trace
+
+    Args:
+        trace_or_sync_id: Trace ID, or the sync ID of a sync / dry-run
+        format: "json" (flat span list) or "otlp" (OTLP/JSON, collector-ready)
+
+    Returns:
+        dict: The trace in the requested format
+    """
+    if format not in ("json", "otlp"):
+        raise HTTPException(status_code=400, detail=f"Invalid format '{format}' (expected json or otlp)")
+    trace_id = tracer.find_trace_id(trace_or_sync_id) or trace_or_sync_id
+    trace = tracer.export_json(trace_id)
+    if not trace["spans"]:
+        raise HTTPException(status_code=404, detail=f"No trace for {trace_or_sync_id}")
+    return trace if format == "json" else tracer.export_otlp(trace_id)
@@ -0,0 +1,386 @@
+"""
+Append-only change log of applied task changes
+Every add, update and delete the sync engine applies is appended to segment
+files with a monotonic offset, so downstream consumers can tail the changes
+from a cursor instead of polling sync history
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.models.task import Task
+from app.services import fast_json
+from app.services.logger import logger
+
+try:
+    import fcntl  # serializes appends across workers sharing the directory
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+SEGMENT_SUFFIX = ".log"
+
+
+def _segment_name(base_offset: int) -> str:
+    return f"{base_offset:020d}{SEGMENT_SUFFIX}"
+
+
+def _record_offset(line: bytes) -> int:
+    return fast_json.loads(line)["offset"]
+
+
+def _seek_offset(f, size: int, cursor: int) -> int:
+    """
+    Byte position of the first record at or after an offset
+
+    Records are sorted by offset, so the segment is bisected by byte
+    position: each probe skips to the next line start and reads one record.
+    Another worker may be appending to the segment; a partly written last
+    line counts as the end.
+
+    Args:
+        f: Segment file opened in binary mode
+        size: Segment size in bytes
+        cursor: Offset to find
+
+    Returns:
+        int: Position of the first record with offset >= cursor (size if none)
+    """
+    # low and high are record starts (or the end); the answer lies between them
+    low, high = 0, size
+    while low < high:
+        middle = (low + high) // 2
+        f.seek(middle)
+        if middle > low:
+            f.readline()  # partial line
+        start = f.tell()
+        if start >= high:
+            # No record starts after the middle; probe the one at low
+            start = f.seek(low)
+        line = f.readline()
+        if not line.endswith(b"\n") or _record_offset(line) >= cursor:
+            high = start
+        else:
+            low = start + len(line)
+    return low
+
+
+@contextmanager
+def _flocked(path: str) -> Iterator[None]:
+    """Hold an exclusive lock on a lock file (shared by every worker using the directory)"""
+    with open(path, "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _truncate_torn_tail(path: str):
+    """Cut a partly written last record (left by a crash mid-append)"""
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        if end == 0:
+            return
+        f.seek(end - 1)
+        if f.read(1) == b"\n":
+            return
+        position = end
+        while position > 0:
+            step = min(65536, position)
+            position -= step
+            f.seek(position)
+            newline = f.read(step).rfind(b"\n")
+            if newline != -1:
+                f.truncate(position + newline + 1)
+                break
+        else:
+            f.truncate(0)
+    logger.warning(f"⚠️  Dropped a partly written change log record in {path}")
+
+
+def _last_line(path: str) -> Optional[bytes]:
+    """Last complete record of a segment (None if it has none); a line still being written is skipped"""
+    with open(path, "rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        position, tail = end, b""
+        while position > 0:
+            step = min(65536, position)
+            position -= step
+            f.seek(position)
+            tail = f.read(step) + tail
+            complete = tail[:tail.rfind(b"\n") + 1]
+            lines = complete.rstrip(b"\n").rsplit(b"\n", 1)
+            if len(lines) == 2 or position == 0:
+                return lines[-1] or None
+    return None
+
+
+class ChangeLog:
+    """
+    Segmented change log in a directory
+
+    Records are JSON lines: offset, timestamp, sync_id, op ("add", "update"
+    or "delete"), target side, task_id (source task ID), target_id (ID on
+    the target side), fields written and the task. Each segment file is
+    named after the first offset it may hold; a new segment starts once
+    the active one reaches `segment_bytes`.
+
+    When a segment is closed, retention drops the oldest segments beyond
+    `retention_bytes` or older than `retention_seconds`, and compaction
+    rewrites closed segments to keep only the latest record per (side,
+    task). Both run in a background thread, one pass at a time per
+    directory, so an append never waits for them. Offsets never change,
+    so a consumer's cursor stays valid; it just skips superseded records.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 16 * 1024 * 1024,
+        retention_bytes: int = 0,
+        retention_seconds: float = 0,
+        compact: bool = True
+    ):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.retention_bytes = retention_bytes
+        self.retention_seconds = retention_seconds
+        self.compact_segments = compact
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._lock_path = os.path.join(directory, ".lock")
+        self._maintenance_lock_path = os.path.join(directory, ".maintenance.lock")
+        self._maintenance_guard = threading.Lock()
+        self._maintenance_thread: Optional[threading.Thread] = None
+        self._maintenance_pending = False
+        # (active segment, size) -> next offset, so appends and polls skip re-reading the tail
+        self._head: Tuple[Optional[str], int, int] = (None, -1, 0)
+        self._tail_checked = False
+
+    def _segments(self) -> List[Tuple[int, str]]:
+        """(base offset, path) of every segment, oldest first"""
+        return sorted(
+            (int(name[:-len(SEGMENT_SUFFIX)]), os.path.join(self.directory, name))
+            for name in os.listdir(self.directory)
+            if name.endswith(SEGMENT_SUFFIX) and name[:-len(SEGMENT_SUFFIX)].isdigit()
+        )
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        with self._lock, _flocked(self._lock_path):
+            yield
+
+    def next_offset(self) -> int:
+        """Offset the next appended record will get"""
+        segments = self._segments()
+        if not segments:
+            return 0
+        base, path = segments[-1]
+        size = os.path.getsize(path)
+        cached_path, cached_size, cached_next = self._head
+        if (cached_path, cached_size) == (path, size):
+            return cached_next
+        line = _last_line(path)
+        next_offset = _record_offset(line) + 1 if line else base
+        self._head = (path, size, next_offset)
+        return next_offset
+
+    def append(
+        self,
+        op: str,
+        task: Task,
+        target: str = "destination",
+        target_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        sync_id: Optional[str] = None
+    ) -> int:
+        """
+        Append one applied change
+
+        Args:
+            op: "add", "update" or "delete"
+            task: Task as written (for deletes, the task that was closed)
+            target: Side the change was applied to
+            target_id: Task ID on that side (default: task.id)
+            task_id: Source task ID (default: task.id)
+            fields: Fields an update wrote (None: all)
+            sync_id: Run that applied the change
+
+        Returns:
+            int: Offset of the record
+        """
+        with self._exclusive():
+            segments = self._segments()
+            if segments and not self._tail_checked:
+                _truncate_torn_tail(segments[-1][1])
+                self._head = (None, -1, 0)
+            self._tail_checked = True
+            offset = self.next_offset()
+            path = segments[-1][1] if segments else os.path.join(self.directory, _segment_name(offset))
+            rolled = bool(segments) and os.path.getsize(path) >= self.segment_bytes
+            if rolled:
+                path = os.path.join(self.directory, _segment_name(offset))
+
+            record = {
+                "offset": offset,
+                "timestamp": datetime.utcnow().isoformat(),
+                "sync_id": sync_id,
+                "op": op,
+                "target": target,
+                "task_id": task_id or task.id,
+                "target_id": target_id or task.id,
+                "fields": fields,
+                "task": task.model_dump(mode="json")
+            }
+            with open(path, "ab") as f:
+                f.write(fast_json.dumps(record).encode("utf-8") + b"\n")
+                size = f.tell()
+            self._head = (path, size, offset + 1)
+
+        if rolled:
+            self._schedule_maintenance()
+        return offset
+
+    def read(self, cursor: int = 0, limit: int = 500) -> Dict[str, Any]:
+        """
+        Records from a cursor on
+
+        Args:
+            cursor: First offset wanted (a consumer passes its last next_cursor)
+            limit: Maximum records to return
+
+        Returns:
+            dict: changes, next_cursor, earliest_offset and truncated (True if
+                  records between the cursor and earliest_offset were dropped
+                  by retention)
+        """
+        segments = self._segments()
+        earliest = segments[0][0] if segments else self.next_offset()
+        truncated = cursor < earliest
+        cursor = max(cursor, earliest)
+
+        changes: List[Dict[str, Any]] = []
+        # Start in the last segment whose base offset is not past the cursor
+        start = max((index for index, (base, _) in enumerate(segments) if base <= cursor), default=0)
+        for _, path in segments[start:]:
+            try:
+                f = open(path, "rb")
+            except FileNotFoundError:
+                continue  # removed by retention since it was listed
+            with f:
+                size = f.seek(0, os.SEEK_END)
+                f.seek(_seek_offset(f, size, cursor))
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # being appended right now
+                    changes.append(fast_json.loads(line))
+                    if len(changes) >= limit:
+                        break
+            if len(changes) >= limit:
+                break
+
+        next_cursor = changes[-1]["offset"] + 1 if changes else max(cursor, self.next_offset())
+        return {
+            "changes": changes,
+            "next_cursor": next_cursor,
+            "earliest_offset": earliest,
+            "truncated": truncated
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Segment count, size on disk and offset range"""
+        segments = self._segments()
+        return {
+            "segments": len(segments),
+            "bytes": sum(os.path.getsize(path) for _, path in segments),
+            "earliest_offset": segments[0][0] if segments else 0,
+            "next_offset": self.next_offset()
+        }
+
+    def _schedule_maintenance(self):
+        """Start retention and compaction in the background (or queue one more pass)"""
+        with self._maintenance_guard:
+            self._maintenance_pending = True
+            if self._maintenance_thread is None:
+                self._maintenance_thread = threading.Thread(
+                    target=self._maintain, name="change-log-maintenance", daemon=True
+                )
+                self._maintenance_thread.start()
+
+    def _maintain(self):
+        """Background thread: run passes until no segment roll is waiting"""
+        while True:
+            with self._maintenance_guard:
+                if not self._maintenance_pending:
+                    self._maintenance_thread = None
+                    return
+                self._maintenance_pending = False
+            try:
+                # Appends take the other lock, so they go on while this runs
+                with _flocked(self._maintenance_lock_path):
+                    self._apply_retention()
+                    if self.compact_segments:
+                        self._compact()
+            except Exception as e:
+                logger.error(f"❌ Change log maintenance failed: {str(e)}")
+
+    def _apply_retention(self):
+        """Drop the oldest closed segments beyond the size or age limit"""
+        segments = self._segments()
+        closed = segments[:-1]
+        total = sum(os.path.getsize(path) for _, path in segments)
+        now = time.time()
+        dropped = 0
+        for _, path in closed:
+            too_big = self.retention_bytes and total > self.retention_bytes
+            too_old = self.retention_seconds and now - os.path.getmtime(path) > self.retention_seconds
+            if not (too_big or too_old):
+                break
+            total -= os.path.getsize(path)
+            os.remove(path)
+            dropped += 1
+        if dropped:
+            logger.info(f"🧹 Change log retention dropped {dropped} segments")
+
+    def _compact(self):
+        """Rewrite closed segments keeping only the latest record per (side, task)"""
+        segments = self._segments()
+        latest: Dict[Tuple[str, str], int] = {}
+        for _, path in segments:
+            with open(path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # being appended right now
+                    record = fast_json.loads(line)
+                    latest[(record["target"], record["task_id"])] = record["offset"]
+
+        removed = 0
+        for _, path in segments[:-1]:
+            with open(path, "rb") as f:
+                lines = f.readlines()
+            kept = []
+            for line in lines:
+                record = fast_json.loads(line)
+                if latest[(record["target"], record["task_id"])] == record["offset"]:
+                    kept.append(line)
+            if len(kept) == len(lines):
+                continue
+            removed += len(lines) - len(kept)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.writelines(kept)
+                f.flush()
+                os.fsync(f.fileno())
+            # The file keeps its age for retention
+            stat = os.stat(path)
+            os.utime(tmp_path, (stat.st_atime, stat.st_mtime))
+            os.replace(tmp_path, path)
+        if removed:
+            logger.info(f"🗜️  Change log compaction removed {removed} superseded records")
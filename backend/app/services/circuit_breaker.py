@@ -0,0 +1,220 @@
+"""
+Circuit breakers for outbound integration calls
+One breaker per integration endpoint (e.g. a GitHub repository) tracks the
+error rate and latency of recent calls and fails fast while the endpoint is
+degraded
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, Optional, Tuple
+
+from app.config import settings
+from app.services.logger import logger
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose breaker is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f"{name} is unavailable (circuit open, retry in {retry_after:.0f}s)")
+
+
+class CallOutcome:
+    """Lets the guarded block mark a completed call as failed (e.g. HTTP 5xx)"""
+
+    __slots__ = ("failed",)
+
+    def __init__(self):
+        self.failed = False
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker over a sliding window of calls
+
+    - closed: calls go through; once the window holds at least `min_calls`
+      calls and the share of failed or slow calls reaches `failure_rate`,
+      the breaker opens
+    - open: calls fail immediately with CircuitOpenError for `open_seconds`
+    - half-open: a single probe call is let through; success closes the
+      breaker, failure opens it again. Other calls fail fast meanwhile.
+
+    A call counts as slow when it takes longer than `slow_call_seconds`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        min_calls: int = 5,
+        failure_rate: float = 0.5,
+        slow_call_seconds: float = 10.0,
+        open_seconds: float = 30.0
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self._calls: Deque[Tuple[bool, float]] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.times_opened = 0
+        self.last_error: Optional[str] = None
+
+    def _before_call(self) -> bool:
+        """
+        Admit or reject a call
+
+        Returns:
+            bool: True if the admitted call is the half-open probe
+        """
+        with self._lock:
+            if self.state == OPEN:
+                waited = time.monotonic() - self._opened_at
+                if waited < self.open_seconds:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.name, self.open_seconds - waited)
+                self.state = HALF_OPEN
+                logger.info(f"🔌 Circuit for {self.name} half-open, probing")
+            if self.state == HALF_OPEN:
+                if self._probe_in_flight:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.name, self.open_seconds)
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def _after_call(self, probe: bool, failed: bool, latency: float, error: Optional[str] = None):
+        """Record a finished call and move between states"""
+        bad = failed or latency > self.slow_call_seconds
+        with self._lock:
+            if bad:
+                self.last_error = error or (f"slow call ({latency:.1f}s)" if not failed else "failed")
+            if probe:
+                self._probe_in_flight = False
+                if bad:
+                    self._open()
+                else:
+                    self.state = CLOSED
+                    self._calls.clear()
+                    logger.info(f"✅ Circuit for {self.name} closed")
+                return
+            self._calls.append((bad, latency))
+            if self.state == CLOSED and len(self._calls) >= self.min_calls:
+                failures = sum(1 for call_bad, _ in self._calls if call_bad)
+                if failures / len(self._calls) >= self.failure_rate:
+                    self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self.times_opened += 1
+        logger.warning(f"⚡ Circuit for {self.name} opened for {self.open_seconds:.0f}s: {self.last_error}")
+
+    @contextmanager
+    def guard(self) -> Iterator[CallOutcome]:
+        """
+        Run one call through the breaker
+
+        Exceptions raised in the block count as failures; the block can
+        also set `outcome.failed` for responses that are errors.
+
+        Usage:
+            with breaker.guard() as outcome:
+                response = requests.get(url, timeout=5)
+                outcome.failed = response.status_code >= 500
+
+        Raises:
+            CircuitOpenError: The breaker is open (nothing is called)
+        """
+        probe = self._before_call()
+        outcome = CallOutcome()
+        start = time.monotonic()
+        try:
+            yield outcome
+        except BaseException as e:
+            self._after_call(probe, True, time.monotonic() - start, str(e) or type(e).__name__)
+            raise
+        self._after_call(probe, outcome.failed, time.monotonic() - start)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current state for /api/health
+
+        Returns:
+            dict: State, recent failure rate and latency, and counters
+        """
+        with self._lock:
+            calls = list(self._calls)
+            state = self.state
+            retry_after = max(0.0, self.open_seconds - (time.monotonic() - self._opened_at)) if state == OPEN else 0.0
+        failures = sum(1 for bad, _ in calls if bad)
+        latencies = sorted(latency for _, latency in calls)
+        return {
+            "state": state,
+            "recent_calls": len(calls),
+            "failure_rate": round(failures / len(calls), 3) if calls else 0.0,
+            "p50_latency_ms": round(latencies[len(latencies) // 2] * 1000, 1) if latencies else 0.0,
+            "max_latency_ms": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+            "retry_after_seconds": round(retry_after, 1),
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "last_error": self.last_error
+        }
+
+
+class BreakerRegistry:
+    """Breakers by name, created on first use with the configured thresholds"""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        """
+        Breaker for an integration endpoint
+
+        Args:
+            name: Endpoint name (e.g. "github:owner/repo")
+
+        Returns:
+            CircuitBreaker: Shared breaker for that endpoint
+        """
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = self._breakers[name] = CircuitBreaker(
+                    name,
+                    window=settings.BREAKER_WINDOW,
+                    min_calls=settings.BREAKER_MIN_CALLS,
+                    failure_rate=settings.BREAKER_FAILURE_RATE,
+                    slow_call_seconds=settings.BREAKER_SLOW_CALL_MS / 1000,
+                    open_seconds=settings.BREAKER_OPEN_SECONDS
+                )
+            return breaker
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """State of every breaker, by name"""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+    def any_open(self) -> bool:
+        with self._lock:
+            return any(breaker.state != CLOSED for breaker in self._breakers.values())
+
+
+circuit_breakers = BreakerRegistry()
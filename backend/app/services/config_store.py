@@ -0,0 +1,49 @@
+"""
+Configuration store for Task Sync Engine
+User-editable settings, integrations and sync rules persisted as JSON
+"""
+
+import hashlib
+import os
+import json
+from typing import Dict, Any
+
+# Configuration file path
+CONFIG_FILE = "user_config.json"
+
+
+def load_config() -> Dict[str, Any]:
+    """Load configuration from file"""
+    if os.path.exists(CONFIG_FILE):
+        with open(CONFIG_FILE, 'r') as f:
+            return json.load(f)
+    return {
+        "settings": {},
+        "integrations": [],
+        "sync_rules": []
+    }
+
+
+def save_config(config: Dict[str, Any]):
+    """Save configuration to file"""
+    with open(CONFIG_FILE, 'w') as f:
+        json.dump(config, f, indent=2)
+
+
+def config_version() -> str:
+    """
+    Version token of the stored configuration
+
+    A hash of the config file's contents, so it changes on every
+    save_config that changes anything (even two saves of the same size
+    within one timestamp tick) and every worker sees the same value. The
+    file is small; hashing it costs far less than parsing it.
+
+    Returns:
+        str: Opaque version token
+    """
+    try:
+        with open(CONFIG_FILE, 'rb') as f:
+            return hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+    except FileNotFoundError:
+        return "default"
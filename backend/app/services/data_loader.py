@@ -3,12 +3,19 @@ Data loader for Task Sync Engine
 Responsible for loading data from source and destination systems
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, FrozenSet, Tuple
 from datetime import datetime
+import asyncio
 import random
+import time
 
+from app.integrations.github_tokens import credentials_configured, get_token_pool
 from app.models.task import Task
+from app.services.circuit_breaker import CircuitOpenError
 from app.services.logger import logger
+from app.services.rate_budget import RateBudget
+from app.services.task_converter import TaskConverter
+from app.services.tracing import tracer
 from app.config import settings
 
 
@@ -21,37 +28,62 @@ class DataLoader:
     def __init__(self):
         self.source_type = settings.SOURCE_TYPE
         self.destination_type = settings.DEST_TYPE
+        self.converter = TaskConverter(settings.CONVERT_POOL, settings.CONVERT_POOL_WORKERS or None)
+        # Paces every destination write, whichever code path planned it
+        self.push_budget = RateBudget(settings.PUSH_RATE_PER_MINUTE)
+        # Set at shutdown: no further push starts, the rest is deferred
+        self.draining = False
 
         # Initialize GitHub integrations if configured
         self.github_source = None
         self.github_dest = None
 
-        if self.source_type == "github" and settings.GITHUB_TOKEN and settings.GITHUB_SOURCE_REPO:
+        if self.source_type == "github" and credentials_configured() and settings.GITHUB_SOURCE_REPO:
             from app.integrations.github_integration import GitHubIntegration
             owner, repo = settings.GITHUB_SOURCE_REPO.split("/")
-            self.github_source = GitHubIntegration(settings.GITHUB_TOKEN, owner, repo)
+            self.github_source = GitHubIntegration(get_token_pool(), owner, repo)
             logger.info(f"✅ GitHub source integration initialized: {settings.GITHUB_SOURCE_REPO}")
 
-        if self.destination_type == "github" and settings.GITHUB_TOKEN and settings.GITHUB_DEST_REPO:
+        if self.destination_type == "github" and credentials_configured() and settings.GITHUB_DEST_REPO:
             from app.integrations.github_integration import GitHubIntegration
             owner, repo = settings.GITHUB_DEST_REPO.split("/")
-            self.github_dest = GitHubIntegration(settings.GITHUB_TOKEN, owner, repo)
+            self.github_dest = GitHubIntegration(get_token_pool(), owner, repo)
             logger.info(f"✅ GitHub destination integration initialized: {settings.GITHUB_DEST_REPO}")
     
-    async def load_source_tasks(self) -> List[Task]:
+    def split_source_filters(self, filters: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Split rule filters into a source query and a local remainder
+
+        Args:
+            filters: SyncRule.filters
+
+        Returns:
+            tuple: (query, residual filters), or None if the source cannot
+                   filter server-side
+        """
+        if self.source_type == "github" and self.github_source:
+            return self.github_source.split_filters(filters)
+        return None
+
+    async def load_source_tasks(self, query: Optional[Dict[str, Any]] = None) -> List[Task]:
         """
         Load tasks from the source system
 
+        Args:
+            query: Server-side filter from split_source_filters (optional)
+
         Returns:
             List[Task]: Tasks from the source
         """
         logger.info(f"📥 Loading tasks from source ({self.source_type})...")
 
-        if self.source_type == "github" and self.github_source:
-            tasks = self.github_source.fetch_issues(state="all")
-        else:
-            # Fallback to mock data
-            tasks = self._generate_mock_source_tasks()
+        with tracer.span("load_source", source=self.source_type, query=str(query or {})) as span:
+            if self.source_type == "github" and self.github_source:
+                tasks = await self._fetch_github_tasks(self.github_source, query)
+            else:
+                # Fallback to mock data
+                tasks = self._generate_mock_source_tasks()
+            span.set(task_count=len(tasks))
 
         logger.info(f"✅ Loaded {len(tasks)} tasks from source")
         return tasks
@@ -65,56 +97,287 @@ class DataLoader:
         """
         logger.info(f"📥 Loading tasks from destination ({self.destination_type})...")
 
-        if self.destination_type == "github" and self.github_dest:
-            tasks = self.github_dest.fetch_issues(state="all")
-        else:
-            # Fallback to mock data
-            tasks = self._generate_mock_destination_tasks()
+        with tracer.span("load_destination", destination=self.destination_type) as span:
+            if self.destination_type == "github" and self.github_dest:
+                tasks = await self._fetch_github_tasks(self.github_dest)
+            else:
+                # Fallback to mock data
+                tasks = self._generate_mock_destination_tasks()
+            span.set(task_count=len(tasks))
 
         logger.info(f"✅ Loaded {len(tasks)} tasks from destination")
         return tasks
     
-    async def push_to_destination(self, tasks: List[Task]) -> Dict[str, Any]:
+    async def _fetch_github_tasks(self, integration, query: Optional[Dict[str, Any]] = None) -> List[Task]:
+        """
+        Fetch all issues from a GitHub integration, converting pages in the pool
+
+        Args:
+            integration: GitHubIntegration to read from
+            query: Extra issues-API parameters (optional)
+
+        Returns:
+            List[Task]: Converted tasks
+        """
+        tasks = []
+        async for chunk in integration.iter_issue_chunks(self.converter, state="all", query=query):
+            tasks.extend(chunk)
+        return tasks
+
+    async def push_to_destination(
+        self,
+        tasks: List[Task],
+        id_mappings: Optional[Dict[str, str]] = None,
+        on_pushed: Optional[Callable[[Task, str], None]] = None,
+        fields: Optional[Dict[str, List[str]]] = None,
+        deadline: Optional[float] = None,
+        on_failed: Optional[Callable[[Task, str], None]] = None
+    ) -> Dict[str, Any]:
         """
         Push tasks to the destination system
 
         Args:
             tasks: List of tasks to push
+            id_mappings: Source task ID -> destination task ID for tasks
+                         that were pushed before
+            on_pushed: Called with (task, destination id) after each
+                       successful push
+            fields: Task ID -> fields to write, for updates that should
+                    only touch some fields (default: all)
+            deadline: time.monotonic() after which no push may start;
+                      tasks not reached are deferred, not failed
+            on_failed: Called with (task, error message) after each failed push
 
         Returns:
             dict: Result of the push operation
         """
         logger.info(f"📤 Pushing {len(tasks)} tasks to destination ({self.destination_type})...")
 
+        id_mappings = id_mappings or {}
         success_count = 0
         failed_count = 0
+        deferred_count = 0
+        update_count = 0
+        update_bytes = 0
 
         if self.destination_type == "github" and self.github_dest:
+            # GitHub writes block, so each runs in a thread: the event loop
+            # keeps serving requests and can start a drain mid-push
             for task in tasks:
+                if self._past_deadline(deadline):
+                    deferred_count = len(tasks) - success_count - failed_count
+                    break
+                await self.push_budget.acquire()
                 try:
-                    # Check if task already exists in GitHub (has github-XX id)
-                    if task.id.startswith("github-"):
-                        # Update existing issue
-                        issue_number = int(task.id.replace("github-", ""))
-                        self.github_dest.update_issue(issue_number, task)
-                    else:
-                        # Create new issue
-                        self.github_dest.create_issue(task)
+                    # Known destination issue: previously pushed, or same github-XX id
+                    dest_id = id_mappings.get(task.id)
+                    if dest_id is None and task.id.startswith("github-"):
+                        dest_id = task.id
+
+                    with tracer.span("push", task_id=task.id) as span:
+                        if dest_id is not None:
+                            # Update existing issue
+                            span.set(action="update", dest_id=dest_id)
+                            issue_number = int(dest_id.replace("github-", ""))
+                            body = self.github_dest.patch_body(task, (fields or {}).get(task.id))
+                            span.set(payload_bytes=len(body))
+                            await asyncio.to_thread(self.github_dest.update_issue, issue_number, task, body=body)
+                            update_count += 1
+                            update_bytes += len(body)
+                        else:
+                            # Create new issue
+                            span.set(action="create")
+                            issue = await asyncio.to_thread(self.github_dest.create_issue, task)
+                            dest_id = f"github-{issue['number']}"
+                            span.set(dest_id=dest_id)
                     success_count += 1
+                    if on_pushed:
+                        on_pushed(task, dest_id)
+                except CircuitOpenError as e:
+                    # Destination is down: leave the rest for the next sync
+                    skipped = len(tasks) - success_count - failed_count
+                    logger.error(f"⚡ Stopped pushing, {skipped} tasks not pushed: {str(e)}")
+                    failed_count += skipped
+                    break
                 except Exception as e:
                     logger.error(f"Failed to push task {task.id}: {str(e)}")
                     failed_count += 1
+                    if on_failed:
+                        on_failed(task, str(e))
         else:
             # Mock implementation
             success_count = len(tasks)
+            if on_pushed:
+                for task in tasks:
+                    on_pushed(task, id_mappings.get(task.id, task.id))
 
         logger.info(f"✅ Successfully pushed {success_count} tasks, {failed_count} failed")
         return {
             "success": True,
             "pushed_count": success_count,
-            "failed_count": failed_count
+            "failed_count": failed_count,
+            "deferred_count": deferred_count,
+            "update_count": update_count,
+            "update_bytes": update_bytes
         }
     
+    async def push_to_source(
+        self,
+        tasks: List[Tuple[str, Task]],
+        fields: Optional[Dict[str, List[str]]] = None,
+        on_pushed: Optional[Callable[[Task, str], None]] = None,
+        deadline: Optional[float] = None,
+        on_failed: Optional[Callable[[Task, str], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Push changes made in the destination back to the source (bidirectional sync)
+
+        Args:
+            tasks: (action, task) pairs, pushed in order. "create" tasks are
+                   destination tasks with no source counterpart yet;
+                   "update" tasks carry source IDs and merged field values
+            fields: Source task ID -> fields to write (default: all)
+            on_pushed: Called with (task, source id) after each successful push
+            deadline: time.monotonic() after which no push may start
+            on_failed: Called with (task, error message) after each failed push
+
+        Returns:
+            dict: Result of the push operation
+        """
+        logger.info(f"📥 Pushing {len(tasks)} tasks back to source ({self.source_type})...")
+
+        success_count = 0
+        failed_count = 0
+        deferred_count = 0
+        update_count = 0
+        update_bytes = 0
+
+        if self.source_type == "github" and self.github_source:
+            for action, task in tasks:
+                if self._past_deadline(deadline):
+                    deferred_count = len(tasks) - success_count - failed_count
+                    break
+                await self.push_budget.acquire()
+                try:
+                    with tracer.span("push_source", task_id=task.id, action=action) as span:
+                        if action == "update":
+                            issue_number = int(task.id.replace("github-", ""))
+                            body = self.github_source.patch_body(task, (fields or {}).get(task.id))
+                            span.set(payload_bytes=len(body))
+                            await asyncio.to_thread(self.github_source.update_issue, issue_number, task, body=body)
+                            source_id = task.id
+                            update_count += 1
+                            update_bytes += len(body)
+                        else:
+                            issue = await asyncio.to_thread(self.github_source.create_issue, task)
+                            source_id = f"github-{issue['number']}"
+                        span.set(source_id=source_id)
+                    success_count += 1
+                    if on_pushed:
+                        on_pushed(task, source_id)
+                except CircuitOpenError as e:
+                    skipped = len(tasks) - success_count - failed_count
+                    logger.error(f"⚡ Stopped pushing to source, {skipped} tasks not pushed: {str(e)}")
+                    failed_count += skipped
+                    break
+                except Exception as e:
+                    logger.error(f"Failed to push task {task.id} to source: {str(e)}")
+                    failed_count += 1
+                    if on_failed:
+                        on_failed(task, str(e))
+        else:
+            # Mock implementation
+            success_count = len(tasks)
+            if on_pushed:
+                for _, task in tasks:
+                    on_pushed(task, task.id)
+
+        logger.info(f"✅ Pushed {success_count} tasks back to source, {failed_count} failed")
+        return {
+            "success": True,
+            "pushed_count": success_count,
+            "failed_count": failed_count,
+            "deferred_count": deferred_count,
+            "update_count": update_count,
+            "update_bytes": update_bytes
+        }
+
+    def destination_fields(self) -> Optional[FrozenSet[str]]:
+        """
+        Task fields the destination stores on update
+
+        Returns:
+            frozenset: Field names, or None if every field is stored
+        """
+        if self.destination_type == "github" and self.github_dest:
+            from app.integrations.github_integration import ISSUE_FIELDS
+            return frozenset(ISSUE_FIELDS)
+        return None
+
+    def _past_deadline(self, deadline: Optional[float]) -> bool:
+        """Whether the next push (after its rate-budget wait) would start past the deadline"""
+        if self.draining:
+            logger.warning("⏳ Shutting down; remaining tasks are deferred to the next sync")
+            return True
+        if deadline is None or time.monotonic() + self.push_budget.peek() < deadline:
+            return False
+        logger.warning("⏳ Push deadline reached; remaining tasks are deferred to the next sync")
+        return True
+
+    async def close_in_destination(
+        self,
+        tasks: List[Task],
+        on_closed: Optional[Callable[[Task], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Close destination tasks whose source counterpart was deleted
+
+        GitHub issues cannot be deleted through the API, so they are closed.
+
+        Args:
+            tasks: Destination tasks to close
+            on_closed: Called with the closed task after each close
+
+        Returns:
+            dict: Result of the close operation
+        """
+        logger.info(f"🗑️  Closing {len(tasks)} deleted tasks in destination ({self.destination_type})...")
+
+        success_count = 0
+        failed_count = 0
+
+        if self.destination_type == "github" and self.github_dest:
+            for task in tasks:
+                await self.push_budget.acquire()
+                try:
+                    closed = task.model_copy(update={"status": "done"})
+                    with tracer.span("close", dest_id=task.id):
+                        issue_number = int(task.id.replace("github-", ""))
+                        await asyncio.to_thread(self.github_dest.update_issue, issue_number, closed, ["status"])
+                    success_count += 1
+                    if on_closed:
+                        on_closed(closed)
+                except CircuitOpenError as e:
+                    skipped = len(tasks) - success_count - failed_count
+                    logger.error(f"⚡ Stopped closing, {skipped} tasks not closed: {str(e)}")
+                    failed_count += skipped
+                    break
+                except Exception as e:
+                    logger.error(f"Failed to close task {task.id}: {str(e)}")
+                    failed_count += 1
+        else:
+            # Mock implementation
+            success_count = len(tasks)
+            if on_closed:
+                for task in tasks:
+                    on_closed(task.model_copy(update={"status": "done"}))
+
+        return {
+            "success": True,
+            "closed_count": success_count,
+            "failed_count": failed_count
+        }
+
     def _generate_mock_source_tasks(self) -> List[Task]:
         """Generate mock source tasks for testing"""
         return [
@@ -0,0 +1,172 @@
+"""
+Dead-letter queue for failed pushes
+Keeps each failed operation with its failure reason and attempt count,
+schedules retries with exponential backoff and quarantines operations that
+keep failing, so a permanently bad task stops being retried every sync
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.models.task import Task
+from app.services.logger import logger
+from app.services.push_queue import op_key
+from app.services.sync_journal import JournalOp
+
+
+def entry_key(target: str, task_id: str) -> str:
+    """Key of the dead-letter entry for one side's task"""
+    return f"{target}:{task_id}"
+
+
+class DeadLetterQueue:
+    """
+    Failed push operations, persisted in the task store
+
+    Each entry holds the operation (side, action, task, fields), the last
+    failure reason, the attempt count and when to retry next. After
+    `max_attempts` failures an entry is quarantined: it is kept for
+    inspection but only retried when replayed explicitly.
+    """
+
+    def __init__(self, db, max_attempts: int = 5, base_delay: float = 60, max_delay: float = 3600):
+        self.db = db
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def record_failures(self, failures: List[Tuple[JournalOp, str]]):
+        """
+        Record failed attempts and schedule the next ones
+
+        Args:
+            failures: (operation, error message) per failed push
+        """
+        if not failures:
+            return
+        entries = self.db.get_dead_letters()
+        now = datetime.utcnow()
+        updated = {}
+        for op, reason in failures:
+            key = entry_key(*op_key(op))
+            entry = entries.get(key) or {"key": key, "attempts": 0, "first_failed_at": now.isoformat()}
+            attempts = entry["attempts"] + 1
+            delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+            quarantined = attempts >= self.max_attempts
+            updated[key] = {
+                **entry,
+                "target": op.target,
+                "action": op.action,
+                "task": op.task.model_dump(mode="json"),
+                "fields": op.fields,
+                "reason": reason,
+                "attempts": attempts,
+                "last_failed_at": now.isoformat(),
+                "next_retry_at": None if quarantined else (now + timedelta(seconds=delay)).isoformat(),
+                "quarantined": quarantined
+            }
+            if quarantined:
+                logger.warning(f"☣️  Quarantined {key} after {attempts} failed pushes: {reason}")
+        self.db.save_dead_letters(updated)
+        logger.info(f"📮 Dead-lettered {len(updated)} failed pushes")
+
+    def record_success(self, keys: Iterable[str]):
+        """
+        Drop the entries of operations that were pushed
+
+        Args:
+            keys: Entry keys
+        """
+        entries = self.db.get_dead_letters()
+        pushed = [key for key in keys if key in entries]
+        if pushed:
+            self.db.delete_dead_letters(pushed)
+            logger.info(f"📬 {len(pushed)} dead-lettered pushes succeeded")
+
+    def reconcile(self, ops: List[JournalOp]) -> List[JournalOp]:
+        """
+        Match a sync's planned operations against the queue
+
+        Entries whose task no longer needs pushing are resolved and dropped.
+        Planned operations for entries still backing off or quarantined are
+        held back; the entries take the freshly planned task, so a later
+        retry pushes current data.
+
+        Args:
+            ops: Operations planned from a full comparison of both sides
+
+        Returns:
+            list: Operations to push now
+        """
+        entries = self.db.get_dead_letters()
+        if not entries:
+            return ops
+
+        planned = {entry_key(*op_key(op)): op for op in ops}
+        resolved = [key for key in entries if key not in planned]
+        if resolved:
+            self.db.delete_dead_letters(resolved)
+            logger.info(f"📭 {len(resolved)} dead-lettered pushes no longer needed")
+
+        now = datetime.utcnow()
+        refreshed = {}
+        held: set = set()
+        for key, entry in entries.items():
+            op = planned.get(key)
+            if op is None:
+                continue
+            if not self._due(entry, now):
+                held.add(key)
+            refreshed[key] = {
+                **entry,
+                "action": op.action,
+                "task": op.task.model_dump(mode="json"),
+                "fields": op.fields
+            }
+        if refreshed:
+            self.db.save_dead_letters(refreshed)
+        if held:
+            logger.info(f"📪 Holding back {len(held)} dead-lettered pushes until their retry time")
+        return [op for key, op in planned.items() if key not in held]
+
+    def due_ops(self, keys: Optional[List[str]] = None) -> List[JournalOp]:
+        """
+        Operations to retry in a targeted batch
+
+        Args:
+            keys: Entries to replay regardless of schedule or quarantine
+                  (default: every entry whose retry time has come)
+
+        Returns:
+            list: Stored operations, indexed in order
+        """
+        entries = self.db.get_dead_letters()
+        if keys is None:
+            now = datetime.utcnow()
+            selected = [entry for entry in entries.values() if self._due(entry, now)]
+        else:
+            selected = [entries[key] for key in keys if key in entries]
+        return [
+            JournalOp(index, entry["action"], Task.model_validate(entry["task"]), entry["target"], entry["fields"])
+            for index, entry in enumerate(selected)
+        ]
+
+    def list(self, quarantined: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """
+        Entries, soonest retry first (quarantined entries last)
+
+        Args:
+            quarantined: Only quarantined (True) or only scheduled (False) entries
+
+        Returns:
+            list: Entries
+        """
+        entries = [
+            entry for entry in self.db.get_dead_letters().values()
+            if quarantined is None or entry["quarantined"] == quarantined
+        ]
+        entries.sort(key=lambda entry: (entry["quarantined"], entry["next_retry_at"] or "", entry["key"]))
+        return entries
+
+    def _due(self, entry: Dict[str, Any], now: datetime) -> bool:
+        return not entry["quarantined"] and datetime.fromisoformat(entry["next_retry_at"]) <= now
@@ -0,0 +1,155 @@
+"""
+In-process event bus for dashboard updates
+SyncEngine publishes sync lifecycle and stats events; each Server-Sent
+Events connection subscribes with its own bounded queue
+"""
+
+import asyncio
+import itertools
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Optional, Set
+
+from app.services import fast_json
+from app.services.logger import logger
+
+
+class Event:
+    """One published event"""
+
+    __slots__ = ("id", "type", "data")
+
+    def __init__(self, event_id: int, event_type: str, data: Dict[str, Any]):
+        self.id = event_id
+        self.type = event_type
+        self.data = data
+
+    def to_sse(self) -> str:
+        """Encode as a Server-Sent Events frame"""
+        return f"id: {self.id}\nevent: {self.type}\ndata: {fast_json.dumps(self.data)}\n\n"
+
+
+class Subscription:
+    """A subscriber's queue; the oldest events are dropped if it falls behind"""
+
+    def __init__(self, max_queue: int):
+        self.queue: "asyncio.Queue[Event]" = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def offer(self, event: Event):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+
+class EventBus:
+    """
+    Fan-out of events to every connected dashboard in this worker
+
+    publish() may be called from any thread; delivery always happens on
+    the event loop. Recent events are kept so a reconnecting client can
+    resume from its Last-Event-ID.
+
+    Events from syncs run by another worker are not seen directly; while
+    anyone is subscribed, a single watcher per worker polls the shared
+    sync counters and publishes a "stats" event when they change.
+    """
+
+    def __init__(self, replay_size: int = 100, max_queue: int = 100, watch_interval: float = 5.0):
+        self.max_queue = max_queue
+        self.watch_interval = watch_interval
+        self._ids = itertools.count(1)
+        self._recent: Deque[Event] = deque(maxlen=replay_size)
+        self._subscribers: Set[Subscription] = set()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._watcher: Optional[asyncio.Task] = None
+        self._stats_source: Optional[Callable[[], Dict[str, Any]]] = None
+        self._last_stats: Optional[Dict[str, Any]] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event_type: str, data: Dict[str, Any]):
+        """
+        Publish an event to every subscriber
+
+        Args:
+            event_type: Event name (e.g. "sync_started")
+            data: JSON-serializable payload
+        """
+        with self._lock:
+            event = Event(next(self._ids), event_type, {**data, "at": datetime.utcnow().isoformat()})
+            self._recent.append(event)
+        if not self._subscribers or self._loop is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._deliver(event)
+        else:
+            self._loop.call_soon_threadsafe(self._deliver, event)
+
+    def _deliver(self, event: Event):
+        for subscription in list(self._subscribers):
+            subscription.offer(event)
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> Subscription:
+        """
+        Register a subscriber (call on the event loop)
+
+        Args:
+            last_event_id: Replay buffered events after this ID
+
+        Returns:
+            Subscription: Queue of events for this subscriber
+        """
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(self.max_queue)
+        if last_event_id is not None:
+            with self._lock:
+                missed = [event for event in self._recent if event.id > last_event_id]
+            for event in missed:
+                subscription.offer(event)
+        self._subscribers.add(subscription)
+        if self._stats_source and (self._watcher is None or self._watcher.done()):
+            self._watcher = self._loop.create_task(self._watch_stats())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a subscriber"""
+        self._subscribers.discard(subscription)
+        if subscription.dropped:
+            logger.warning(f"⚠️  Event subscriber fell behind; {subscription.dropped} events dropped")
+
+    def watch_stats(self, source: Callable[[], Dict[str, Any]]):
+        """
+        Set the function polled for shared stats while anyone is subscribed
+
+        Args:
+            source: Returns the current stats (called in a thread)
+        """
+        self._stats_source = source
+
+    def publish_stats(self, stats: Dict[str, Any]):
+        """Publish a "stats" event if the stats differ from the last ones sent"""
+        if stats != self._last_stats:
+            self._last_stats = dict(stats)
+            self.publish("stats", stats)
+
+    async def _watch_stats(self):
+        """Publish stats changes made by any worker while there are subscribers"""
+        while self._subscribers:
+            try:
+                self.publish_stats(await asyncio.to_thread(self._stats_source))
+            except Exception as e:
+                logger.error(f"❌ Stats watcher failed: {str(e)}")
+            await asyncio.sleep(self.watch_interval)
+
+
+event_bus = EventBus()
@@ -0,0 +1,71 @@
+"""
+HTTP caching helpers
+Version-based ETags and Cache-Control for read-mostly endpoints, answering
+If-None-Match with 304 before the response body is built
+"""
+
+import hashlib
+import json
+from typing import Any, Callable, Dict
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+# Sync state changes on every run; clients must revalidate but may keep a copy
+REVALIDATE = "no-cache"
+# Catalogues baked into the code only change with a deploy
+STATIC = "public, max-age=3600"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a weak ETag from version parts
+
+    Args:
+        *parts: Values that identify the representation (resource, version, query)
+
+    Returns:
+        str: Quoted weak ETag
+    """
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+
+def content_etag(body: Any) -> str:
+    """ETag for a constant body, computed once from its content"""
+    digest = hashlib.blake2b(json.dumps(body, sort_keys=True).encode("utf-8"), digest_size=8).hexdigest()
+    return make_etag("c", digest)
+
+
+def _matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison: ignore W/ prefixes on either side
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def cached_json(
+    request: Request,
+    etag: str,
+    build: Callable[[], Dict[str, Any]],
+    cache_control: str = REVALIDATE
+) -> Response:
+    """
+    Respond 304 if the client's copy is current, otherwise build the body
+
+    Args:
+        request: Incoming request
+        etag: Current ETag of the representation
+        build: Produces the JSON body; only called on a miss
+        cache_control: Cache-Control header value
+
+    Returns:
+        Response: 304 without a body, or 200 JSON
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if _matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(build(), headers=headers)
@@ -0,0 +1,96 @@
+"""
+Leader election for multi-worker deployments
+Uses lease rows in the shared SQLite database so only one worker runs scheduled
+syncs, and only one run pushes at a time
+"""
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Optional
+
+from app.config import settings
+from app.services.logger import logger
+
+
+class LeaderElection:
+    """
+    SQLite row lease
+
+    Every worker competes for the same named lease. The holder renews it
+    before each scheduled sync; if it dies, the lease expires and another
+    worker takes over on its next tick.
+    """
+
+    def __init__(self, db_path: str, name: str = "scheduler", lease_seconds: int = 600):
+        self.db_path = db_path
+        self.name = name
+        self.lease_seconds = lease_seconds
+        self.holder_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the lease connection on first use"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS leases ("
+                "name TEXT PRIMARY KEY, holder TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+        return self._conn
+
+    def try_acquire(self) -> bool:
+        """
+        Acquire or renew the lease
+
+        Returns:
+            bool: True if this worker holds the lease afterwards
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT INTO leases (name, holder, expires_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at "
+                    "WHERE leases.holder = excluded.holder OR leases.expires_at < ?",
+                    (self.name, self.holder_id, now + self.lease_seconds, now)
+                )
+                holder = conn.execute("SELECT holder FROM leases WHERE name = ?", (self.name,)).fetchone()[0]
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        was_leader = self.is_leader
+        self.is_leader = holder == self.holder_id
+        if self.is_leader and not was_leader:
+            logger.info(f"👑 Worker {self.holder_id} acquired '{self.name}' lease")
+        elif was_leader and not self.is_leader:
+            logger.warning(f"⚠️  Worker {self.holder_id} lost '{self.name}' lease to {holder}")
+        return self.is_leader
+
+    def release(self):
+        """Give up the lease so another worker can take over immediately"""
+        if not self.is_leader:
+            return
+        with self._lock:
+            self._connect().execute(
+                "DELETE FROM leases WHERE name = ? AND holder = ?", (self.name, self.holder_id)
+            )
+        self.is_leader = False
+        logger.info(f"👋 Worker {self.holder_id} released '{self.name}' lease")
+
+
+# Lease used by the background scheduler (BOT MODE)
+scheduler_lease = LeaderElection(settings.DATABASE_PATH, lease_seconds=settings.LEADER_LEASE_SECONDS)
+
+# Lease held while a sync, resume or dead-letter retry pushes (any worker, manual or scheduled)
+sync_lease = LeaderElection(settings.DATABASE_PATH, name="sync", lease_seconds=settings.SYNC_LOCK_SECONDS)
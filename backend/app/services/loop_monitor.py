@@ -0,0 +1,177 @@
+"""
+Event-loop lag monitor
+Measures how late the event loop runs a periodic probe and, when the loop is
+blocked past a threshold, captures the stack of whatever is blocking it
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from app.config import settings
+from app.services.logger import logger
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list
+
+    Args:
+        sorted_values: Values in ascending order
+        fraction: Percentile as a fraction (0.99 for p99)
+
+    Returns:
+        float: Percentile value (0.0 for an empty list)
+    """
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def _call_site(stack: List[traceback.FrameSummary]) -> str:
+    """Innermost frame in application code, or the innermost frame overall"""
+    for frame in reversed(stack):
+        if frame.filename.startswith(APP_DIR) and frame.filename != __file__:
+            return f"{os.path.relpath(frame.filename, os.path.dirname(APP_DIR))}:{frame.lineno} in {frame.name}"
+    frame = stack[-1]
+    return f"{frame.filename}:{frame.lineno} in {frame.name}"
+
+
+class LoopLagMonitor:
+    """
+    Continuous event-loop lag sampling plus a blocking-call detector
+
+    A probe coroutine sleeps for `interval` seconds and records how much
+    later than requested it woke up. A watchdog thread checks the probe's
+    heartbeat; if the loop has not run the probe for longer than
+    `threshold`, the loop thread's current stack is captured while it is
+    still blocked and attributed to the innermost frame in app code.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.05,
+        threshold: float = 0.1,
+        window: int = 2048,
+        max_offenders: int = 20
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.max_offenders = max_offenders
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._offenders: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._probe_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self.stalls = 0
+
+    def start(self):
+        """Start the probe on the running loop and the watchdog thread"""
+        if self._probe_task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._probe_task = asyncio.get_running_loop().create_task(self._probe())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"🩺 Event-loop monitor started (threshold {self.threshold * 1000:.0f}ms)")
+
+    def stop(self):
+        """Stop the probe and the watchdog"""
+        self._stopped.set()
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            self._probe_task = None
+
+    async def _probe(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            with self._lock:
+                self._samples.append(max(0.0, now - expected))
+
+    def _watch(self):
+        """Watchdog thread: snapshot the loop thread's stack during a stall"""
+        captured_for = None
+        while not self._stopped.wait(self.threshold / 2):
+            heartbeat = self._heartbeat
+            blocked_for = time.monotonic() - heartbeat - self.interval
+            if blocked_for < self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            if not stack:
+                continue
+            site = _call_site(stack)
+            if captured_for == heartbeat:
+                # Same stall, seen again: keep its duration current
+                self._record(site, stack, blocked_for, new_stall=False)
+                continue
+            captured_for = heartbeat
+            self.stalls += 1
+            self._record(site, stack, blocked_for, new_stall=True)
+            logger.warning(f"🐢 Event loop blocked >{self.threshold * 1000:.0f}ms at {site}")
+
+    def _record(self, site: str, stack: List[traceback.FrameSummary], blocked_for: float, new_stall: bool):
+        with self._lock:
+            entry = self._offenders.get(site)
+            if entry is None:
+                if len(self._offenders) >= self.max_offenders:
+                    # Evict the least frequent site to bound memory
+                    del self._offenders[min(self._offenders, key=lambda key: self._offenders[key]["count"])]
+                entry = self._offenders[site] = {"count": 0, "max_blocked_ms": 0.0}
+            if new_stall:
+                entry["count"] += 1
+            entry["max_blocked_ms"] = max(entry["max_blocked_ms"], round(blocked_for * 1000, 1))
+            entry["last_seen"] = time.time()
+            entry["stack"] = [f"{frame.filename}:{frame.lineno} in {frame.name}" for frame in stack[-12:]]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Lag percentiles and the worst offending call sites
+
+        Returns:
+            dict: Lag summary in milliseconds, stall count and offenders
+                  (most frequent first)
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+            offenders = [
+                {"call_site": site, **entry}
+                for site, entry in sorted(self._offenders.items(), key=lambda item: -item[1]["count"])
+            ]
+        return {
+            "running": self._probe_task is not None,
+            "samples": len(samples),
+            "threshold_ms": self.threshold * 1000,
+            "lag_ms": {
+                "p50": round(percentile(samples, 0.50) * 1000, 2),
+                "p90": round(percentile(samples, 0.90) * 1000, 2),
+                "p99": round(percentile(samples, 0.99) * 1000, 2),
+                "max": round(samples[-1] * 1000, 2) if samples else 0.0,
+            },
+            "stalls": self.stalls,
+            "offenders": offenders
+        }
+
+
+loop_monitor = LoopLagMonitor(
+    interval=settings.LOOP_MONITOR_INTERVAL_MS / 1000,
+    threshold=settings.LOOP_LAG_THRESHOLD_MS / 1000
+)
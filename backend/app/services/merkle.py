@@ -0,0 +1,252 @@
+"""
+Merkle trees over task snapshots
+Summarize a snapshot as hashes over id-hash ranges so two snapshots can be
+reconciled by descending only into ranges whose hashes differ
+"""
+
+import hashlib
+from typing import Dict, Iterable, List, Set, Tuple
+
+from app.models.task import Task
+
+DIGEST_SIZE = 8
+
+# Task fields the content digest covers (the ones a sync compares)
+SYNCED_FIELDS = ("title", "description", "status", "priority")
+
+
+def key_hash(task_id: str) -> int:
+    """
+    Hash a task ID onto the 64-bit key space
+
+    Args:
+        task_id: Task ID
+
+    Returns:
+        int: Unsigned 64-bit hash
+    """
+    return int.from_bytes(hashlib.blake2b(task_id.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def task_digest(task: Task) -> bytes:
+    """
+    Hash the synced content of a task
+
+    Only fields the engine pushes are included, so two tasks with the same
+    digest need no update.
+
+    Args:
+        task: Task to hash
+
+    Returns:
+        bytes: Content digest
+    """
+    h = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    for field in SYNCED_FIELDS:
+        h.update(_synced_value(task, field).encode("utf-8"))
+        h.update(b"\x1f")
+    return h.digest()
+
+
+def _synced_value(task: Task, field: str) -> str:
+    value = getattr(task, field)
+    return str(value or "") if field == "description" else str(value)
+
+
+def changed_fields(task: Task, other: Task) -> List[str]:
+    """
+    Synced fields whose values differ between two versions of a task
+
+    Compared the same way task_digest hashes them, so the list is empty
+    exactly when the digests match.
+
+    Args:
+        task: One version (e.g. the source task)
+        other: The other version (e.g. the destination task)
+
+    Returns:
+        list: Field names, in SYNCED_FIELDS order
+    """
+    return [field for field in SYNCED_FIELDS if _synced_value(task, field) != _synced_value(other, field)]
+
+
+class MerkleTree:
+    """
+    Fixed-shape Merkle tree over the task-id hash space
+
+    The 64-bit key space is split into fanout ** depth equal ranges (the
+    leaves). Each leaf hashes its sorted (id, digest) pairs and each inner
+    node hashes its children. Updates only mark a leaf dirty; hashes are
+    recomputed lazily along dirty paths.
+    """
+
+    def __init__(self, fanout: int = 16, depth: int = 3):
+        self.fanout = fanout
+        self.depth = depth
+        self.leaf_count = fanout ** depth
+        self._shift = 64 - (fanout.bit_length() - 1) * depth
+        self._leaves: List[Dict[str, bytes]] = [dict() for _ in range(self.leaf_count)]
+        # levels[0] is the root, levels[depth] are the leaves
+        self._levels: List[List[bytes]] = [[b""] * (fanout ** level) for level in range(depth + 1)]
+        self._dirty: Set[int] = set(range(self.leaf_count))
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[Task], fanout: int = 16, depth: int = 3) -> "MerkleTree":
+        """
+        Build a tree from a task snapshot
+
+        Args:
+            tasks: Tasks to summarize
+            fanout: Children per node (power of two)
+            depth: Number of levels below the root
+
+        Returns:
+            MerkleTree: Tree over the snapshot
+        """
+        return cls.from_mapping({task.id: task for task in tasks}, fanout, depth)
+
+    @classmethod
+    def from_mapping(cls, tasks_by_id: Dict[str, Task], fanout: int = 16, depth: int = 3) -> "MerkleTree":
+        """
+        Build a tree from tasks keyed by an ID other than their own
+
+        Used for destination snapshots, whose tasks are keyed by the source
+        ID they were pushed from.
+
+        Args:
+            tasks_by_id: Key -> task
+            fanout: Children per node (power of two)
+            depth: Number of levels below the root
+
+        Returns:
+            MerkleTree: Tree over the snapshot
+        """
+        tree = cls(fanout, depth)
+        for task_id, task in tasks_by_id.items():
+            tree.set(task_id, task_digest(task))
+        return tree
+
+    @classmethod
+    def from_digests(cls, digests: Dict[str, bytes], fanout: int = 16, depth: int = 3) -> "MerkleTree":
+        """
+        Build a tree from precomputed task digests
+
+        Args:
+            digests: Task ID -> task_digest
+            fanout: Children per node (power of two)
+            depth: Number of levels below the root
+
+        Returns:
+            MerkleTree: Tree over the snapshot
+        """
+        tree = cls(fanout, depth)
+        for task_id, digest in digests.items():
+            tree.set(task_id, digest)
+        return tree
+
+    def _leaf_index(self, task_id: str) -> int:
+        return key_hash(task_id) >> self._shift
+
+    def set(self, task_id: str, digest: bytes):
+        """Insert or replace one entry"""
+        index = self._leaf_index(task_id)
+        leaf = self._leaves[index]
+        if leaf.get(task_id) != digest:
+            leaf[task_id] = digest
+            self._dirty.add(index)
+
+    def discard(self, task_id: str):
+        """Remove one entry if present"""
+        index = self._leaf_index(task_id)
+        if self._leaves[index].pop(task_id, None) is not None:
+            self._dirty.add(index)
+
+    def __len__(self) -> int:
+        return sum(len(leaf) for leaf in self._leaves)
+
+    def _rehash(self):
+        """Recompute hashes along every dirty path"""
+        if not self._dirty:
+            return
+        leaves = self._levels[self.depth]
+        for index in self._dirty:
+            h = hashlib.blake2b(digest_size=DIGEST_SIZE)
+            for task_id, digest in sorted(self._leaves[index].items()):
+                h.update(task_id.encode("utf-8"))
+                h.update(digest)
+            leaves[index] = h.digest()
+
+        dirty = self._dirty
+        for level in range(self.depth - 1, -1, -1):
+            dirty = {index // self.fanout for index in dirty}
+            children = self._levels[level + 1]
+            for index in dirty:
+                start = index * self.fanout
+                h = hashlib.blake2b(digest_size=DIGEST_SIZE)
+                for child in children[start:start + self.fanout]:
+                    h.update(child)
+                self._levels[level][index] = h.digest()
+        self._dirty = set()
+
+    @property
+    def root(self) -> bytes:
+        """Root hash of the whole snapshot"""
+        self._rehash()
+        return self._levels[0][0]
+
+    def diff_ranges(self, other: "MerkleTree") -> Tuple[List[int], int]:
+        """
+        Find leaf ranges whose hashes differ from another tree
+
+        Args:
+            other: Tree with the same shape
+
+        Returns:
+            tuple: (differing leaf indices, number of nodes compared)
+        """
+        if (self.fanout, self.depth) != (other.fanout, other.depth):
+            raise ValueError("Merkle trees must have the same shape")
+        self._rehash()
+        other._rehash()
+
+        compared = 1
+        frontier = [0] if self._levels[0][0] != other._levels[0][0] else []
+        for level in range(1, self.depth + 1):
+            mine, theirs = self._levels[level], other._levels[level]
+            next_frontier = []
+            for parent in frontier:
+                for index in range(parent * self.fanout, (parent + 1) * self.fanout):
+                    compared += 1
+                    if mine[index] != theirs[index]:
+                        next_frontier.append(index)
+            frontier = next_frontier
+        return frontier, compared
+
+    def diff(self, other: "MerkleTree") -> Dict[str, object]:
+        """
+        Reconcile against another tree
+
+        Args:
+            other: Tree with the same shape
+
+        Returns:
+            dict: IDs only in this tree, only in the other, and present in
+                  both with different digests, plus traversal counters
+        """
+        ranges, compared = self.diff_ranges(other)
+        only_self, only_other, differing = [], [], []
+        for index in ranges:
+            mine, theirs = self._leaves[index], other._leaves[index]
+            for task_id, digest in mine.items():
+                if task_id not in theirs:
+                    only_self.append(task_id)
+                elif theirs[task_id] != digest:
+                    differing.append(task_id)
+            only_other.extend(task_id for task_id in theirs if task_id not in mine)
+        return {
+            "only_self": only_self,
+            "only_other": only_other,
+            "differing": differing,
+            "ranges_differing": len(ranges),
+            "nodes_compared": compared
+        }
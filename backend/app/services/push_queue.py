@@ -0,0 +1,79 @@
+"""
+Push ordering for sync runs
+Orders planned operations so the most important writes land first when the
+rate budget or the push deadline cuts a run short
+"""
+
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Collection, Dict, List, Optional, Tuple
+
+from app.services.sync_journal import JournalOp
+
+# Lower rank is pushed first
+PRIORITY_RANK = {
+    "urgent": 0,
+    "high": 1,
+    "medium": 2,
+    "low": 3
+}
+
+# (side, task ID) of a planned operation
+OpKey = Tuple[str, str]
+
+
+def op_key(op: JournalOp) -> OpKey:
+    """Key identifying an operation across sync runs"""
+    return op.target, op.task.id
+
+
+def _timestamp(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def order_ops(
+    ops: List[JournalOp],
+    transitions: Collection[OpKey] = (),
+    first_planned: Optional[Dict[OpKey, float]] = None
+) -> List[JournalOp]:
+    """
+    Order operations for pushing
+
+    Operations are ranked by task priority (urgent first), then status
+    transitions before other edits, then age: work carried over from an
+    earlier run (by when it was first planned) before new work, and older
+    updates before newer ones. Within a priority, rules take turns, so one
+    rule with many changes cannot hold back another rule's tasks.
+
+    Args:
+        ops: Planned operations
+        transitions: Operations that change a task's status
+        first_planned: Epoch seconds an operation was first planned, for
+                       operations carried over from earlier runs
+
+    Returns:
+        list: The same operations, in push order
+    """
+    first_planned = first_planned or {}
+    newest = float("inf")
+
+    def age_key(op: JournalOp):
+        key = op_key(op)
+        return key not in transitions, first_planned.get(key, newest), _timestamp(op.task.updated_at)
+
+    # One queue per (priority, rule), each in age order
+    queues: Dict[Tuple[int, str], List[JournalOp]] = defaultdict(list)
+    for op in ops:
+        rank = PRIORITY_RANK.get(op.task.priority, PRIORITY_RANK["medium"])
+        queues[(rank, op.task.metadata.get("sync_rule") or "")].append(op)
+
+    ranked = []
+    for (rank, _), queue in queues.items():
+        queue.sort(key=age_key)
+        # Position in its rule's queue is the round it is pushed in
+        ranked.extend(((rank, turn, age_key(op)), op) for turn, op in enumerate(queue))
+
+    ranked.sort(key=lambda entry: entry[0])
+    return [op for _, op in ranked]
@@ -0,0 +1,65 @@
+"""
+Rate budget for writes to the destination
+Token bucket shared by every push of a sync, however the work was planned
+"""
+
+import asyncio
+import threading
+import time
+
+
+class RateBudget:
+    """
+    Token bucket: `rate_per_minute` requests per minute with bursts of `burst`
+
+    A rate of 0 disables pacing.
+    """
+
+    def __init__(self, rate_per_minute: float = 0, burst: int = 1):
+        self.rate = rate_per_minute / 60
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited_seconds = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def peek(self) -> float:
+        """
+        Seconds the next request would wait, without taking a token
+
+        Returns:
+            float: Expected wait in seconds
+        """
+        if not self.enabled:
+            return 0.0
+        with self._lock:
+            tokens = min(self.burst, self._tokens + (time.monotonic() - self._updated) * self.rate)
+            return max(0.0, (1 - tokens) / self.rate)
+
+    def reserve(self) -> float:
+        """
+        Take one token, going into debt if none is left
+
+        Returns:
+            float: Seconds the caller must wait before sending its request
+        """
+        if not self.enabled:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.waited_seconds += wait
+            return wait
+
+    async def acquire(self):
+        """Wait (without blocking the event loop) until a request may be sent"""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
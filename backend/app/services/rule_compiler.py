@@ -0,0 +1,382 @@
+"""
+Sync rule compiler
+Turns a SyncRule's filters and field mappings into one precompiled
+transform per rule, applied to whole batches of tasks between fetch and diff
+"""
+
+import json
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.models.task import Task, TaskPriority, TaskStatus
+from app.services.config_store import load_config
+from app.services.logger import logger
+
+# Integration field names -> Task attributes
+FIELD_ALIASES = {
+    "id": "id",
+    "title": "title",
+    "summary": "title",
+    "name": "title",
+    "description": "description",
+    "body": "description",
+    "desc": "description",
+    "notes": "description",
+    "status": "status",
+    "state": "status",
+    "priority": "priority",
+    "assignee": "assignee",
+    "assignees": "assignee",
+    "labels": "tags",
+    "tags": "tags",
+}
+
+TASK_FIELDS = {"id", "title", "description", "status", "priority", "assignee", "tags"}
+ENUM_VALUES = {
+    "status": {status.value for status in TaskStatus},
+    "priority": {priority.value for priority in TaskPriority},
+}
+
+FILTER_KEYS = {"status", "priority", "state", "labels", "assignee", "milestone", "updated_since"}
+
+
+class RuleCompileError(ValueError):
+    """Raised when a sync rule cannot be compiled"""
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set)):
+        return list(value)
+    if isinstance(value, str) and "," in value:
+        return [part.strip() for part in value.split(",") if part.strip()]
+    return [value]
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _task_labels(task: Task) -> set:
+    return {label.lower() for label in task.tags} | {
+        label.lower() for label in task.metadata.get("labels", ())
+    }
+
+
+def _task_assignees(task: Task) -> set:
+    # Like GitHub's assignee filter: any assignee matches, not only the first
+    assignees = {login.lower() for login in task.metadata.get("assignees", ())}
+    if task.assignee:
+        assignees.add(task.assignee.lower())
+    return assignees
+
+
+def compile_filters(filters: Dict[str, Any]) -> Optional[Callable[[Task], bool]]:
+    """
+    Compile a rule's filters into a single predicate
+
+    Supported keys: status, priority, state ("open"/"closed"/"all"),
+    labels (all must be present), assignee (any of the task's assignees),
+    milestone, updated_since (ISO).
+
+    Args:
+        filters: SyncRule.filters
+
+    Returns:
+        Predicate, or None if the filters accept everything
+    """
+    unknown = set(filters) - FILTER_KEYS
+    if unknown:
+        raise RuleCompileError(f"Unknown filter(s): {', '.join(sorted(unknown))}")
+
+    # One small closure per check; cheap scalar checks come first so they
+    # short-circuit the set checks.
+    checks: List[Callable[[Task], bool]] = []
+
+    state = str(filters.get("state") or "all").lower()
+    if state == "open":
+        checks.append(lambda task: task.status != "done")
+    elif state == "closed":
+        checks.append(lambda task: task.status == "done")
+    elif state != "all":
+        raise RuleCompileError(f"Invalid state filter: {state}")
+
+    if filters.get("status"):
+        statuses = frozenset(str(value).lower() for value in _as_list(filters["status"]))
+        checks.append(lambda task: task.status in statuses)
+
+    if filters.get("priority"):
+        priorities = frozenset(str(value).lower() for value in _as_list(filters["priority"]))
+        checks.append(lambda task: task.priority in priorities)
+
+    if filters.get("assignee"):
+        assignee = str(filters["assignee"]).lower()
+        checks.append(lambda task: assignee in _task_assignees(task))
+
+    if filters.get("milestone"):
+        milestone = str(filters["milestone"])
+        checks.append(lambda task: task.metadata.get("milestone") == milestone)
+
+    if filters.get("updated_since"):
+        try:
+            since = _as_utc(datetime.fromisoformat(str(filters["updated_since"]).replace("Z", "+00:00")))
+        except ValueError as e:
+            raise RuleCompileError(f"Invalid updated_since: {e}")
+        checks.append(lambda task: _as_utc(task.updated_at) >= since)
+
+    if filters.get("labels"):
+        required = frozenset(str(label).lower() for label in _as_list(filters["labels"]))
+        checks.append(lambda task: required <= _task_labels(task))
+
+    if not checks:
+        return None
+    if len(checks) == 1:
+        return checks[0]
+    checks_tuple = tuple(checks)
+    return lambda task: all(check(task) for check in checks_tuple)
+
+
+_INVALID = object()
+
+
+def _is_scalar(value: Any) -> bool:
+    return isinstance(value, (str, int, float)) and not isinstance(value, bool)
+
+
+def _field_value(dest: str, value: Any) -> Any:
+    """A mapped value as Task field `dest` accepts it, or _INVALID"""
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if dest in ENUM_VALUES:
+        return value if isinstance(value, str) and value in ENUM_VALUES[dest] else _INVALID
+    if value is None:
+        return _INVALID if dest == "title" else None
+    if not _is_scalar(value):
+        return _INVALID
+    value = str(value)
+    if dest == "title" and not value.strip():
+        return _INVALID
+    return value
+
+
+def compile_mappings(mappings: Dict[str, str]) -> Optional[Callable[[Task], Task]]:
+    """
+    Compile field mappings into a single task -> task function
+
+    Each mapping copies one field's value into another. Integration field
+    names are resolved through FIELD_ALIASES; unknown names read from and
+    write to task.metadata. Mappings that resolve to the same Task field
+    are identities and are dropped at compile time.
+
+    The returned function updates the task in place: batches come straight
+    from a fetch and are owned by the current sync, so copying every task
+    would only add cost. Values written to Task fields are checked the way
+    the model would: text fields take strings (numbers are converted),
+    a title cannot be empty, status/priority must be in their enums and
+    tags only take scalar items. A value that does not fit is skipped.
+
+    Args:
+        mappings: SyncRule.field_mappings (source field -> destination field)
+
+    Returns:
+        Transform, or None if every mapping is an identity
+    """
+    steps: List[Tuple[bool, str, str]] = []
+    for source_field, dest_field in mappings.items():
+        source = FIELD_ALIASES.get(source_field, source_field)
+        dest = FIELD_ALIASES.get(dest_field, dest_field)
+        if source == dest:
+            continue
+        if dest == "id":
+            raise RuleCompileError("Field mappings cannot overwrite the task id")
+        steps.append((source in TASK_FIELDS, source, dest))
+
+    if not steps:
+        return None
+    steps_tuple = tuple(steps)
+
+    def transform(task: Task) -> Task:
+        fields = task.__dict__
+        for from_task, source, dest in steps_tuple:
+            value = fields[source] if from_task else fields["metadata"].get(source)
+            if dest == "tags":
+                tags = list(fields["tags"])
+                for item in (value if isinstance(value, list) else (value,)):
+                    if _is_scalar(item) and str(item) not in tags:
+                        tags.append(str(item))
+                fields["tags"] = tags
+            elif dest in TASK_FIELDS:
+                value = _field_value(dest, value)
+                if value is not _INVALID:
+                    fields[dest] = value
+            else:
+                fields["metadata"] = {**fields["metadata"], dest: value}
+        return task
+
+    return transform
+
+
+class CompiledRule:
+    """
+    A sync rule compiled into one batch transform
+
+    Attributes:
+        rule_id: ID of the rule
+        fingerprint: Hash input of filters + mappings (cache key)
+        filters: The rule's filters (kept for query pushdown)
+        transform: Callable applied to a list of tasks
+    """
+
+    def __init__(self, rule: Dict[str, Any]):
+        self.rule_id = rule.get("id") or rule.get("name", "rule")
+        self.fingerprint = rule_fingerprint(rule)
+        self.filters = dict(rule.get("filters") or {})
+        self.field_mappings = dict(rule.get("field_mappings") or {})
+        self.predicate = compile_filters(self.filters)
+        self.mapper = compile_mappings(self.field_mappings)
+        self.transform = self._build(self.predicate, self.mapper)
+        self._residuals: Dict[str, "CompiledRule"] = {}
+
+    def residual(self, filters: Dict[str, Any]) -> "CompiledRule":
+        """
+        The same rule with only the filters the source could not apply
+
+        Used after query pushdown: the fetched batch already satisfies the
+        pushed filters, so only the remainder is evaluated locally.
+
+        Args:
+            filters: Residual filters (a subset of self.filters)
+
+        Returns:
+            CompiledRule: Rule with the residual predicate and the same mappings
+        """
+        key = json.dumps(filters, sort_keys=True, default=str)
+        compiled = self._residuals.get(key)
+        if compiled is None:
+            compiled = CompiledRule({"id": self.rule_id, "filters": filters, "field_mappings": self.field_mappings})
+            self._residuals[key] = compiled
+        return compiled
+
+    @staticmethod
+    def _build(predicate, mapper) -> Callable[[List[Task]], List[Task]]:
+        """Specialize the batch loop for whichever stages are present"""
+        if predicate and mapper:
+            return lambda tasks: [mapper(task) for task in tasks if predicate(task)]
+        if predicate:
+            return lambda tasks: [task for task in tasks if predicate(task)]
+        if mapper:
+            return lambda tasks: [mapper(task) for task in tasks]
+        return list
+
+    def partition(self, tasks: List[Task]) -> Tuple[List[Task], List[Task]]:
+        """
+        Split a batch into tasks this rule accepts (mapped) and the rest
+
+        Args:
+            tasks: Tasks to route
+
+        Returns:
+            tuple: (accepted and mapped tasks, rejected tasks)
+        """
+        if self.predicate is None:
+            accepted, rejected = tasks, []
+        else:
+            predicate = self.predicate
+            accepted, rejected = [], []
+            for task in tasks:
+                (accepted if predicate(task) else rejected).append(task)
+        if self.mapper is not None:
+            accepted = [self.mapper(task) for task in accepted]
+        return accepted, rejected
+
+
+def rule_fingerprint(rule: Dict[str, Any]) -> str:
+    """Stable key that changes whenever a rule's compiled behaviour would"""
+    return json.dumps(
+        [rule.get("filters") or {}, rule.get("field_mappings") or {}],
+        sort_keys=True,
+        default=str
+    )
+
+
+class RuleSet:
+    """
+    Enabled sync rules, compiled once and cached until they change
+
+    With no enabled rules every task passes through unchanged. With one or
+    more rules, a task is kept if any rule accepts it; the first matching
+    rule's mappings apply and its id is recorded in metadata["sync_rule"].
+    """
+
+    def __init__(self):
+        self._cache: Dict[str, CompiledRule] = {}
+
+    def compile(self, rule: Dict[str, Any]) -> CompiledRule:
+        """
+        Compile a rule, reusing the cached version if it has not changed
+
+        Args:
+            rule: Sync rule dict (as stored in the config file)
+
+        Returns:
+            CompiledRule: Compiled rule
+        """
+        rule_id = rule.get("id") or rule.get("name", "rule")
+        cached = self._cache.get(rule_id)
+        if cached is not None and cached.fingerprint == rule_fingerprint(rule):
+            return cached
+        compiled = CompiledRule(rule)
+        self._cache[rule_id] = compiled
+        logger.info(f"🧩 Compiled sync rule {rule_id}")
+        return compiled
+
+    def active_rules(self) -> List[CompiledRule]:
+        """
+        Compile every enabled rule in the config store
+
+        Rules that fail to compile are skipped with an error.
+
+        Returns:
+            list: Compiled enabled rules
+        """
+        compiled = []
+        for rule in load_config().get("sync_rules", []):
+            if not rule.get("enabled", True):
+                continue
+            try:
+                compiled.append(self.compile(rule))
+            except RuleCompileError as e:
+                logger.error(f"❌ Skipping sync rule {rule.get('id')}: {str(e)}")
+        return compiled
+
+    def apply(self, tasks: List[Task], rules: Optional[List[CompiledRule]] = None) -> List[Task]:
+        """
+        Run every enabled rule over a batch of tasks
+
+        Each rule only sees the tasks no earlier rule accepted, so every
+        task is mapped at most once.
+
+        Args:
+            tasks: Tasks fetched from the source
+            rules: Already compiled rules (default: active_rules())
+
+        Returns:
+            list: Tasks selected (and mapped) by the rules
+        """
+        if rules is None:
+            rules = self.active_rules()
+        if not rules:
+            return tasks
+
+        selected: List[Task] = []
+        remaining = tasks
+        for rule in rules:
+            if not remaining:
+                break
+            accepted, remaining = rule.partition(remaining)
+            for task in accepted:
+                task.metadata["sync_rule"] = rule.rule_id
+            selected.extend(accepted)
+        logger.info(f"🧩 {len(rules)} sync rule(s) selected {len(selected)} of {len(tasks)} tasks")
+        return selected
@@ -0,0 +1,234 @@
+"""
+Sharded sync planning for very large workspaces
+Hash-partitions the task-ID space across a process pool: each shard converts,
+diffs and encodes its slice of both snapshots, and the coordinator merges the
+results into one push plan
+"""
+
+import asyncio
+import time
+import zlib
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.integrations.github_integration import convert_issue_to_task
+from app.models.task import Task
+from app.services import fast_json
+from app.services.logger import logger
+from app.services.merkle import changed_fields, task_digest
+from app.services.tracing import tracer
+
+
+def shard_of(key: str, shards: int) -> int:
+    """
+    Shard that owns a task ID (stable across processes and restarts)
+
+    Args:
+        key: Source task ID
+        shards: Number of shards
+
+    Returns:
+        int: Shard index
+    """
+    return zlib.crc32(key.encode("utf-8")) % shards
+
+
+def route_issue_pages(
+    pages: Iterable[bytes],
+    shards: int,
+    reverse_mappings: Optional[Dict[str, str]] = None
+) -> Tuple[List[bytes], int]:
+    """
+    Split raw issues-API pages into one JSON document per shard
+
+    Only the JSON is parsed here (no Task conversion). Each issue is routed
+    by the source task ID it corresponds to: its own ID for source issues,
+    or the source ID it was pushed from for destination issues. Pull
+    requests are dropped.
+
+    Args:
+        pages: Raw page bodies
+        shards: Number of shards
+        reverse_mappings: Destination task ID -> source task ID (destination side)
+
+    Returns:
+        tuple: ([key, issue] pairs encoded per shard, number of issues)
+    """
+    buckets: List[List[Any]] = [[] for _ in range(shards)]
+    count = 0
+    for raw in pages:
+        for issue in fast_json.loads(raw):
+            if "pull_request" in issue:
+                continue
+            task_id = f"github-{issue['number']}"
+            key = reverse_mappings.get(task_id, task_id) if reverse_mappings is not None else task_id
+            buckets[shard_of(key, shards)].append([key, issue])
+            count += 1
+    return [fast_json.dumps(bucket).encode("utf-8") for bucket in buckets], count
+
+
+def plan_shard(source_json: bytes, destination_json: bytes) -> Dict[str, Any]:
+    """
+    Convert and diff one shard (runs in a worker process)
+
+    Same classification as SyncEngine._identify_changes: tasks whose synced
+    content digest differs are updates. Every source task is also returned
+    JSON-encoded with its digest, so the coordinator can store the snapshot
+    without re-serializing it.
+
+    Args:
+        source_json: Source [key, issue] pairs for this shard
+        destination_json: Destination [key, issue] pairs for this shard
+
+    Returns:
+        dict: Changed tasks (with their changed fields), destination-only
+              candidates, counts and encoded tasks
+    """
+    start = time.perf_counter()
+    source = [convert_issue_to_task(issue) for _, issue in fast_json.loads(source_json)]
+    destination = {key: convert_issue_to_task(issue) for key, issue in fast_json.loads(destination_json)}
+    destination_count = len(destination)
+
+    to_add: List[Task] = []
+    to_update: List[Task] = []
+    fields: Dict[str, List[str]] = {}
+    transitions: List[str] = []
+    encoded = []
+    unchanged = 0
+    newest: Optional[datetime] = None
+    for task in source:
+        digest = task_digest(task)
+        encoded.append((task.id, digest, task.model_dump_json().encode("utf-8")))
+        other = destination.pop(task.id, None)
+        if other is None:
+            to_add.append(task)
+        elif task_digest(other) != digest:
+            to_update.append(task)
+            fields[task.id] = changed_fields(task, other)
+            if other.status != task.status:
+                transitions.append(task.id)
+        else:
+            unchanged += 1
+        if newest is None or task.updated_at > newest:
+            newest = task.updated_at
+
+    return {
+        "source_count": len(source),
+        "destination_count": destination_count,
+        "to_add": to_add,
+        "to_update": to_update,
+        "fields": fields,
+        "transitions": transitions,
+        # Destination-only tasks still open; closed if their source was deleted
+        "only_destination": [(key, task) for key, task in destination.items() if task.status != "done"],
+        "unchanged": unchanged,
+        "encoded": encoded,
+        "newest_updated_at": newest,
+        "seconds": time.perf_counter() - start
+    }
+
+
+class ShardPlan:
+    """Merged result of every shard"""
+
+    def __init__(self, shards: int):
+        self.shards = shards
+        self.source_count = 0
+        self.destination_count = 0
+        self.to_add: List[Task] = []
+        self.to_update: List[Task] = []
+        self.fields: Dict[str, List[str]] = {}  # updated task ID -> changed fields
+        self.transitions: List[str] = []  # updated tasks whose status changes
+        self.only_destination: List[Tuple[str, Task]] = []
+        self.unchanged = 0
+        self.encoded: List[Tuple[str, bytes, bytes]] = []
+        self.newest_updated_at: Optional[datetime] = None
+        self.shard_seconds: List[float] = []
+
+    def merge(self, result: Dict[str, Any]):
+        self.source_count += result["source_count"]
+        self.destination_count += result["destination_count"]
+        self.to_add.extend(result["to_add"])
+        self.to_update.extend(result["to_update"])
+        self.fields.update(result["fields"])
+        self.transitions.extend(result["transitions"])
+        self.only_destination.extend(result["only_destination"])
+        self.unchanged += result["unchanged"]
+        self.encoded.extend(result["encoded"])
+        newest = result["newest_updated_at"]
+        if newest is not None and (self.newest_updated_at is None or newest > self.newest_updated_at):
+            self.newest_updated_at = newest
+        self.shard_seconds.append(round(result["seconds"], 3))
+
+
+class ShardCoordinator:
+    """
+    Plans a sync across a pool of shard processes
+
+    The coordinator fetches raw pages from both sides (HTTP stays in this
+    process, under its circuit breakers and timeouts), routes issues to
+    shards by task ID, and merges what the shards return. Shards never talk
+    to the integrations, so every push still goes through the engine's
+    single journal and rate budget.
+    """
+
+    def __init__(self, shards: int):
+        self.shards = shards
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        """Start the shard processes on first use"""
+        if self._executor is None:
+            # Imported here: multiprocessing is only needed when sharding.
+            # Workers are spawned, not forked, because the server process
+            # runs threads (loop monitor, executors) whose locks a fork could copy held.
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            self._executor = ProcessPoolExecutor(max_workers=self.shards, mp_context=multiprocessing.get_context("spawn"))
+            logger.info(f"🧩 Shard pool started ({self.shards} processes)")
+        return self._executor
+
+    async def plan(self, source, destination, id_mappings: Dict[str, str]) -> ShardPlan:
+        """
+        Fetch both snapshots and diff them shard by shard
+
+        Args:
+            source: Source GitHubIntegration
+            destination: Destination GitHubIntegration
+            id_mappings: Source task ID -> destination task ID
+
+        Returns:
+            ShardPlan: Merged changes, counts and encoded source tasks
+        """
+        reverse_mappings = {dest_id: source_id for source_id, dest_id in id_mappings.items()}
+        with tracer.span("route", shards=self.shards) as span:
+            (source_parts, source_count), (destination_parts, destination_count) = await asyncio.gather(
+                asyncio.to_thread(route_issue_pages, source.fetch_issue_pages("all"), self.shards),
+                asyncio.to_thread(route_issue_pages, destination.fetch_issue_pages("all"), self.shards, reverse_mappings)
+            )
+            span.set(source_count=source_count, destination_count=destination_count)
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+
+        async def run_shard(index: int) -> Dict[str, Any]:
+            with tracer.span("shard", shard=index) as shard_span:
+                result = await loop.run_in_executor(executor, plan_shard, source_parts[index], destination_parts[index])
+                shard_span.set(
+                    source_count=result["source_count"],
+                    to_add=len(result["to_add"]),
+                    to_update=len(result["to_update"]),
+                    worker_seconds=round(result["seconds"], 3)
+                )
+                return result
+
+        plan = ShardPlan(self.shards)
+        for result in await asyncio.gather(*(run_shard(index) for index in range(self.shards))):
+            plan.merge(result)
+
+        logger.info(
+            f"🧩 {self.shards} shards planned {plan.source_count} source tasks: {len(plan.to_add)} to add, "
+            f"{len(plan.to_update)} to update, {plan.unchanged} unchanged (worker seconds {plan.shard_seconds})"
+        )
+        return plan
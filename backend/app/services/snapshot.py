@@ -0,0 +1,210 @@
+"""
+Warm-start snapshots of the task store
+A compact binary file of tasks, ID mappings, tombstones, high-water marks,
+the base versions kept for bidirectional sync and the dead-letter queue
+that the in-memory store is reloaded from after a restart
+"""
+
+import mmap
+import os
+import struct
+import zlib
+from typing import Dict, Optional, Tuple
+
+from app.models.task import Task
+from app.services import fast_json
+from app.services.merkle import DIGEST_SIZE, task_digest
+
+MAGIC = b"TSNAP\x00\x01\n"  # name, format version 1
+
+# Every record: kind (1 byte) + payload length (uint32 LE) + payload
+RECORD = struct.Struct("<BI")
+ID_LENGTH = struct.Struct("<H")
+FOOTER = struct.Struct("<II")  # crc32 of everything before the footer record, task count
+
+TASK = ord("T")  # digest + id length + id + task JSON, one record per task
+MAPPINGS = ord("M")  # JSON object: source id -> destination id
+TOMBSTONES = ord("X")  # JSON object: task id -> deleted_at
+MARKS = ord("H")  # JSON object: name -> high-water mark
+BASES = ord("B")  # JSON object: source id -> last-synced task (bidirectional mode only)
+DEAD_LETTERS = ord("D")  # JSON object: key -> dead-letter entry
+END = ord("E")  # FOOTER
+
+FOOTER_SIZE = RECORD.size + FOOTER.size
+
+# Encoded task: (content digest, JSON bytes), decoded only when needed
+EncodedTask = Tuple[bytes, bytes]
+
+
+class Snapshot:
+    """Contents of a snapshot file"""
+
+    def __init__(
+        self,
+        tasks: Dict[str, EncodedTask],
+        id_mappings: Dict[str, str],
+        tombstones: Dict[str, str],
+        high_water_marks: Dict[str, str],
+        base_tasks: Optional[Dict[str, dict]] = None,
+        dead_letters: Optional[Dict[str, dict]] = None
+    ):
+        self.tasks = tasks
+        self.id_mappings = id_mappings
+        self.tombstones = tombstones
+        self.high_water_marks = high_water_marks
+        self.base_tasks = base_tasks or {}
+        self.dead_letters = dead_letters or {}
+
+
+def encode_task(task: Task) -> EncodedTask:
+    """
+    Encode a task for a snapshot
+
+    Args:
+        task: Task to encode
+
+    Returns:
+        tuple: (content digest, JSON bytes)
+    """
+    return task_digest(task), task.model_dump_json().encode("utf-8")
+
+
+def decode_task(encoded: EncodedTask) -> Task:
+    """Decode a task read from a snapshot"""
+    return Task.model_validate_json(encoded[1])
+
+
+def write_snapshot(
+    path: str,
+    tasks: Dict[str, Task],
+    encoded_tasks: Dict[str, EncodedTask],
+    id_mappings: Dict[str, str],
+    tombstones: Dict[str, str],
+    high_water_marks: Dict[str, str],
+    base_tasks: Optional[Dict[str, Task]] = None,
+    dead_letters: Optional[Dict[str, dict]] = None
+) -> int:
+    """
+    Write a snapshot atomically (temporary file, fsync, rename)
+
+    Args:
+        path: Snapshot file path
+        tasks: Decoded tasks (encoded here)
+        encoded_tasks: Tasks still in snapshot encoding (written as-is)
+        id_mappings: Source task ID -> destination task ID
+        tombstones: Task ID -> ISO deletion timestamp
+        high_water_marks: Name -> ISO timestamp
+        base_tasks: Source task ID -> last-synced task (bidirectional mode)
+        dead_letters: Key -> dead-letter entry
+
+    Returns:
+        int: File size in bytes
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    crc = zlib.crc32(MAGIC)
+    count = 0
+
+    with open(tmp_path, "wb") as f:
+        def emit(kind: int, payload: bytes):
+            nonlocal crc
+            record = RECORD.pack(kind, len(payload)) + payload
+            crc = zlib.crc32(record, crc)
+            f.write(record)
+
+        def emit_task(task_id: str, digest: bytes, data: bytes):
+            key = task_id.encode("utf-8")
+            emit(TASK, digest + ID_LENGTH.pack(len(key)) + key + data)
+
+        f.write(MAGIC)
+        for task_id, (digest, data) in encoded_tasks.items():
+            emit_task(task_id, digest, data)
+            count += 1
+        for task in tasks.values():
+            emit_task(task.id, *encode_task(task))
+            count += 1
+        emit(MAPPINGS, fast_json.dumps(id_mappings).encode("utf-8"))
+        emit(TOMBSTONES, fast_json.dumps(tombstones).encode("utf-8"))
+        emit(MARKS, fast_json.dumps(high_water_marks).encode("utf-8"))
+        if base_tasks:
+            bases = {task_id: task.model_dump(mode="json") for task_id, task in base_tasks.items()}
+            emit(BASES, fast_json.dumps(bases).encode("utf-8"))
+        if dead_letters:
+            emit(DEAD_LETTERS, fast_json.dumps(dead_letters).encode("utf-8"))
+        f.write(RECORD.pack(END, FOOTER.size) + FOOTER.pack(crc, count))
+        f.flush()
+        os.fsync(f.fileno())
+        size = f.tell()
+
+    os.replace(tmp_path, path)
+    return size
+
+
+def read_snapshot(path: str) -> Optional[Snapshot]:
+    """
+    Read a snapshot through a memory map
+
+    Task JSON is sliced out of the map without being parsed; callers decode
+    tasks lazily with decode_task.
+
+    Args:
+        path: Snapshot file path
+
+    Returns:
+        Snapshot or None if there is no file
+
+    Raises:
+        ValueError: The file is truncated, corrupt or of another format
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+
+    with f:
+        if os.fstat(f.fileno()).st_size < len(MAGIC) + FOOTER_SIZE:
+            raise ValueError(f"Snapshot {path} is truncated")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"Snapshot {path} has an unknown format")
+            end = len(mm) - FOOTER_SIZE
+            kind, length = RECORD.unpack_from(mm, end)
+            if kind != END or length != FOOTER.size:
+                raise ValueError(f"Snapshot {path} is truncated")
+            crc, count = FOOTER.unpack_from(mm, end + RECORD.size)
+            if zlib.crc32(mm[:end]) != crc:
+                raise ValueError(f"Snapshot {path} failed its checksum")
+
+            tasks: Dict[str, EncodedTask] = {}
+            id_mappings: Dict[str, str] = {}
+            tombstones: Dict[str, str] = {}
+            marks: Dict[str, str] = {}
+            bases: Dict[str, dict] = {}
+            dead_letters: Dict[str, dict] = {}
+            unpack_record = RECORD.unpack_from
+            unpack_id = ID_LENGTH.unpack_from
+            offset = len(MAGIC)
+            while offset < end:
+                kind, length = unpack_record(mm, offset)
+                start = offset + RECORD.size
+                offset = start + length
+                if kind == TASK:
+                    (id_length,) = unpack_id(mm, start + DIGEST_SIZE)
+                    id_start = start + DIGEST_SIZE + ID_LENGTH.size
+                    task_id = mm[id_start:id_start + id_length].decode("utf-8")
+                    tasks[task_id] = (mm[start:start + DIGEST_SIZE], mm[id_start + id_length:offset])
+                elif kind == MAPPINGS:
+                    id_mappings = fast_json.loads(mm[start:offset])
+                elif kind == TOMBSTONES:
+                    tombstones = fast_json.loads(mm[start:offset])
+                elif kind == MARKS:
+                    marks = fast_json.loads(mm[start:offset])
+                elif kind == BASES:
+                    bases = fast_json.loads(mm[start:offset])
+                elif kind == DEAD_LETTERS:
+                    dead_letters = fast_json.loads(mm[start:offset])
+
+    if len(tasks) != count:
+        raise ValueError(f"Snapshot {path} holds {len(tasks)} tasks, expected {count}")
+    return Snapshot(tasks, id_mappings, tombstones, marks, bases, dead_letters)
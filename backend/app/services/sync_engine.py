@@ -4,16 +4,37 @@ Implements the synchronization logic for tasks
 Works in both USER TOOL mode (manual trigger) and BOT mode (automatic)
 """
 
-from typing import List, Dict, Any, Optional
-from datetime import datetime
-from collections import deque
+from typing import Any, AsyncIterator, Callable, Collection, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from datetime import datetime, timezone
+import asyncio
+import itertools
+import json
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
 
+from app.config import settings
 from app.models.task import Task
+from app.services.change_log import ChangeLog
 from app.services.data_loader import DataLoader
-from app.db.memory_db import MemoryDB
+from app.services.dead_letters import DeadLetterQueue, entry_key
+from app.services.event_bus import event_bus
+from app.services.leader_election import sync_lease
+from app.services.merkle import MerkleTree, changed_fields
+from app.services.push_queue import op_key, order_ops
+from app.services import vector_diff
+from app.services.rule_compiler import RuleSet
+from app.services.sync_journal import JournalOp, SyncJournal
+from app.services.three_way_merge import CONFLICT_POLICIES, fields_equal, merge_task
+from app.services.tracing import tracer
 from app.services.logger import logger, log_sync_event
 
 
+class SyncInProgressError(RuntimeError):
+    """Raised when another sync, resume or dead-letter retry holds the sync lock"""
+
+
 class SyncEngine:
     """
     Core synchronization engine
@@ -23,183 +44,1359 @@ class SyncEngine:
     2. BOT MODE: Triggered automatically by scheduler
     
     The same sync logic is used in both cases
+
+    Tasks, history and counters live in the configured store, so every
+    worker sharing a SQLite file reports the same status.
     """
     
     def __init__(self):
         self.data_loader = DataLoader()
-        self.db = MemoryDB()
-        self.sync_history = deque(maxlen=100)  # Store last 100 sync operations
-        self.total_syncs = 0
-        self.last_sync_time: Optional[datetime] = None
+
+        if settings.DB_BACKEND == "sqlite":
+            from app.db.sqlite_db import SQLiteDB
+            self.db = SQLiteDB(settings.DATABASE_PATH)
+        else:
+            from app.db.memory_db import MemoryDB
+            self.db = MemoryDB()
+        self._store_blocks = settings.DB_BACKEND == "sqlite"
+
+        self.rules = RuleSet()
+        self.journal = SyncJournal(settings.JOURNAL_DIR, settings.JOURNAL_CHECKPOINT_EVERY)
+        self.dead_letters = DeadLetterQueue(
+            self.db, settings.DLQ_MAX_ATTEMPTS, settings.DLQ_RETRY_BASE_SECONDS, settings.DLQ_RETRY_MAX_SECONDS
+        )
+
+        # Every applied change, for downstream consumers (/api/changes)
+        self.change_log = None
+        if settings.CHANGE_LOG_DIR:
+            self.change_log = ChangeLog(
+                settings.CHANGE_LOG_DIR,
+                settings.CHANGE_LOG_SEGMENT_BYTES,
+                settings.CHANGE_LOG_RETENTION_BYTES,
+                settings.CHANGE_LOG_RETENTION_HOURS * 3600,
+                settings.CHANGE_LOG_COMPACT
+            )
+
+        # Merkle summaries of the last loaded snapshot of each side
+        self.source_tree: Optional[MerkleTree] = None
+        self.dest_tree: Optional[MerkleTree] = None
+
+        # The memory store is restored from its last snapshot (SQLite persists itself)
+        self.snapshot_path = settings.SNAPSHOT_PATH if settings.DB_BACKEND != "sqlite" else ""
+        self._last_snapshot = time.monotonic()
+        if self.snapshot_path:
+            self._restore_snapshot()
+
+        # Pushes left unfinished by earlier runs: (side, task ID) -> epoch seconds first planned
+        self._carry_over: Dict[tuple, float] = {}
+
+        # Incremental fetches build on the local copy of the last snapshot, so by
+        # default only a warm-started memory store uses them
+        incremental_fetch = settings.INCREMENTAL_FETCH.lower()
+        self.incremental_enabled = incremental_fetch == "on" or (incremental_fetch == "auto" and bool(self.snapshot_path))
+
+        # Syncs, resumes and retries in progress (shutdown waits for them)
+        self._active_runs = 0
+        # This worker holds the sync lock (the lease is per process, not per run)
+        self._lock_held = False
+
+        # Huge workspaces: plan in a pool of shard processes (GitHub to GitHub only)
+        self.shards = None
+        if settings.SYNC_SHARDS > 1:
+            from app.services.sharded_sync import ShardCoordinator
+            self.shards = ShardCoordinator(settings.SYNC_SHARDS)
+
+        # Bidirectional mode merges both sides against the last-synced base versions
+        self.bidirectional = settings.SYNC_DIRECTION == "bidirectional"
+        self.conflict_policy = settings.MERGE_CONFLICT_POLICY
+        if self.conflict_policy not in CONFLICT_POLICIES:
+            logger.warning(f"⚠️  Unknown MERGE_CONFLICT_POLICY {self.conflict_policy!r}; the source wins conflicts")
+            self.conflict_policy = "source"
+
+        self.diff_mode = settings.DIFF_MODE
+        if self.diff_mode == "numpy" and not vector_diff.AVAILABLE:
+            logger.warning("⚠️  DIFF_MODE=numpy but NumPy is not installed; using the Merkle diff")
+            self.diff_mode = "merkle"
+
+        # Dashboards get stats changes pushed instead of polling for them
+        event_bus.watch_stats(self.get_stats)
     
-    async def sync(self) -> Dict[str, Any]:
+    async def sync(self, sync_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Main synchronization method
         Can be called by:
         - User clicking a button (USER TOOL MODE)
         - Scheduled task (BOT MODE)
         - API call (USER TOOL MODE)
+
+        Only one run pushes at a time across all workers (see _sync_lock).
+
+        Args:
+            sync_id: ID for this run (generated if not given)
         
         Returns:
             dict: Sync result with statistics
+
+        Raises:
+            SyncInProgressError: Another sync is running
         """
+        async with self._sync_lock():
+            return await self._sync(sync_id)
+
+    async def _sync(self, sync_id: Optional[str] = None) -> Dict[str, Any]:
+        """Run one sync (the caller holds the sync lock)"""
         start_time = datetime.utcnow()
+        sync_id = sync_id or new_sync_id()
         
-        try:
-            log_sync_event("sync_start", {"timestamp": start_time.isoformat()})
+        with self._running(), tracer.span("sync", sync_id=sync_id) as root:
+            try:
+                log_sync_event("sync_start", {"sync_id": sync_id, "timestamp": start_time.isoformat()})
+                event_bus.publish("sync_started", {"sync_id": sync_id})
             
-            # Step 1: Load data from source and destination
-            source_tasks = await self.data_loader.load_source_tasks()
-            destination_tasks = await self.data_loader.load_destination_tasks()
+                # Step 1: Load data from source and destination
+                incremental = self._incremental_query()
+                plan = None
+                if self._use_shards(incremental):
+                    # Shards load, convert and diff their slices; only changes come back
+                    plan = await self.shards.plan(
+                        self.data_loader.github_source, self.data_loader.github_dest, self.db.get_id_mappings()
+                    )
+                    source_count, destination_count = plan.source_count, plan.destination_count
+                else:
+                    source_tasks, source_ids = await self._load_source_tasks(incremental)
+                    destination_tasks = await self.data_loader.load_destination_tasks()
+                    source_count, destination_count = len(source_tasks), len(destination_tasks)
+                event_bus.publish("sync_progress", {
+                    "sync_id": sync_id,
+                    "phase": "loaded",
+                    "source_count": source_count,
+                    "destination_count": destination_count
+                })
             
-            # Step 2: Compare and identify differences
-            changes = self._identify_changes(source_tasks, destination_tasks)
+                # Step 2: Compare and identify differences
+                with tracer.span("diff", source_count=source_count, destination_count=destination_count) as span:
+                    if plan is not None:
+                        current_ids = {task_id for task_id, _, _ in plan.encoded}
+                        self._tombstone([task_id for task_id in self.db.task_ids() if task_id not in current_ids])
+                        changes = self._shard_changes(plan)
+                        unchanged_count = plan.unchanged + changes["skipped_updates"]
+                        span.set(mode="sharded", shards=plan.shards)
+                    elif self.bidirectional:
+                        current_tree = MerkleTree.from_tasks(source_tasks)
+                        self._tombstone_source_deletions(self._previous_source_tree(), current_tree, source_ids)
+                        changes = self._identify_changes_bidirectional(source_tasks, destination_tasks)
+                        span.set(mode="three_way", conflicts=changes["conflicts"])
+                    elif self._use_vector_diff(len(source_tasks)):
+                        # No source tree this run; it is rebuilt from the store if needed
+                        current_tree = None
+                        self._tombstone(
+                            vector_diff.missing_ids(self.db.task_ids(), [task.id for task in source_tasks]), source_ids
+                        )
+                        changes = self._identify_changes_vectorized(source_tasks, destination_tasks)
+                        span.set(mode="numpy")
+                    else:
+                        current_tree = MerkleTree.from_tasks(source_tasks)
+                        self._tombstone_source_deletions(self._previous_source_tree(), current_tree, source_ids)
+                        changes = self._identify_changes(source_tasks, destination_tasks, current_tree)
+                        span.set(mode="merkle")
+                    if plan is None:
+                        unchanged_count = len(changes["unchanged"])
+                    span.set(**{key: len(changes[key]) for key in ("to_add", "to_update", "to_delete")})
+                event_bus.publish("sync_progress", {
+                    "sync_id": sync_id,
+                    "phase": "diffed",
+                    **{key: len(changes[key]) for key in ("to_add", "to_update", "to_delete")}
+                })
             
-            # Step 3: Apply changes to destination
-            if changes["to_add"] or changes["to_update"]:
-                tasks_to_push = changes["to_add"] + changes["to_update"]
-                push_result = await self.data_loader.push_to_destination(tasks_to_push)
-            else:
-                push_result = {"success": True, "pushed_count": 0, "failed_count": 0}
+                # Step 3: Apply changes to destination (and source, if bidirectional); journaled, so it can resume
+                # Dead-lettered pushes wait for their retry time (or a replay)
+                planned = self._journal_ops(changes)
+                ops = self.dead_letters.reconcile(planned)
+                if ops:
+                    push_result = await self._push_journaled(sync_id, ops, changes["transitions"], carry_over=True)
+                else:
+                    self._carry_over = {}
+                    push_result = {
+                        "success": True, "pushed_count": 0, "failed_count": 0, "deferred_count": 0,
+                        "update_count": 0, "update_bytes": 0, "done": set()
+                    }
+
+                if changes["to_delete"]:
+                    source_ids = {dest_id: source_id for source_id, dest_id in self.db.get_id_mappings().items()}
+                    await self.data_loader.close_in_destination(
+                        changes["to_delete"],
+                        lambda task: self._log_change(
+                            "delete", task, "destination", task.id, sync_id, task_id=source_ids.get(task.id, task.id)
+                        )
+                    )
+
+                if self.bidirectional:
+                    self._save_merge_bases(changes, push_result["done"])
             
-            # Step 4: Update local database
-            self._update_local_db(source_tasks)
+                # Step 4: Update local database
+                with tracer.span("save_local", task_count=source_count):
+                    if plan is not None:
+                        await self._store_write(self._update_local_db_encoded, plan.encoded)
+                        newest = plan.newest_updated_at
+                    else:
+                        await self._store_write(self._update_local_db, source_tasks, current_tree)
+                        newest = max((task.updated_at for task in source_tasks), key=_as_utc, default=None)
+                    await self._store_write(self._advance_high_water_mark, newest, incremental is not None)
             
-            # Step 5: Record sync operation
-            end_time = datetime.utcnow()
-            duration = (end_time - start_time).total_seconds()
+                # Step 5: Record sync operation
+                end_time = datetime.utcnow()
+                duration = (end_time - start_time).total_seconds()
             
-            sync_record = {
-                "timestamp": end_time.isoformat(),
-                "duration_seconds": duration,
-                "source_count": len(source_tasks),
-                "destination_count": len(destination_tasks),
-                "added": len(changes["to_add"]),
-                "updated": len(changes["to_update"]),
-                "unchanged": len(changes["unchanged"]),
-                "success": push_result["success"]
-            }
+                sync_record = {
+                    "sync_id": sync_id,
+                    "timestamp": end_time.isoformat(),
+                    "duration_seconds": duration,
+                    "source_count": source_count,
+                    "destination_count": destination_count,
+                    "added": len(changes["to_add"]),
+                    "updated": len(changes["to_update"]),
+                    "unchanged": unchanged_count,
+                    "deleted": len(changes["to_delete"]),
+                    "deferred": push_result["deferred_count"],
+                    "held_back": len(planned) - len(ops),
+                    "skipped_unmapped": changes.get("skipped_updates", 0),
+                    "update_payload_bytes": push_result["update_bytes"],
+                    "avg_update_payload_bytes": (
+                        round(push_result["update_bytes"] / push_result["update_count"])
+                        if push_result["update_count"] else 0
+                    ),
+                    "incremental": incremental is not None,
+                    "shards": plan.shards if plan is not None else 0,
+                    "success": push_result["success"]
+                }
+                if self.bidirectional:
+                    sync_record.update({
+                        "added_source": len(changes["to_add_source"]),
+                        "updated_source": len(changes["to_update_source"]),
+                        "conflicts": changes["conflicts"]
+                    })
+                root.set(**{key: sync_record[key] for key in ("added", "updated", "deleted", "incremental", "shards")})
             
-            self.sync_history.append(sync_record)
-            self.total_syncs += 1
-            self.last_sync_time = end_time
+                await self._record_sync(sync_record, completed_sync=True)
+                await self.save_snapshot()
             
-            log_sync_event("sync_complete", sync_record)
+                log_sync_event("sync_complete", sync_record)
+                event_bus.publish("sync_completed", {"sync_id": sync_id, "stats": sync_record})
+                event_bus.publish_stats(self.get_stats())
             
-            return {
-                "success": True,
-                "message": f"Sync completed successfully",
-                "stats": sync_record
-            }
+                return {
+                    "success": True,
+                    "message": f"Sync completed successfully",
+                    "stats": sync_record
+                }
             
-        except Exception as e:
-            error_time = datetime.utcnow()
-            error_record = {
-                "timestamp": error_time.isoformat(),
-                "error": str(e),
-                "success": False
-            }
-            self.sync_history.append(error_record)
+            except Exception as e:
+                error_time = datetime.utcnow()
+                error_record = {
+                    "sync_id": sync_id,
+                    "timestamp": error_time.isoformat(),
+                    "error": str(e),
+                    "success": False
+                }
+                await self._record_sync(error_record)
             
-            log_sync_event("sync_error", error_record)
-            raise
+                log_sync_event("sync_error", error_record)
+                event_bus.publish("sync_failed", error_record)
+                raise
     
-    async def dry_run(self) -> Dict[str, Any]:
+    async def dry_run(self, sync_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Perform a dry-run (preview changes without applying)
+
+        Args:
+            sync_id: ID for the trace of this run (optional)
         
         Returns:
             dict: Preview of what would be synced
         """
         logger.info("🔍 Starting dry-run sync...")
+        sync_id = sync_id or f"dry-{new_sync_id()}"
         
-        source_tasks = await self.data_loader.load_source_tasks()
-        destination_tasks = await self.data_loader.load_destination_tasks()
-        
-        changes = self._identify_changes(source_tasks, destination_tasks)
+        with tracer.span("dry_run", sync_id=sync_id):
+            incremental = self._incremental_query()
+            if self._use_shards(incremental):
+                plan = await self.shards.plan(
+                    self.data_loader.github_source, self.data_loader.github_dest, self.db.get_id_mappings()
+                )
+                changes = self._shard_changes(plan)
+                source_count, destination_count = plan.source_count, plan.destination_count
+                unchanged_count = plan.unchanged + changes["skipped_updates"]
+            else:
+                source_tasks, _ = await self._load_source_tasks(incremental)
+                destination_tasks = await self.data_loader.load_destination_tasks()
+                source_count, destination_count = len(source_tasks), len(destination_tasks)
+
+                with tracer.span("diff", source_count=source_count, destination_count=destination_count):
+                    if self.bidirectional:
+                        changes = self._identify_changes_bidirectional(source_tasks, destination_tasks)
+                    elif self._use_vector_diff(source_count):
+                        changes = self._identify_changes_vectorized(source_tasks, destination_tasks)
+                    else:
+                        changes = self._identify_changes(source_tasks, destination_tasks)
+                unchanged_count = len(changes["unchanged"])
+
+        preview = {
+            "tasks_to_add": [task.dict() for task in changes["to_add"]],
+            "tasks_to_update": [task.dict() for task in changes["to_update"]],
+            "tasks_to_delete": [task.dict() for task in changes["to_delete"]],
+            "tasks_unchanged": unchanged_count
+        }
+        if self.bidirectional:
+            preview.update({
+                "tasks_to_add_source": [task.dict() for task in changes["to_add_source"]],
+                "tasks_to_update_source": [task.dict() for task in changes["to_update_source"]],
+                "conflicts": changes["conflicts"]
+            })
         
         return {
             "dry_run": True,
-            "preview": {
-                "tasks_to_add": [task.dict() for task in changes["to_add"]],
-                "tasks_to_update": [task.dict() for task in changes["to_update"]],
-                "tasks_unchanged": len(changes["unchanged"])
-            },
-            "source_count": len(source_tasks),
-            "destination_count": len(destination_tasks)
+            "sync_id": sync_id,
+            "preview": preview,
+            "source_count": source_count,
+            "destination_count": destination_count
         }
     
-    def _identify_changes(self, source_tasks: List[Task], destination_tasks: List[Task]) -> Dict[str, List[Task]]:
+    def _incremental_query(self) -> Optional[Dict[str, Any]]:
+        """
+        Source query for an incremental fetch, if one is possible
+
+        Only issues updated since the source high-water mark are fetched
+        and laid over the local copy of the previous snapshot. Deletions
+        are invisible to such a fetch, so once the last full fetch is
+        INCREMENTAL_FULL_FETCH_SECONDS old the next sync fetches everything.
+        Its time is kept with the high-water mark in the store, so restarts
+        and other workers see it. Syncs with active rules always fetch
+        fully (the local copy only holds what the rules selected).
+
+        Returns:
+            dict or None: Source query, or None for a full fetch
+        """
+        if not self.incremental_enabled or self.rules.active_rules():
+            return None
+        marks = self.db.get_high_water_marks()
+        since, full_fetch = marks.get("source"), marks.get("source_full_fetch")
+        if not since or not full_fetch:
+            return None
+        last_full = datetime.fromisoformat(full_fetch.replace("Z", "+00:00"))
+        if (datetime.now(timezone.utc) - last_full).total_seconds() >= settings.INCREMENTAL_FULL_FETCH_SECONDS:
+            return None
+        split = self.data_loader.split_source_filters({"updated_since": since})
+        if split is None or split[1]:
+            return None
+        return split[0]
+
+    def _advance_high_water_mark(self, newest: Optional[datetime], incremental: bool):
+        """
+        Record the newest source update that is now in the local store
+
+        Args:
+            newest: Newest updated_at in the source snapshot just saved (None if empty)
+            incremental: Whether it came from an incremental fetch
+        """
+        if newest is None or self.rules.active_rules():
+            self.db.set_high_water_marks({"source": None, "source_full_fetch": None})
+            return
+        marks = {"source": _as_utc(newest).strftime("%Y-%m-%dT%H:%M:%SZ")}
+        if not incremental:
+            marks["source_full_fetch"] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        self.db.set_high_water_marks(marks)
+
+    async def _load_source_tasks(
+        self, incremental: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Task], Optional[Set[str]]]:
+        """
+        Load source tasks selected by the enabled sync rules
+
+        Rule filters the source can evaluate are pushed into its query, so
+        unwanted tasks are never fetched or converted; only the residual
+        filters run locally. If any rule cannot push anything down (or the
+        source has no query support) it needs the full snapshot anyway, so
+        everything is fetched once and filtered locally.
+
+        A task the rules leave out is not deleted at the source, so the IDs
+        the source still has are returned alongside the selection. After a
+        local filter they are the unfiltered fetch; filtered queries cannot
+        tell deletions apart, so every stored task counts as still there.
+
+        Args:
+            incremental: Query from _incremental_query; only changed tasks
+                         are fetched and merged over the local store
+
+        Returns:
+            tuple: Selected (and mapped) source tasks, and the IDs still at
+                   the source (None when the selection is the whole source)
+        """
+        if incremental is not None:
+            changed = await self.data_loader.load_source_tasks(incremental)
+            tasks = {task.id: task for task in self.db.get_all_tasks()}
+            tasks.update((task.id, task) for task in changed)
+            logger.info(f"⏩ Incremental fetch: {len(changed)} tasks changed, {len(tasks)} in snapshot")
+            return list(tasks.values()), None
+
+        rules = self.rules.active_rules()
+        if not rules:
+            return await self.data_loader.load_source_tasks(), None
+
+        plans = []
+        for rule in rules:
+            # Resolving a milestone filter may fetch the milestone list
+            split = await asyncio.to_thread(self.data_loader.split_source_filters, rule.filters)
+            if split is None or not split[0]:
+                fetched = await self.data_loader.load_source_tasks()
+                return self.rules.apply(fetched, rules), {task.id for task in fetched}
+            query, residual = split
+            logger.info(f"🔎 Rule {rule.rule_id}: pushed {query}, local {residual or '{}'}")
+            plans.append((rule.residual(residual), query))
+
+        # One fetch per distinct query; first matching rule still wins
+        batches: Dict[str, List[Task]] = {}
+        selected: List[Task] = []
+        seen = set()
+        for rule, query in plans:
+            key = json.dumps(query, sort_keys=True, default=str)
+            if key not in batches:
+                batches[key] = await self.data_loader.load_source_tasks(query)
+            candidates = [task for task in batches[key] if task.id not in seen]
+            accepted, _ = rule.partition(candidates)
+            for task in accepted:
+                task.metadata["sync_rule"] = rule.rule_id
+                seen.add(task.id)
+            selected.extend(accepted)
+
+        logger.info(f"🧩 {len(rules)} sync rule(s) selected {len(selected)} tasks from {len(batches)} filtered fetch(es)")
+        return selected, set(self.db.task_ids()) | seen
+
+    def _identify_changes(
+        self,
+        source_tasks: List[Task],
+        destination_tasks: List[Task],
+        source_tree: Optional[MerkleTree] = None
+    ) -> Dict[str, List[Task]]:
         """
         Identify differences between source and destination
+
+        Both snapshots are summarized as Merkle trees; only ID ranges whose
+        hashes differ are inspected task by task. Tasks in matching ranges
+        have identical synced content and are left unchanged.
         
         Args:
             source_tasks: Tasks from source system
             destination_tasks: Tasks from destination system
+            source_tree: Prebuilt Merkle tree of source_tasks (optional)
             
         Returns:
-            dict: Categorized changes (to_add, to_update, unchanged)
+            dict: Categorized changes (to_add, to_update, to_delete, unchanged),
+                  the fields each update writes and the number of updates
+                  skipped because the destination stores none of their
+                  changed fields (counted as unchanged)
         """
         logger.info("🔍 Identifying changes...")
+
+        if source_tree is None:
+            source_tree = MerkleTree.from_tasks(source_tasks)
+        dest_task_map = self._key_destination_by_source_id(destination_tasks)
+        self.dest_tree = MerkleTree.from_mapping(dest_task_map)
+        diff = source_tree.diff(self.dest_tree)
+
+        source_task_map = {task.id: task for task in source_tasks}
         
-        dest_task_map = {task.id: task for task in destination_tasks}
-        
-        to_add = []
-        to_update = []
-        unchanged = []
-        
-        for source_task in source_tasks:
-            if source_task.id not in dest_task_map:
-                to_add.append(source_task)
-            else:
-                dest_task = dest_task_map[source_task.id]
-                if self._task_has_changed(source_task, dest_task):
-                    to_update.append(source_task)
-                else:
-                    unchanged.append(source_task)
+        to_add = [source_task_map[task_id] for task_id in diff["only_self"]]
+        to_update, fields, skipped = self._writable_updates(
+            (source_task_map[task_id], changed_fields(source_task_map[task_id], dest_task_map[task_id]))
+            for task_id in diff["differing"]
+        )
+
+        # Destination-only tasks are closed if their source was deleted
+        tombstones = self.db.get_tombstones()
+        to_delete = [
+            dest_task_map[task_id] for task_id in diff["only_other"]
+            if task_id in tombstones and dest_task_map[task_id].status != "done"
+        ]
+
+        touched = {task.id for task in to_add} | {task.id for task in to_update}
+        unchanged = [task for task in source_tasks if task.id not in touched]
         
-        logger.info(f"📊 Changes: {len(to_add)} to add, {len(to_update)} to update, {len(unchanged)} unchanged")
+        logger.info(
+            f"📊 Changes: {len(to_add)} to add, {len(to_update)} to update, "
+            f"{len(to_delete)} to delete, {len(unchanged)} unchanged "
+            f"({diff['ranges_differing']} ranges differ, {diff['nodes_compared']} nodes compared)"
+        )
         
         return {
             "to_add": to_add,
             "to_update": to_update,
-            "unchanged": unchanged
+            "to_delete": to_delete,
+            "unchanged": unchanged,
+            "fields": fields,
+            "skipped_updates": len(skipped),
+            "transitions": self._status_transitions(to_update, dest_task_map)
         }
     
-    def _task_has_changed(self, source_task: Task, dest_task: Task) -> bool:
+    def _use_shards(self, incremental: Optional[Dict[str, Any]]) -> bool:
+        """
+        Whether to plan this run in shard processes
+
+        Sharding covers full GitHub-to-GitHub fetches without active rules;
+        incremental fetches are small enough to plan in-process.
+        """
+        return (
+            self.shards is not None
+            and not self.bidirectional
+            and incremental is None
+            and self.data_loader.github_source is not None
+            and self.data_loader.github_dest is not None
+            and not self.rules.active_rules()
+        )
+
+    def _shard_changes(self, plan) -> Dict[str, List[Task]]:
+        """
+        Changes from a shard plan, in the shape _identify_changes returns
+
+        Unchanged tasks stay in the shards; only their count is kept.
+
+        Args:
+            plan: ShardPlan
+
+        Returns:
+            dict: to_add, to_update, to_delete, fields, skipped_updates and transitions
+        """
+        tombstones = self.db.get_tombstones()
+        to_update, fields, skipped = self._writable_updates((task, plan.fields[task.id]) for task in plan.to_update)
+        updated = {task.id for task in to_update}
+        return {
+            "to_add": plan.to_add,
+            "to_update": to_update,
+            "to_delete": [task for key, task in plan.only_destination if key in tombstones],
+            "fields": fields,
+            "skipped_updates": len(skipped),
+            "transitions": {("destination", task_id) for task_id in plan.transitions if task_id in updated}
+        }
+
+    def _identify_changes_bidirectional(
+        self,
+        source_tasks: List[Task],
+        destination_tasks: List[Task]
+    ) -> Dict[str, Any]:
         """
-        Check if a task has changed using timestamp-based comparison
+        Three-way merge of source and destination against the stored base versions
+
+        Each task pair is merged field by field (see three_way_merge), so a
+        field edited on one side is sent to the other and only true
+        conflicts fall back to the conflict policy. Source-only tasks are
+        created in the destination and destination-only tasks in the source,
+        except destination tasks whose source was deleted (closed) or that
+        were synced before (left alone). With active rules nothing is
+        created in the source, since a destination-only task may just be
+        one the rules filtered out.
 
         Args:
-            source_task: Task from source
-            dest_task: Task from destination
+            source_tasks: Tasks from source system
+            destination_tasks: Tasks from destination system
 
         Returns:
-            bool: True if task has changed
+            dict: to_add, to_update, to_delete and unchanged as in
+                  _identify_changes, plus to_add_source, to_update_source,
+                  fields per (side, task ID) update, status transitions,
+                  the conflict count and
+                  the base versions to store once the pushes succeed
+        """
+        logger.info("🔍 Merging source and destination changes...")
+
+        dest_task_map = self._key_destination_by_source_id(destination_tasks)
+        bases = self.db.get_base_tasks()
+        tombstones = self.db.get_tombstones()
+
+        to_add: List[Task] = []
+        to_update: List[Task] = []
+        to_update_source: List[Task] = []
+        unchanged: List[Task] = []
+        fields: Dict[tuple, List[str]] = {}
+        new_bases: Dict[str, Task] = {}
+        conflicts = 0
+
+        for task in source_tasks:
+            destination = dest_task_map.pop(task.id, None)
+            if destination is None:
+                to_add.append(task)
+                continue
+            base = bases.get(task.id)
+            result = merge_task(base, task, destination, self.conflict_policy)
+            conflicts += len(result.conflicts)
+            if result.to_destination:
+                to_update.append(result.merged)
+                fields[("destination", task.id)] = result.to_destination
+            if result.to_source:
+                to_update_source.append(result.merged)
+                fields[("source", task.id)] = result.to_source
+            if not (result.to_destination or result.to_source):
+                unchanged.append(task)
+            if base is None or not fields_equal(base, result.merged):
+                new_bases[task.id] = result.merged
+
+        # What is left exists only in the destination
+        create_in_source = not self.rules.active_rules()
+        to_delete: List[Task] = []
+        to_add_source: List[Task] = []
+        for task_id, destination in dest_task_map.items():
+            if task_id in tombstones:
+                if destination.status != "done":
+                    to_delete.append(destination)
+            elif task_id not in bases and create_in_source:
+                to_add_source.append(destination)
+
+        logger.info(
+            f"📊 Changes: {len(to_add)} to add, {len(to_update)} to update, {len(to_delete)} to delete, "
+            f"{len(to_add_source)} to add and {len(to_update_source)} to update in source, "
+            f"{len(unchanged)} unchanged ({conflicts} conflicting fields)"
+        )
+
+        return {
+            "to_add": to_add,
+            "to_update": to_update,
+            "to_delete": to_delete,
+            "unchanged": unchanged,
+            "to_add_source": to_add_source,
+            "to_update_source": to_update_source,
+            "fields": fields,
+            "transitions": {key for key, changed in fields.items() if "status" in changed},
+            "conflicts": conflicts,
+            "bases": new_bases,
+            "forget_bases": [task_id for task_id in dest_task_map if task_id in tombstones and task_id in bases]
+        }
+
+    def _save_merge_bases(self, changes: Dict[str, Any], done: set):
+        """
+        Store the merged versions as the new base of each task pair
+
+        A pair's base only advances once every update planned for it was
+        pushed; otherwise the next merge would mistake the side that missed
+        the update for the side that changed.
+
+        Args:
+            changes: Result of _identify_changes_bidirectional
+            done: (side, task ID) of every push that succeeded
         """
-        # First check if updated_at timestamp is newer
-        if source_task.updated_at > dest_task.updated_at:
+        fields = changes["fields"]
+        bases = {
+            task_id: task for task_id, task in changes["bases"].items()
+            if all(key in done for key in (("destination", task_id), ("source", task_id)) if key in fields)
+        }
+        if bases:
+            self.db.save_base_tasks(bases)
+        if changes["forget_bases"]:
+            self.db.delete_base_tasks(changes["forget_bases"])
+
+    def _use_vector_diff(self, source_count: int) -> bool:
+        """Whether to diff with NumPy arrays instead of Merkle trees"""
+        if self.diff_mode == "numpy":
             return True
+        return self.diff_mode == "auto" and vector_diff.AVAILABLE and source_count >= settings.DIFF_VECTOR_MIN_TASKS
 
-        # Fallback to field comparison if timestamps are equal
-        return (
-            source_task.title != dest_task.title or
-            source_task.description != dest_task.description or
-            source_task.status != dest_task.status or
-            source_task.priority != dest_task.priority
+    def _identify_changes_vectorized(
+        self,
+        source_tasks: List[Task],
+        destination_tasks: List[Task]
+    ) -> Dict[str, List[Task]]:
+        """
+        Identify differences with vectorized set operations (needs NumPy)
+
+        Same result as _identify_changes: both sides become arrays of
+        id-hashes and content-hashes, are matched by sorted search, and only
+        the tasks in each resulting set are looked up. Falls back to the
+        Merkle diff if two IDs share a hash.
+
+        Args:
+            source_tasks: Tasks from source system
+            destination_tasks: Tasks from destination system
+
+        Returns:
+            dict: Categorized changes (to_add, to_update, to_delete, unchanged)
+        """
+        logger.info("🔍 Identifying changes (vectorized)...")
+
+        dest_task_map = self._key_destination_by_source_id(destination_tasks)
+        dest_keys = list(dest_task_map)
+        dest_values = list(dest_task_map.values())
+        result = vector_diff.diff(
+            vector_diff.id_hashes([task.id for task in source_tasks]),
+            vector_diff.content_hashes(source_tasks),
+            vector_diff.id_hashes(dest_keys),
+            vector_diff.content_hashes(dest_values)
         )
-    
-    def _update_local_db(self, tasks: List[Task]):
+        if result is None:
+            logger.warning("⚠️  Task ID hash collision; falling back to the Merkle diff")
+            return self._identify_changes(source_tasks, destination_tasks)
+        self.dest_tree = None
+
+        to_add = [source_tasks[i] for i in result.only_source.tolist()]
+        to_update, fields, skipped = self._writable_updates(
+            (source_tasks[i], changed_fields(source_tasks[i], dest_task_map[source_tasks[i].id]))
+            for i in result.changed.tolist()
+        )
+        unchanged = [source_tasks[i] for i in result.unchanged.tolist()] + skipped
+
+        # Destination-only tasks are closed if their source was deleted
+        tombstones = self.db.get_tombstones()
+        to_delete = [
+            dest_values[i] for i in result.only_dest.tolist()
+            if dest_keys[i] in tombstones and dest_values[i].status != "done"
+        ]
+
+        logger.info(
+            f"📊 Changes: {len(to_add)} to add, {len(to_update)} to update, "
+            f"{len(to_delete)} to delete, {len(unchanged)} unchanged"
+        )
+
+        return {
+            "to_add": to_add,
+            "to_update": to_update,
+            "to_delete": to_delete,
+            "unchanged": unchanged,
+            "fields": fields,
+            "skipped_updates": len(skipped),
+            "transitions": self._status_transitions(to_update, dest_task_map)
+        }
+
+    def _status_transitions(self, to_update: List[Task], dest_task_map: Dict[str, Task]) -> set:
+        """
+        Destination updates that change a task's status (pushed ahead of other edits)
+
+        Args:
+            to_update: Changed source tasks
+            dest_task_map: Destination tasks keyed by source ID
+
+        Returns:
+            set: ("destination", task ID) per transition
+        """
+        return {("destination", task.id) for task in to_update if task.status != dest_task_map[task.id].status}
+
+    def _writable_updates(self, changed: Iterable[Tuple[Task, List[str]]]) -> Tuple[List[Task], Dict[tuple, List[str]], List[Task]]:
+        """
+        Restrict updates to the fields the destination stores
+
+        Each update writes only its changed fields the destination can
+        store; an update none of whose changed fields it stores (e.g. only
+        the priority changed, which a GitHub issue update does not write)
+        is skipped.
+
+        Args:
+            changed: (source task, changed fields) per differing task
+
+        Returns:
+            tuple: (tasks to update, fields per ("destination", task ID), skipped tasks)
+        """
+        writable = self.data_loader.destination_fields()
+        to_update: List[Task] = []
+        fields: Dict[tuple, List[str]] = {}
+        skipped: List[Task] = []
+        for task, changed_names in changed:
+            names = [name for name in changed_names if writable is None or name in writable]
+            if not names:
+                skipped.append(task)
+                continue
+            to_update.append(task)
+            fields[("destination", task.id)] = names
+        if skipped:
+            logger.info(f"⏭️  Skipping {len(skipped)} updates whose changes the destination does not store")
+        return to_update, fields, skipped
+
+    def _key_destination_by_source_id(self, destination_tasks: List[Task]) -> Dict[str, Task]:
+        """
+        Key destination tasks by the source ID they were pushed from
+
+        Destination tasks without a recorded mapping keep their own ID.
+
+        Args:
+            destination_tasks: Tasks from destination system
+
+        Returns:
+            dict: Source task ID -> destination task
+        """
+        source_ids = {dest_id: source_id for source_id, dest_id in self.db.get_id_mappings().items()}
+        return {source_ids.get(task.id, task.id): task for task in destination_tasks}
+
+    def _journal_ops(self, changes: Dict[str, Any]) -> List[JournalOp]:
+        """
+        Plan the push operations for a set of changes
+
+        Destination creates and updates come first, then (bidirectional
+        sync) source creates and updates.
+
+        Args:
+            changes: Result of one of the _identify_changes methods
+
+        Returns:
+            list: Operations, indexed in order
+        """
+        fields = changes.get("fields", {})
+        ops: List[JournalOp] = []
+        for key, action, target in (
+            ("to_add", "create", "destination"),
+            ("to_update", "update", "destination"),
+            ("to_add_source", "create", "source"),
+            ("to_update_source", "update", "source"),
+        ):
+            for task in changes.get(key, ()):
+                ops.append(JournalOp(len(ops), action, task, target, fields.get((target, task.id))))
+        return ops
+
+    async def _push_journaled(
+        self,
+        sync_id: str,
+        ops: List[JournalOp],
+        transitions: Collection[tuple] = (),
+        carry_over: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Push changes while recording progress in the write-ahead journal
+
+        Args:
+            sync_id: Sync run ID
+            ops: Planned operations (from _journal_ops)
+            transitions: (side, task ID) of operations that change a status
+            carry_over: Whether leftovers replace the carry-over (see _push_ops)
+
+        Returns:
+            dict: Result of the push operation
+        """
+        create_count = sum(1 for op in ops if op.action == "create")
+        run = self.journal.begin(sync_id, ops)
+        try:
+            with tracer.span("push_batch", create_count=create_count, update_count=len(ops) - create_count) as span:
+                result = await self._push_ops(ops, run, sync_id, transitions, carry_over)
+                span.set(
+                    pushed_count=result["pushed_count"],
+                    failed_count=result["failed_count"],
+                    deferred_count=result["deferred_count"]
+                )
+        except BaseException:
+            run.close()
+            raise
+        run.commit()
+        return result
+
+    async def _push_ops(
+        self,
+        ops: List[JournalOp],
+        run,
+        sync_id: str,
+        transitions: Collection[tuple] = (),
+        carry_over: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Push journaled operations, checkpointing each completion
+
+        Operations are pushed in priority order (see push_queue). With
+        PUSH_DEADLINE_SECONDS set, pushing stops at the deadline; whatever
+        is left (or failed) is carried over and goes first next run.
+        Failed operations are also dead-lettered with their error.
+
+        Only a regular sync plans the whole backlog, so only it replaces the
+        carry-over. Resumes and dead-letter retries push a subset; they just
+        drop what they pushed from it and leave the ages of the rest alone.
+
+        Args:
+            ops: Operations to push
+            run: Open JournalRun
+            sync_id: Sync run ID (for progress events)
+            transitions: (side, task ID) of operations that change a status
+            carry_over: Whether this is a regular sync's push
+
+        Returns:
+            dict: Result of the push operation; "done" holds (side, task ID)
+                  of every operation that succeeded
+        """
+        by_key = {op_key(op): op for op in ops}
+        new_mappings: Dict[str, str] = {}
+        done = set()
+        failures = []
+        # About twenty progress events per push, however large it is
+        report_every = max(1, len(ops) // 20)
+
+        def on_pushed_to(target: str) -> Callable[[Task, str], None]:
+            def on_pushed(task: Task, pushed_id: str):
+                op = by_key[(target, task.id)]
+                run.mark_done(op.index, pushed_id)
+                done.add((target, task.id))
+                self._log_change(
+                    "add" if op.action == "create" else "update", task, target, pushed_id, sync_id, op.fields,
+                    # A task created in the source gets its source ID only now
+                    task_id=pushed_id if target == "source" else task.id
+                )
+                if pushed_id != task.id:
+                    # Mappings always point from source ID to destination ID
+                    if target == "destination":
+                        new_mappings[task.id] = pushed_id
+                    else:
+                        new_mappings[pushed_id] = task.id
+                if len(done) % report_every == 0 or len(done) == len(ops):
+                    event_bus.publish("sync_progress", {
+                        "sync_id": sync_id, "phase": "pushing", "done": len(done), "total": len(ops)
+                    })
+            return on_pushed
+
+        def on_failed_to(target: str) -> Callable[[Task, str], None]:
+            def on_failed(task: Task, reason: str):
+                failures.append((by_key[(target, task.id)], reason))
+            return on_failed
+
+        first_planned = self._carry_over
+        ordered = order_ops(ops, transitions, first_planned)
+        deadline = time.monotonic() + settings.PUSH_DEADLINE_SECONDS if settings.PUSH_DEADLINE_SECONDS > 0 else None
+        result = {"success": True, "pushed_count": 0, "failed_count": 0, "deferred_count": 0, "update_count": 0, "update_bytes": 0}
+        try:
+            # Consecutive operations on the same side go out as one batch
+            for target, batch in itertools.groupby(ordered, key=lambda op: op.target):
+                batch = list(batch)
+                if result["deferred_count"]:
+                    result["deferred_count"] += len(batch)
+                    continue
+                batch_fields = {op.task.id: op.fields for op in batch if op.fields is not None}
+                if target == "destination":
+                    batch_result = await self.data_loader.push_to_destination(
+                        [op.task for op in batch], self.db.get_id_mappings(), on_pushed_to(target),
+                        batch_fields, deadline, on_failed_to(target)
+                    )
+                else:
+                    batch_result = await self.data_loader.push_to_source(
+                        [(op.action, op.task) for op in batch], batch_fields, on_pushed_to(target), deadline,
+                        on_failed_to(target)
+                    )
+                result = {
+                    "success": result["success"] and batch_result["success"],
+                    "pushed_count": result["pushed_count"] + batch_result["pushed_count"],
+                    "failed_count": result["failed_count"] + batch_result["failed_count"],
+                    "deferred_count": result["deferred_count"] + batch_result["deferred_count"],
+                    "update_count": result["update_count"] + batch_result["update_count"],
+                    "update_bytes": result["update_bytes"] + batch_result["update_bytes"]
+                }
+            result["done"] = done
+            return result
+        finally:
+            if new_mappings:
+                self.db.save_id_mappings(new_mappings)
+            self.dead_letters.record_failures(failures)
+            self.dead_letters.record_success(entry_key(*key) for key in done)
+            if carry_over:
+                now = time.time()
+                self._carry_over = {key: first_planned.get(key, now) for key in by_key if key not in done}
+                if self._carry_over:
+                    logger.info(f"⏭️  {len(self._carry_over)} pushes carried over to the next sync")
+            else:
+                self._carry_over = {key: since for key, since in first_planned.items() if key not in done}
+
+    def _log_change(
+        self,
+        op: str,
+        task: Task,
+        target: str,
+        target_id: str,
+        sync_id: str,
+        fields: Optional[List[str]] = None,
+        task_id: Optional[str] = None
+    ):
+        """
+        Append an applied change to the change log (if enabled)
+
+        The change was already applied, so a failed append is logged and
+        does not fail the push.
+        """
+        if self.change_log is None:
+            return
+        try:
+            self.change_log.append(op, task, target, target_id, task_id, fields, sync_id)
+        except OSError as e:
+            logger.error(f"❌ Could not append {op} of {task.id} to the change log: {str(e)}")
+
+    async def resume_interrupted(self) -> List[Dict[str, Any]]:
+        """
+        Finish sync runs that were interrupted mid-push
+
+        Operations already confirmed in the journal are skipped; their
+        destination IDs are restored into the ID mapping first, so nothing
+        is created twice.
+
+        Returns:
+            list: One record per resumed run
+
+        Raises:
+            SyncInProgressError: Another sync is running
+        """
+        async with self._sync_lock():
+            return await self._resume_interrupted()
+
+    async def _resume_interrupted(self) -> List[Dict[str, Any]]:
+        """Resume every interrupted run (the caller holds the sync lock)"""
+        records = []
+        for interrupted in self.journal.find_interrupted():
+            recovered = {}
+            for op in interrupted.ops:
+                pushed_id = interrupted.completed.get(op.index)
+                if pushed_id in (None, op.task.id):
+                    continue
+                if op.target == "destination":
+                    recovered[op.task.id] = pushed_id
+                else:
+                    recovered[pushed_id] = op.task.id
+            if recovered:
+                self.db.save_id_mappings(recovered)
+
+            remaining = interrupted.remaining
+            logger.info(
+                f"♻️  Resuming sync {interrupted.sync_id}: {len(interrupted.completed)} done, "
+                f"{len(remaining)} remaining"
+            )
+
+            run = self.journal.resume(interrupted)
+            try:
+                with self._running(), tracer.span("resume", sync_id=interrupted.sync_id, remaining=len(remaining)):
+                    push_result = await self._push_ops(remaining, run, interrupted.sync_id) if remaining else {
+                        "success": True, "pushed_count": 0, "failed_count": 0
+                    }
+            except BaseException:
+                run.close()
+                raise
+            run.commit()
+
+            record = {
+                "sync_id": interrupted.sync_id,
+                "timestamp": datetime.utcnow().isoformat(),
+                "resumed": True,
+                "skipped_ops": len(interrupted.completed),
+                "resumed_ops": len(remaining),
+                "pushed": push_result["pushed_count"],
+                "failed": push_result["failed_count"],
+                "success": push_result["success"]
+            }
+            await self._record_sync(record)
+            log_sync_event("sync_resumed", record)
+            records.append(record)
+        if records:
+            await self.save_snapshot(force=True)
+        return records
+
+    async def retry_dead_letters(self, keys: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Retry dead-lettered pushes in one targeted batch (no full sync)
+
+        Only the stored operations are pushed; nothing is loaded or diffed.
+
+        Args:
+            keys: Entries to replay now, even if quarantined
+                  (default: every entry whose retry time has come)
+
+        Returns:
+            dict: Retry record
+
+        Raises:
+            SyncInProgressError: Another sync is running
+        """
+        async with self._sync_lock():
+            return await self._retry_dead_letters(keys)
+
+    async def _retry_dead_letters(self, keys: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Retry due dead-lettered pushes (the caller holds the sync lock)"""
+        ops = self.dead_letters.due_ops(keys)
+        sync_id = f"retry-{new_sync_id()}"
+        if not ops:
+            return {"sync_id": sync_id, "retried": 0, "pushed": 0, "failed": 0, "success": True}
+
+        logger.info(f"📬 Retrying {len(ops)} dead-lettered pushes...")
+        with self._running(), tracer.span("dead_letter_retry", sync_id=sync_id, op_count=len(ops)):
+            push_result = await self._push_journaled(sync_id, ops)
+
+        record = {
+            "sync_id": sync_id,
+            "timestamp": datetime.utcnow().isoformat(),
+            "dead_letter_retry": True,
+            "retried": len(ops),
+            "pushed": push_result["pushed_count"],
+            "failed": push_result["failed_count"],
+            "success": push_result["success"]
+        }
+        await self._record_sync(record)
+        log_sync_event("dead_letter_retry", record)
+        await self.save_snapshot()
+        return record
+
+    def _previous_source_tree(self) -> MerkleTree:
+        """
+        Merkle tree of the source snapshot from the previous sync
+
+        Returns:
+            MerkleTree: In-memory tree, or one rebuilt from the local database
+        """
+        if self.source_tree is not None:
+            return self.source_tree
+        return MerkleTree.from_digests(self.db.task_digests())
+
+    def _tombstone_source_deletions(
+        self, previous_tree: MerkleTree, current_tree: MerkleTree, source_ids: Optional[Set[str]] = None
+    ):
+        """
+        Tombstone tasks that were in the previous source snapshot but are gone now
+
+        Args:
+            previous_tree: Merkle tree of the previous source snapshot
+            current_tree: Merkle tree of the current source snapshot
+            source_ids: IDs still at the source, if sync rules narrowed the snapshot
+        """
+        self._tombstone(previous_tree.diff(current_tree)["only_self"], source_ids)
+
+    def _tombstone(self, deleted_ids: List[str], source_ids: Optional[Set[str]] = None):
+        """
+        Drop tasks deleted at the source from the store and tombstone them
+
+        Args:
+            deleted_ids: Tasks missing from the current source snapshot
+            source_ids: IDs still at the source, if sync rules narrowed the
+                        snapshot; tasks that only fell out of scope are kept
+        """
+        if source_ids is not None:
+            deleted_ids = [task_id for task_id in deleted_ids if task_id not in source_ids]
+        if deleted_ids:
+            self.db.delete_tasks(deleted_ids)
+            self.db.add_tombstones(deleted_ids, datetime.utcnow().isoformat())
+            logger.info(f"🪦 Tombstoned {len(deleted_ids)} tasks deleted at the source")
+
+    def _update_local_db(self, tasks: List[Task], current_tree: Optional[MerkleTree] = None):
         """
         Update local database with current tasks
         
         Args:
             tasks: Tasks to store
+            current_tree: Merkle tree of tasks (None: rebuilt from the store when next needed)
         """
-        for task in tasks:
-            self.db.save_task(task)
+        self.db.save_tasks(tasks)
+        self.source_tree = current_tree
+
+        # A task that reappears at the source is no longer deleted
+        tombstones = self.db.get_tombstones()
+        revived = [task.id for task in tasks if task.id in tombstones]
+        if revived:
+            self.db.remove_tombstones(revived)
+
         logger.info(f"💾 Updated local database with {len(tasks)} tasks")
+
+    def _update_local_db_encoded(self, encoded: List[tuple]):
+        """
+        Update local database with tasks encoded by the shards
+
+        Args:
+            encoded: (task ID, content digest, task JSON) per source task
+        """
+        self.db.save_encoded_tasks(encoded)
+        self.source_tree = None
+
+        tombstones = self.db.get_tombstones()
+        revived = [task_id for task_id, _, _ in encoded if task_id in tombstones]
+        if revived:
+            self.db.remove_tombstones(revived)
+
+        logger.info(f"💾 Updated local database with {len(encoded)} tasks")
+
+    async def check_drift(self) -> Dict[str, Any]:
+        """
+        Anti-entropy check of the destination against the local source snapshot
+
+        Reloads only the destination, then descends into the Merkle ranges
+        whose hashes differ. Nothing is pushed.
+
+        Returns:
+            dict: Drift report
+        """
+        logger.info("🔎 Running drift check...")
+
+        source_tree = self._previous_source_tree()
+        with tracer.span("drift_check"):
+            destination_tasks = await self.data_loader.load_destination_tasks()
+        self.dest_tree = MerkleTree.from_mapping(self._key_destination_by_source_id(destination_tasks))
+        diff = source_tree.diff(self.dest_tree)
+
+        tombstones = self.db.get_tombstones()
+        report = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "in_sync": not (diff["only_self"] or diff["only_other"] or diff["differing"]),
+            "missing_in_destination": diff["only_self"],
+            "drifted": diff["differing"],
+            "extra_in_destination": [task_id for task_id in diff["only_other"] if task_id not in tombstones],
+            "tombstoned_in_destination": [task_id for task_id in diff["only_other"] if task_id in tombstones],
+            "ranges_differing": diff["ranges_differing"],
+            "ranges_total": source_tree.leaf_count,
+            "nodes_compared": diff["nodes_compared"]
+        }
+
+        logger.info(
+            f"🔎 Drift check: {len(report['missing_in_destination'])} missing, "
+            f"{len(report['drifted'])} drifted, {len(report['extra_in_destination'])} extra "
+            f"({report['ranges_differing']}/{report['ranges_total']} ranges differ)"
+        )
+        return report
     
+    @asynccontextmanager
+    async def _sync_lock(self) -> AsyncIterator[None]:
+        """
+        Hold the store-wide sync lock for one run
+
+        Syncs, resumes and dead-letter retries all push; two of them at once
+        on the shared store (say a manual sync on one worker while the
+        leader runs the scheduled one) would create the same issues twice.
+        The lock is a lease row in the SQLite file, renewed while the run
+        lasts, so it expires on its own if the worker dies.
+
+        Raises:
+            SyncInProgressError: Another run holds the lock
+        """
+        if self._lock_held:
+            raise SyncInProgressError("A sync is already running in this worker")
+        self._lock_held = True
+        try:
+            if not await asyncio.to_thread(sync_lease.try_acquire):
+                raise SyncInProgressError("A sync is already running in another worker")
+            stop = asyncio.Event()
+            renewal = asyncio.create_task(self._renew_sync_lock(stop))
+            try:
+                yield
+            finally:
+                # Let a renewal in flight finish first, so it cannot re-take the lease
+                stop.set()
+                await renewal
+                await asyncio.to_thread(sync_lease.release)
+        finally:
+            self._lock_held = False
+
+    async def _renew_sync_lock(self, stop: asyncio.Event):
+        """Extend the sync lease every third of its length until the run ends"""
+        while True:
+            try:
+                await asyncio.wait_for(stop.wait(), sync_lease.lease_seconds / 3)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await asyncio.to_thread(sync_lease.try_acquire)
+            except Exception as e:
+                logger.error(f"❌ Renewing the sync lock failed: {str(e)}")
+
+    @contextmanager
+    def _running(self) -> Iterator[None]:
+        self._active_runs += 1
+        try:
+            yield
+        finally:
+            self._active_runs -= 1
+
+    def begin_drain(self):
+        """Stop starting pushes; syncs in progress defer the rest to the next run"""
+        if not self.data_loader.draining:
+            self.data_loader.draining = True
+            logger.info("🛑 Draining: no further pushes will start")
+
+    async def drain(self, timeout: float) -> bool:
+        """
+        Let in-flight syncs wind down before the process exits
+
+        No further push starts; syncs in progress defer what is left to
+        the next run and finish their bookkeeping. Journals of runs still
+        pushing when the timeout is up are forced to disk, so the next
+        start resumes them.
+
+        Args:
+            timeout: Seconds to wait for in-flight runs
+
+        Returns:
+            bool: True if every run finished in time
+        """
+        self.begin_drain()
+        deadline = time.monotonic() + timeout
+        if self._active_runs:
+            logger.info(f"🛑 Waiting up to {timeout:.0f}s for {self._active_runs} in-flight syncs to checkpoint...")
+        while self._active_runs and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+
+        open_runs = self.journal.open_runs()
+        for run in open_runs:
+            run.checkpoint()
+        if self._active_runs:
+            logger.warning(
+                f"⚠️  {self._active_runs} syncs still running at shutdown; "
+                f"{len(open_runs)} journals checkpointed for resume"
+            )
+            return False
+        return True
+
+    def _restore_snapshot(self):
+        """Load the memory store from its snapshot file, if there is one"""
+        start = time.perf_counter()
+        try:
+            snapshot = self.db.load_snapshot(self.snapshot_path)
+        except (OSError, ValueError) as e:
+            logger.error(f"❌ Ignoring unreadable snapshot: {str(e)}")
+            return
+        if snapshot is None:
+            return
+        logger.info(
+            f"🧊 Warm start: restored {len(snapshot.tasks)} tasks and {len(snapshot.id_mappings)} ID mappings "
+            f"from {self.snapshot_path} in {(time.perf_counter() - start) * 1000:.0f}ms"
+        )
+
+    async def save_snapshot(self, force: bool = False):
+        """
+        Write the memory store to its snapshot file
+
+        Contents are captured on the calling thread and written in a worker
+        thread. Without `force`, writes are skipped until
+        SNAPSHOT_INTERVAL_SECONDS have passed since the last one.
+
+        Args:
+            force: Write regardless of the interval (e.g. at shutdown)
+        """
+        if not self.snapshot_path:
+            return
+        if not force and time.monotonic() - self._last_snapshot < settings.SNAPSHOT_INTERVAL_SECONDS:
+            return
+        self._last_snapshot = time.monotonic()
+        writer = self.db.snapshot_writer(self.snapshot_path)
+        try:
+            with tracer.span("snapshot") as span:
+                size = await asyncio.to_thread(writer)
+                span.set(bytes=size)
+            logger.info(f"🧊 Wrote snapshot of {self.db.count()} tasks ({size / 1_000_000:.1f} MB)")
+        except OSError as e:
+            logger.error(f"❌ Failed to write snapshot: {str(e)}")
+
+    async def _record_sync(self, record: Dict[str, Any], completed_sync: bool = False):
+        """Store a sync record and bump the state version behind status/history ETags"""
+        def write():
+            self.db.record_sync(record, completed_sync)
+            self.db.bump_state_version()
+        await self._store_write(write)
+
+    async def _store_write(self, write: Callable[..., Any], *args) -> Any:
+        """
+        Run a store write without holding up the event loop
+
+        SQLite writes can wait up to the busy timeout for another worker's
+        transaction, so they run in a thread; memory store writes never wait.
+        """
+        if self._store_blocks:
+            return await asyncio.to_thread(write, *args)
+        return write(*args)
+
+    def state_version(self) -> str:
+        """
+        Version of the synced state; changes whenever a sync is recorded
+
+        Returns:
+            str: Opaque version token
+        """
+        return self.db.get_state_version()
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Get synchronization statistics
@@ -207,10 +1404,11 @@ class SyncEngine:
         Returns:
             dict: Current statistics
         """
+        counters = self.db.get_sync_counters()
         return {
-            "total_syncs": self.total_syncs,
-            "last_sync_time": self.last_sync_time.isoformat() if self.last_sync_time else None,
-            "tasks_in_db": len(self.db.get_all_tasks())
+            "total_syncs": counters["total_syncs"],
+            "last_sync_time": counters["last_sync_time"],
+            "tasks_in_db": self.db.count()
         }
     
     def get_history(self, limit: int = 10) -> List[Dict[str, Any]]:
@@ -223,4 +1421,56 @@ class SyncEngine:
         Returns:
             list: Recent sync records
         """
-        return list(self.sync_history)[-limit:]
+        return self.db.get_history(limit)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive timestamps as UTC"""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def new_sync_id() -> str:
+    """Short random ID for a sync run"""
+    return uuid.uuid4().hex[:12]
+
+
+# One engine per worker process, built on first use rather than at import
+# so the server can start listening before storage and integrations are set up
+_engine: Optional[SyncEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_sync_engine() -> SyncEngine:
+    """
+    Get this worker's sync engine, creating it on first call
+
+    Construction opens the task store and builds integration clients, so
+    call this from a thread (or use ensure_sync_engine) inside the event loop.
+
+    Returns:
+        SyncEngine: Shared engine
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = SyncEngine()
+                logger.info("⚙️  Sync engine initialized")
+    return _engine
+
+
+async def ensure_sync_engine() -> SyncEngine:
+    """
+    Get the sync engine without blocking the event loop while it is built
+
+    Returns:
+        SyncEngine: Shared engine
+    """
+    if _engine is not None:
+        return _engine
+    return await asyncio.to_thread(get_sync_engine)
+
+
+def sync_engine_ready() -> bool:
+    """Whether the engine has been built yet"""
+    return _engine is not None
@@ -0,0 +1,252 @@
+"""
+Write-ahead progress journal for sync runs
+Records planned push operations and their completion so an interrupted
+sync can resume from the last checkpoint instead of starting over
+"""
+
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import IO, Dict, List, Optional
+
+from app.models.task import Task
+from app.services import fast_json
+from app.services.logger import logger
+
+try:
+    import fcntl  # a live run holds a lock on its journal, so other workers leave it alone
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+def _try_lock(f: IO) -> bool:
+    """Take an exclusive lock on an open journal without waiting"""
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+@dataclass
+class JournalOp:
+    """One planned push operation"""
+    index: int
+    action: str  # "create" or "update"
+    task: Task
+    target: str = "destination"  # or "source" (bidirectional sync)
+    fields: Optional[List[str]] = None  # fields an update writes (None: all)
+
+
+@dataclass
+class InterruptedRun:
+    """A journaled sync run that never committed"""
+    sync_id: str
+    created_at: str
+    ops: List[JournalOp]
+    completed: Dict[int, Optional[str]] = field(default_factory=dict)  # op index -> id on the target side
+    # Journal opened and locked by find_interrupted; resume() keeps writing to it
+    file: Optional[IO] = field(default=None, repr=False, compare=False)
+
+    @property
+    def remaining(self) -> List[JournalOp]:
+        """Operations that have not been confirmed"""
+        return [op for op in self.ops if op.index not in self.completed]
+
+
+class JournalRun:
+    """
+    Open journal for one sync run
+
+    The plan is written and fsynced before the first push. Each completed
+    operation appends one short line; lines are flushed immediately and
+    fsynced every `checkpoint_every` operations. The file stays exclusively
+    locked (flock) until the run commits or closes, so workers sharing the
+    journal directory never resume a run that is still pushing.
+    """
+
+    def __init__(self, path: str, checkpoint_every: int = 20, file: Optional[IO] = None):
+        self.path = path
+        self.checkpoint_every = checkpoint_every
+        if file is None:
+            file = open(path, "a", encoding="utf-8")
+            if not _try_lock(file):
+                file.close()
+                raise RuntimeError(f"Journal {path} is locked by another run")
+        self._file = file
+        self._since_checkpoint = 0
+
+    def _append(self, record: dict, sync: bool = False):
+        self._file.write(fast_json.dumps(record) + "\n")
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+
+    def mark_done(self, index: int, dest_id: Optional[str] = None):
+        """
+        Record that one planned operation completed
+
+        Args:
+            index: Operation index from the plan
+            dest_id: Task ID on the target side (e.g. returned by create_issue)
+        """
+        self._since_checkpoint += 1
+        checkpoint = self._since_checkpoint >= self.checkpoint_every
+        if checkpoint:
+            self._since_checkpoint = 0
+        self._append({"type": "done", "i": index, "dest_id": dest_id}, sync=checkpoint)
+
+    def commit(self):
+        """Mark the run complete and discard its journal"""
+        self._append({"type": "commit"}, sync=True)
+        # Removed while still locked, so no other worker can pick it up in between
+        os.remove(self.path)
+        self._file.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def checkpoint(self):
+        """Force everything recorded so far to disk"""
+        if not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._since_checkpoint = 0
+
+    def close(self):
+        """Close the journal without committing (run stays resumable)"""
+        if not self._file.closed:
+            self.checkpoint()
+            self._file.close()
+
+
+def _same_file(f: IO, path: str) -> bool:
+    """Whether an open journal is still the file at its path (not removed by a commit)"""
+    try:
+        return os.fstat(f.fileno()).st_ino == os.stat(path).st_ino
+    except FileNotFoundError:
+        return False
+
+
+class SyncJournal:
+    """
+    Directory of per-run journal files (one JSON-lines file per sync id)
+    """
+
+    def __init__(self, directory: str, checkpoint_every: int = 20):
+        self.directory = directory
+        self.checkpoint_every = checkpoint_every
+        os.makedirs(directory, exist_ok=True)
+        self._runs: List[JournalRun] = []
+
+    def _open(self, sync_id: str, file: Optional[IO] = None) -> JournalRun:
+        run = JournalRun(self._path(sync_id), self.checkpoint_every, file)
+        self._runs = [other for other in self._runs if not other.closed] + [run]
+        return run
+
+    def open_runs(self) -> List[JournalRun]:
+        """Runs whose journal is still open (neither committed nor closed)"""
+        return [run for run in self._runs if not run.closed]
+
+    def _path(self, sync_id: str) -> str:
+        return os.path.join(self.directory, f"{sync_id}.journal")
+
+    def begin(self, sync_id: str, ops: List[JournalOp]) -> JournalRun:
+        """
+        Write the plan for a sync run
+
+        Args:
+            sync_id: Sync run ID
+            ops: Planned operations
+
+        Returns:
+            JournalRun: Open journal for recording progress
+        """
+        run = self._open(sync_id)
+        run._append({
+            "type": "plan",
+            "sync_id": sync_id,
+            "created_at": datetime.utcnow().isoformat(),
+            "ops": [
+                {
+                    "i": op.index, "action": op.action, "task": op.task.model_dump(mode="json"),
+                    "target": op.target, "fields": op.fields
+                }
+                for op in ops
+            ]
+        }, sync=True)
+        return run
+
+    def resume(self, run: InterruptedRun) -> JournalRun:
+        """
+        Reopen an interrupted run's journal to record further progress
+
+        Args:
+            run: Interrupted run
+
+        Returns:
+            JournalRun: Open journal
+        """
+        return self._open(run.sync_id, run.file)
+
+    def find_interrupted(self) -> List[InterruptedRun]:
+        """
+        Scan for runs whose journal has a plan but no commit
+
+        A torn final line (crash mid-write) is ignored. Journals locked by
+        a live run, in this worker or another, are skipped. Returned runs
+        keep their journal locked; resume() continues with that handle.
+
+        Returns:
+            list: Interrupted runs, oldest first
+        """
+        runs = []
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(".journal"):
+                continue
+            path = os.path.join(self.directory, name)
+            plan = None
+            completed: Dict[int, Optional[str]] = {}
+            committed = False
+
+            try:
+                f = open(path, "a+", encoding="utf-8")
+            except FileNotFoundError:
+                continue  # committed meanwhile
+            if not _try_lock(f) or not _same_file(f, path):
+                # Still being pushed by a live run, or committed while we waited
+                f.close()
+                continue
+            f.seek(0)
+            for line in f:
+                try:
+                    record = fast_json.loads(line)
+                except ValueError:
+                    logger.warning(f"⚠️  Ignoring torn journal line in {name}")
+                    break
+                if record["type"] == "plan":
+                    plan = record
+                elif record["type"] == "done":
+                    completed[record["i"]] = record.get("dest_id")
+                elif record["type"] == "commit":
+                    committed = True
+
+            if committed or plan is None:
+                os.remove(path)
+                f.close()
+                continue
+
+            ops = [
+                JournalOp(
+                    op["i"], op["action"], Task.model_validate(op["task"]),
+                    op.get("target", "destination"), op.get("fields")
+                )
+                for op in plan["ops"]
+            ]
+            runs.append(InterruptedRun(plan["sync_id"], plan["created_at"], ops, completed, f))
+
+        runs.sort(key=lambda run: run.created_at)
+        return runs
@@ -0,0 +1,240 @@
+"""
+On-demand profiling of single sync runs
+Runs one sync or dry-run under a sampling or deterministic profiler and
+stores a collapsed-stack artifact (flamegraph.pl / speedscope ready) keyed
+by sync id
+"""
+
+import cProfile
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.services.logger import logger
+
+PROFILE_MODES = ("sample", "cprofile")
+
+# Leaf frames of threads that are idle rather than working for the sync
+IDLE_LEAVES = {
+    ("selectors.py", "select"),  # event loop waiting for I/O
+    ("thread.py", "_worker"),  # executor thread waiting for work
+    ("threading.py", "wait"),  # watchdogs and samplers parked on an Event
+}
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Wall-clock stack sampler for every thread in the process
+
+    A background thread snapshots all thread stacks every `interval`
+    seconds. The event loop thread and the executor threads that do
+    blocking I/O and conversion are all covered; idle threads are skipped.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples = 0
+        self._stacks: Counter = Counter()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start sampling"""
+        self._thread = threading.Thread(target=self._run, name="sync-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and wait for the sampler thread"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                leaf = frame.f_code
+                if (os.path.basename(leaf.co_filename), leaf.co_name) in IDLE_LEAVES:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                thread_name = re.sub(r"_\d+$", "", names.get(thread_id, "thread"))
+                labels.append(thread_name)
+                self._stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Samples in collapsed-stack format ("frame;frame;frame count" per line)"""
+        return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+
+    def top(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Leaf frames with the most samples"""
+        leaves: Counter = Counter()
+        for stack, count in self._stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        total = sum(leaves.values()) or 1
+        return [
+            {"frame": frame, "samples": count, "percent": round(count * 100 / total, 1)}
+            for frame, count in leaves.most_common(limit)
+        ]
+
+
+class DeterministicProfiler:
+    """
+    cProfile around one run
+
+    Only code on the calling (event loop) thread is traced; work handed to
+    executor threads shows up as time spent awaiting it.
+    """
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+        self.samples = 0
+
+    def start(self):
+        self._profile.enable()
+
+    def stop(self):
+        self._profile.disable()
+        self.samples = pstats.Stats(self._profile).total_calls
+
+    def collapsed(self) -> str:
+        """
+        Caller -> callee edges folded into two-frame stacks, weighted by
+        inline time in microseconds (cProfile keeps no full stacks)
+        """
+        stats = pstats.Stats(self._profile).stats
+        lines = []
+        for (filename, line, name), (_, _, inline, _, callers) in stats.items():
+            callee = f"{name} ({os.path.basename(filename)}:{line})"
+            for (caller_file, caller_line, caller_name), caller_stats in callers.items():
+                weight = int(caller_stats[2] * 1_000_000)
+                if weight:
+                    lines.append(f"{caller_name} ({os.path.basename(caller_file)}:{caller_line});{callee} {weight}")
+            if not callers and int(inline * 1_000_000):
+                lines.append(f"{callee} {int(inline * 1_000_000)}")
+        return "\n".join(lines) + "\n"
+
+    def top(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Functions with the most cumulative time"""
+        stats = pstats.Stats(self._profile).stats
+        ranked = sorted(stats.items(), key=lambda item: -item[1][3])[:limit]
+        return [
+            {
+                "frame": f"{name} ({os.path.basename(filename)}:{line})",
+                "calls": calls,
+                "cumulative_seconds": round(cumulative, 4)
+            }
+            for (filename, line, name), (_, calls, _, cumulative, _) in ranked
+        ]
+
+
+class ProfileStore:
+    """
+    Directory of profile artifacts, one collapsed-stack file per sync id
+
+    Only the newest `keep` profiles are retained.
+    """
+
+    def __init__(self, directory: str, keep: int = 20):
+        self.directory = directory
+        self.keep = keep
+
+    def _path(self, sync_id: str) -> str:
+        if not re.fullmatch(r"[\w-]+", sync_id):
+            raise ValueError(f"Invalid sync id: {sync_id}")
+        return os.path.join(self.directory, f"{sync_id}.collapsed")
+
+    def save(self, sync_id: str, collapsed: str):
+        """Write one artifact and prune old ones"""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(sync_id), "w", encoding="utf-8") as f:
+            f.write(collapsed)
+        for stale in self.list()[self.keep:]:
+            os.remove(self._path(stale["sync_id"]))
+
+    def get(self, sync_id: str) -> Optional[str]:
+        """Collapsed stacks for a sync id, or None"""
+        try:
+            with open(self._path(sync_id), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Stored profiles, newest first"""
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".collapsed"):
+                path = os.path.join(self.directory, name)
+                entries.append({
+                    "sync_id": name[:-len(".collapsed")],
+                    "created_at": os.path.getmtime(path),
+                    "bytes": os.path.getsize(path)
+                })
+        entries.sort(key=lambda entry: -entry["created_at"])
+        return entries
+
+
+class ProfiledRun:
+    """
+    Context manager that profiles one run and stores the artifact
+
+    Usage:
+        with ProfiledRun(store, sync_id, "sample") as run:
+            result = await engine.sync(sync_id=sync_id)
+        result["profile"] = run.summary()
+    """
+
+    def __init__(self, store: ProfileStore, sync_id: str, mode: str = "sample", interval: float = 0.005):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode} (expected one of {', '.join(PROFILE_MODES)})")
+        self.store = store
+        self.sync_id = sync_id
+        self.mode = mode
+        self.profiler = SamplingProfiler(interval) if mode == "sample" else DeterministicProfiler()
+        self.wall_seconds = 0.0
+        self._start = 0.0
+
+    def __enter__(self) -> "ProfiledRun":
+        self._start = time.perf_counter()
+        self.profiler.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.stop()
+        self.wall_seconds = time.perf_counter() - self._start
+        self.store.save(self.sync_id, self.profiler.collapsed())
+        logger.info(f"🔬 Stored {self.mode} profile for {self.sync_id} ({self.wall_seconds:.2f}s)")
+        return False
+
+    def summary(self) -> Dict[str, Any]:
+        """Profile metadata and hottest frames for the API response"""
+        return {
+            "sync_id": self.sync_id,
+            "mode": self.mode,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "samples": self.profiler.samples,
+            "artifact": f"/api/sync/profiles/{self.sync_id}",
+            "top": self.profiler.top()
+        }
+
+
+profile_store = ProfileStore(settings.PROFILE_DIR, settings.PROFILE_KEEP)
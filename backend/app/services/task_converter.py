@@ -0,0 +1,68 @@
+"""
+Worker pool for decoding and converting integration payloads
+Keeps JSON parsing and Task validation off the event-loop thread
+"""
+
+import asyncio
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.services.logger import logger
+
+
+class TaskConverter:
+    """
+    Runs conversion functions inline, in a thread pool or in a process pool
+
+    Modes:
+    - "inline": run on the calling thread (the old behaviour)
+    - "thread": run in a ThreadPoolExecutor; frees the event loop
+    - "process": run in a ProcessPoolExecutor; also sidesteps the GIL
+      (functions and their arguments must be picklable)
+    """
+
+    MODES = ("inline", "thread", "process")
+
+    def __init__(self, mode: str = "thread", max_workers: Optional[int] = None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown conversion pool mode: {mode}")
+        self.mode = mode
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        """Create the pool on first use"""
+        if self._executor is None:
+            if self.mode == "process":
+                # Imported here: multiprocessing is only needed in process mode
+                from concurrent.futures import ProcessPoolExecutor
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="task-convert"
+                )
+            logger.info(f"🧵 Conversion pool started ({self.mode}, {self.max_workers} workers)")
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a conversion function according to the configured mode
+
+        Args:
+            func: Function to call (module-level for process mode)
+            *args: Positional arguments
+
+        Returns:
+            The function's return value
+        """
+        if self.mode == "inline":
+            return func(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), func, *args)
+
+    def shutdown(self):
+        """Stop the worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
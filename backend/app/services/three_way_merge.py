@@ -0,0 +1,107 @@
+"""
+Three-way merge for bidirectional sync
+Compares source, destination and the last-synced base version of a task
+field by field, so each side is sent only what the other side changed
+"""
+
+from datetime import timezone
+from typing import Any, List, Optional
+
+from app.models.task import Task
+
+# Fields merged between the two sides (the ones an issue update writes)
+MERGE_FIELDS = ("title", "description", "status")
+
+CONFLICT_POLICIES = ("source", "destination", "newest")
+
+
+def field_value(task: Task, field: str) -> Any:
+    """Comparable value of a merged field (a missing description is empty)"""
+    value = getattr(task, field)
+    if field == "description":
+        return value or ""
+    return value
+
+
+def fields_equal(first: Task, second: Task) -> bool:
+    """Whether two tasks agree on every merged field"""
+    return all(field_value(first, field) == field_value(second, field) for field in MERGE_FIELDS)
+
+
+class MergeResult:
+    """Outcome of merging one task pair"""
+
+    def __init__(self, merged: Task, to_source: List[str], to_destination: List[str], conflicts: List[str]):
+        self.merged = merged
+        self.to_source = to_source
+        self.to_destination = to_destination
+        self.conflicts = conflicts
+
+
+def _source_wins(policy: str, source: Task, destination: Task) -> bool:
+    """Which side a conflicting field is taken from"""
+    if policy == "destination":
+        return False
+    if policy == "newest":
+        return _utc_timestamp(source) >= _utc_timestamp(destination)
+    return True
+
+
+def _utc_timestamp(task: Task) -> float:
+    updated_at = task.updated_at
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    return updated_at.timestamp()
+
+
+def merge_task(base: Optional[Task], source: Task, destination: Task, policy: str = "source") -> MergeResult:
+    """
+    Merge a task pair against its base version
+
+    For each field: if both sides agree there is nothing to do; if only one
+    side moved away from the base, its value is sent to the other side; if
+    both moved (or there is no base yet) the field is a conflict and the
+    policy picks the winner.
+
+    Args:
+        base: Version both sides held after the last sync (None if unknown)
+        source: Current source task
+        destination: Current destination task
+        policy: "source", "destination" or "newest" (by updated_at)
+
+    Returns:
+        MergeResult: Merged task (keeps the source ID and metadata) and the
+                     fields to write to each side
+    """
+    merged = {}
+    to_source: List[str] = []
+    to_destination: List[str] = []
+    conflicts: List[str] = []
+
+    for field in MERGE_FIELDS:
+        source_value = field_value(source, field)
+        destination_value = field_value(destination, field)
+        if source_value == destination_value:
+            continue
+
+        base_value = field_value(base, field) if base is not None else None
+        if base is not None and destination_value == base_value:
+            take_source = True
+        elif base is not None and source_value == base_value:
+            take_source = False
+        else:
+            conflicts.append(field)
+            take_source = _source_wins(policy, source, destination)
+
+        if take_source:
+            to_destination.append(field)
+        else:
+            to_source.append(field)
+            merged[field] = getattr(destination, field)
+
+    return MergeResult(
+        source.model_copy(update=merged) if merged else source,
+        to_source,
+        to_destination,
+        conflicts
+    )
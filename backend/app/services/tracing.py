@@ -0,0 +1,244 @@
+"""
+In-process tracing for sync runs
+Nested spans (sync -> load -> HTTP page -> convert -> diff -> push) kept in a
+bounded ring buffer and exportable as JSON or OTLP/JSON
+"""
+
+import contextvars
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from app.config import settings
+from app.services import fast_json
+from app.services.logger import logger
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed operation within a trace"""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start_ns", "end_ns", "attributes", "status", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.status = "ok"
+        self.error: Optional[str] = None
+
+    def set(self, **attributes: Any):
+        """Add or overwrite attributes"""
+        self.attributes.update(attributes)
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1_000_000
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "status": self.status,
+            "error": self.error
+        }
+
+
+class _NoopSpan:
+    """Stand-in yielded while tracing is disabled"""
+
+    def set(self, **attributes: Any):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Tracer:
+    """
+    Span factory and ring buffer of finished spans
+
+    The current span travels in a context variable, so nesting follows
+    `await`, asyncio tasks and asyncio.to_thread without passing spans
+    around. Finished spans are appended to a deque; once it is full the
+    oldest spans are dropped.
+    """
+
+    def __init__(self, max_spans: int = 20000, export_dir: Optional[str] = None):
+        self.enabled = max_spans > 0
+        self.export_dir = export_dir
+        self._spans: Deque[Span] = deque(maxlen=max(max_spans, 1))
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """
+        Time a block as a child of the current span (or as a new trace)
+
+        Args:
+            name: Span name (e.g. "http.page", "push")
+            **attributes: Initial attributes
+
+        Yields:
+            Span: The open span (a no-op stand-in when tracing is disabled)
+        """
+        if not self.enabled:
+            yield _NOOP_SPAN
+            return
+        parent = _current_span.get()
+        trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        span = Span(name, trace_id, parent.span_id if parent else None, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.error = str(e) or type(e).__name__
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+            with self._lock:
+                self._spans.append(span)
+            if parent is None and self.export_dir:
+                self._export_file(trace_id)
+
+    def current(self) -> Optional[Span]:
+        """The innermost open span in this context"""
+        return _current_span.get()
+
+    def _trace_spans(self, trace_id: str) -> List[Span]:
+        with self._lock:
+            return [span for span in self._spans if span.trace_id == trace_id]
+
+    def find_trace_id(self, sync_id: str) -> Optional[str]:
+        """
+        Trace ID of the root span tagged with a sync ID
+
+        Args:
+            sync_id: Sync run ID
+
+        Returns:
+            str or None: Trace ID if still in the buffer
+        """
+        with self._lock:
+            for span in reversed(self._spans):
+                if span.parent_id is None and span.attributes.get("sync_id") == sync_id:
+                    return span.trace_id
+        return None
+
+    def recent_traces(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Summaries of the most recent finished traces
+
+        Returns:
+            list: Root span name, sync ID, duration and span count per trace
+        """
+        with self._lock:
+            spans = list(self._spans)
+        counts: Dict[str, int] = {}
+        for span in spans:
+            counts[span.trace_id] = counts.get(span.trace_id, 0) + 1
+        roots = [span for span in reversed(spans) if span.parent_id is None][:limit]
+        return [
+            {
+                "trace_id": root.trace_id,
+                "name": root.name,
+                "sync_id": root.attributes.get("sync_id"),
+                "started_at": root.start_ns / 1e9,
+                "duration_ms": round(root.duration_ms, 3),
+                "status": root.status,
+                "spans": counts[root.trace_id]
+            }
+            for root in roots
+        ]
+
+    def export_json(self, trace_id: str) -> Dict[str, Any]:
+        """
+        Export one trace as plain JSON
+
+        Args:
+            trace_id: Trace ID
+
+        Returns:
+            dict: Trace ID and its spans in start order
+        """
+        spans = sorted(self._trace_spans(trace_id), key=lambda span: span.start_ns)
+        return {"trace_id": trace_id, "spans": [span.to_dict() for span in spans]}
+
+    def export_otlp(self, trace_id: str) -> Dict[str, Any]:
+        """
+        Export one trace in the OTLP/JSON trace format
+
+        The result can be posted to an OTLP/HTTP collector (/v1/traces) or
+        loaded by tools that read OTLP JSON files.
+
+        Args:
+            trace_id: Trace ID
+
+        Returns:
+            dict: ExportTraceServiceRequest-shaped document
+        """
+        spans = []
+        for span in sorted(self._trace_spans(trace_id), key=lambda span: span.start_ns):
+            otlp_span = {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 1,  # SPAN_KIND_INTERNAL
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()],
+                "status": {"code": 2, "message": span.error} if span.status == "error" else {"code": 1}
+            }
+            if span.parent_id:
+                otlp_span["parentSpanId"] = span.parent_id
+            spans.append(otlp_span)
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    {"key": "service.name", "value": {"stringValue": settings.APP_NAME}},
+                    {"key": "service.version", "value": {"stringValue": settings.VERSION}}
+                ]},
+                "scopeSpans": [{"scope": {"name": "app.services.tracing"}, "spans": spans}]
+            }]
+        }
+
+    def _export_file(self, trace_id: str):
+        """Write a finished trace to export_dir as OTLP/JSON"""
+        try:
+            os.makedirs(self.export_dir, exist_ok=True)
+            path = os.path.join(self.export_dir, f"{trace_id}.otlp.json")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(fast_json.dumps(self.export_otlp(trace_id)))
+        except OSError as e:
+            logger.error(f"❌ Failed to export trace {trace_id}: {str(e)}")
+
+
+tracer = Tracer(settings.TRACE_BUFFER_SPANS, settings.TRACE_EXPORT_DIR or None)
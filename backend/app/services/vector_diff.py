@@ -0,0 +1,127 @@
+"""
+Vectorized snapshot diff (optional, needs NumPy)
+Reduces both sides of a sync to arrays of id-hashes and content-hashes and
+classifies tasks with sorted-array set operations instead of a per-task loop
+"""
+
+from typing import List, Optional, Sequence
+
+from app.models.task import Task
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+AVAILABLE = np is not None
+
+
+def id_hashes(ids: Sequence[str]) -> "np.ndarray":
+    """
+    Hash task IDs into an int64 array
+
+    Uses Python's string hash (cached on each string), so the values are
+    only comparable within one process, which is all a single diff needs.
+
+    Args:
+        ids: Task IDs
+
+    Returns:
+        ndarray: One hash per ID, in input order
+    """
+    return np.fromiter(map(hash, ids), dtype=np.int64, count=len(ids))
+
+
+def content_hashes(tasks: Sequence[Task]) -> "np.ndarray":
+    """
+    Hash the synced content of tasks (same fields as merkle.task_digest)
+
+    Args:
+        tasks: Tasks
+
+    Returns:
+        ndarray: One int64 hash per task, in input order
+    """
+    return np.fromiter(
+        (hash((task.title, task.description or "", task.status, task.priority)) for task in tasks),
+        dtype=np.int64,
+        count=len(tasks)
+    )
+
+
+class SnapshotDiff:
+    """Result of diff(): index arrays into the source and destination lists"""
+
+    def __init__(self, only_source, only_dest, changed, unchanged):
+        self.only_source = only_source
+        self.only_dest = only_dest
+        self.changed = changed
+        self.unchanged = unchanged
+
+
+def _sorted(hashes: "np.ndarray"):
+    order = np.argsort(hashes, kind="stable")
+    return order, hashes[order]
+
+
+def diff(
+    source_ids: "np.ndarray",
+    source_content: "np.ndarray",
+    dest_ids: "np.ndarray",
+    dest_content: "np.ndarray"
+) -> Optional[SnapshotDiff]:
+    """
+    Classify source and destination entries by ID and content hash
+
+    Args:
+        source_ids: Source ID hashes
+        source_content: Source content hashes (aligned with source_ids)
+        dest_ids: Destination ID hashes (keyed by source ID)
+        dest_content: Destination content hashes (aligned with dest_ids)
+
+    Returns:
+        SnapshotDiff with sorted index arrays, or None if two different IDs
+        hashed alike on one side (the caller should fall back to an exact diff)
+    """
+    source_order, source_sorted = _sorted(source_ids)
+    dest_order, dest_sorted = _sorted(dest_ids)
+    if np.any(source_sorted[1:] == source_sorted[:-1]) or np.any(dest_sorted[1:] == dest_sorted[:-1]):
+        return None
+
+    if len(dest_sorted):
+        position = np.minimum(np.searchsorted(dest_sorted, source_sorted), len(dest_sorted) - 1)
+        in_dest = dest_sorted[position] == source_sorted
+    else:
+        position = np.zeros(len(source_sorted), dtype=np.intp)
+        in_dest = np.zeros(len(source_sorted), dtype=bool)
+
+    matched_source = source_order[in_dest]
+    matched_dest = dest_order[position[in_dest]]
+    same = source_content[matched_source] == dest_content[matched_dest]
+
+    dest_matched = np.zeros(len(dest_ids), dtype=bool)
+    dest_matched[matched_dest] = True
+
+    return SnapshotDiff(
+        only_source=np.sort(source_order[~in_dest]),
+        only_dest=np.flatnonzero(~dest_matched),
+        changed=np.sort(matched_source[~same]),
+        unchanged=np.sort(matched_source[same])
+    )
+
+
+def missing_ids(previous_ids: Sequence[str], current_ids: Sequence[str]) -> List[str]:
+    """
+    IDs present in a previous snapshot but not in the current one
+
+    Args:
+        previous_ids: IDs of the previous snapshot
+        current_ids: IDs of the current snapshot
+
+    Returns:
+        list: Missing IDs, in previous-snapshot order
+    """
+    if not previous_ids:
+        return []
+    gone = ~np.isin(id_hashes(previous_ids), id_hashes(current_ids))
+    return [previous_ids[i] for i in np.flatnonzero(gone).tolist()]
@@ -0,0 +1,4 @@
+"""
+Benchmarks for Task Sync Engine
+Run from the backend directory, e.g. python -m benchmarks.bench_convert
+"""
@@ -0,0 +1,91 @@
+"""
+Benchmark: inline vs pooled decoding and Task conversion of issue pages
+
+Measures total conversion time and the worst event-loop stall while a
+batch of synthetic GitHub issue pages is decoded and converted.
+
+Usage (from backend/):
+    python -m benchmarks.bench_convert --issues 20000 --workers 4
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import List
+
+from app.integrations.github_integration import decode_issue_page
+from app.services import fast_json
+from app.services.task_converter import TaskConverter
+
+
+def make_pages(issue_count: int, per_page: int = 100) -> List[bytes]:
+    """Build raw JSON pages that look like GitHub's issues API"""
+    issues = []
+    for number in range(1, issue_count + 1):
+        issue = {
+            "number": number,
+            "title": f"Issue {number}",
+            "body": "Lorem ipsum dolor sit amet. " * 20,
+            "state": "open" if number % 3 else "closed",
+            "html_url": f"https://github.com/acme/widgets/issues/{number}",
+            "created_at": "2026-01-01T10:00:00Z",
+            "updated_at": "2026-01-02T10:00:00Z",
+            "labels": [{"name": "bug"}, {"name": "priority: high" if number % 5 == 0 else "triage"}],
+        }
+        if number % 10 == 0:
+            issue["pull_request"] = {"url": "..."}
+        issues.append(issue)
+    return [
+        json.dumps(issues[i:i + per_page]).encode("utf-8")
+        for i in range(0, len(issues), per_page)
+    ]
+
+
+async def run_mode(mode: str, pages: List[bytes], workers: int) -> dict:
+    """Convert every page with one pool mode while sampling event-loop lag"""
+    converter = TaskConverter(mode, workers)
+    max_lag = 0.0
+    running = True
+
+    async def ticker():
+        nonlocal max_lag
+        interval = 0.001
+        while running:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            max_lag = max(max_lag, time.perf_counter() - start - interval)
+
+    tick_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    futures = [asyncio.ensure_future(converter.run(decode_issue_page, raw)) for raw in pages]
+    count = 0
+    for future in asyncio.as_completed(futures):
+        count += len(await future)
+    elapsed = time.perf_counter() - start
+
+    running = False
+    await tick_task
+    converter.shutdown()
+    return {"mode": mode, "tasks": count, "seconds": elapsed, "max_loop_stall_ms": max_lag * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--issues", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--modes", default="inline,thread,process")
+    args = parser.parse_args()
+
+    pages = make_pages(args.issues)
+    print(f"{len(pages)} pages, {args.issues} issues, JSON backend: {fast_json.BACKEND}")
+    print(f"{'mode':<8} {'tasks':>7} {'total s':>9} {'max stall ms':>13}")
+    for mode in args.modes.split(","):
+        result = asyncio.run(run_mode(mode, pages, args.workers))
+        print(f"{result['mode']:<8} {result['tasks']:>7} {result['seconds']:>9.3f} {result['max_loop_stall_ms']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
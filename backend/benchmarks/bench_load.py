@@ -0,0 +1,196 @@
+"""
+Load test: the API under dashboard traffic while syncs run, against a fake GitHub
+
+Starts benchmarks/fake_github.py (latency, page count, rate limits, error
+injection and churn as configured) and the app on top of it (GitHub to
+GitHub, SQLite store, temporary paths), then drives mixed traffic:
+
+- `--concurrency` dashboard clients cycling through sync status, sync
+  history and config reads (settings, integrations, sync rules)
+- `--sync-clients` clients triggering POST /api/sync back to back (or
+  `--sync-pause` seconds apart)
+
+Reports throughput and latency percentiles per endpoint, the error mix
+and what reached the fake GitHub. With --max-p99-ms / --min-rps it exits
+non-zero when dashboard reads miss the target, so a capacity regression
+fails a CI job instead of reaching production.
+
+Usage (from backend/):
+    python -m benchmarks.bench_load --duration 30 --concurrency 32 --issues 2000 --latency-ms 40 --jitter-ms 20
+    python -m benchmarks.bench_load --error-rate 0.05 --churn-per-second 5
+    python -m benchmarks.bench_load --launcher dev --max-p99-ms 250 --min-rps 200
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from collections import Counter
+
+from benchmarks.bench_serving import (
+    BACKEND_DIR, LAUNCHERS, free_port, print_table, run_load, start_server, stop_server, summarize
+)
+from benchmarks.fake_github import FAKE_OPTIONS, add_fake_options
+
+SOURCE_REPO = "load/source"
+DEST_REPO = "load/destination"
+
+DASHBOARD_PATHS = [
+    "GET /api/sync/status",
+    "GET /api/sync/history",
+    "GET /api/settings",
+    "GET /api/integrations",
+    "GET /api/sync-rules",
+]
+SYNC_PATHS = ["POST /api/sync"]
+
+
+def start_fake_github(args: argparse.Namespace, port: int, timeout: float = 15.0) -> subprocess.Popen:
+    """Start the fake GitHub API and wait until it answers"""
+    command = [sys.executable, "-m", "benchmarks.fake_github", "--port", str(port)]
+    for repo in (SOURCE_REPO, DEST_REPO):
+        command += ["--repo", repo]
+    for name in FAKE_OPTIONS:
+        command += [f"--{name.replace('_', '-')}", str(getattr(args, name))]
+    fake = subprocess.Popen(command, cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            fake_stats(port)
+            return fake
+        except OSError:
+            time.sleep(0.05)
+    stop_server(fake)
+    raise TimeoutError("fake GitHub did not start")
+
+
+def fake_stats(port: int) -> dict:
+    """Request counters of the fake GitHub API"""
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/_fake/stats", timeout=2) as response:
+        return json.loads(response.read())
+
+
+def mixed_load(port: int, args: argparse.Namespace, duration: float) -> dict:
+    """Dashboard and sync clients side by side; one run_load result per group"""
+    results = {}
+
+    def run(group, paths, concurrency, pause):
+        results[group] = run_load(port, paths, concurrency, duration, pause=pause)
+
+    threads = [threading.Thread(target=run, args=("dashboard", DASHBOARD_PATHS, args.concurrency, args.dashboard_pause))]
+    if args.sync_clients:
+        threads.append(threading.Thread(target=run, args=("sync", SYNC_PATHS, args.sync_clients, args.sync_pause)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="seconds of unmeasured load first")
+    parser.add_argument("--concurrency", type=int, default=32, help="dashboard clients")
+    parser.add_argument("--dashboard-pause", type=float, default=0.0, help="seconds between a dashboard client's requests")
+    parser.add_argument("--sync-clients", type=int, default=1, help="clients triggering syncs (0 = reads only)")
+    parser.add_argument("--sync-pause", type=float, default=0.0, help="seconds between a sync client's syncs")
+    parser.add_argument("--launcher", choices=sorted(LAUNCHERS), default="production")
+    parser.add_argument("--workers", type=int, default=0, help="WORKERS for the production launcher (0 = per CPU)")
+    parser.add_argument("--tokens", type=int, default=1, help="GitHub tokens in the credential pool")
+    parser.add_argument("--max-p99-ms", type=float, default=0.0, help="fail if dashboard p99 is above this")
+    parser.add_argument("--min-rps", type=float, default=0.0, help="fail if dashboard throughput is below this")
+    parser.add_argument("--json", help="also write the results to this file")
+    add_fake_options(parser)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fake_port, app_port = free_port(), free_port()
+        env = {
+            **os.environ,
+            "DEBUG": "True",
+            "DB_BACKEND": "sqlite",
+            "DATABASE_PATH": os.path.join(tmp, "load.db"),
+            "JOURNAL_DIR": os.path.join(tmp, "journal"),
+            "CHANGE_LOG_DIR": os.path.join(tmp, "change_log"),
+            "SNAPSHOT_PATH": "",
+            "WORKERS": str(args.workers),
+            "AUTO_SYNC_ENABLED": "false",
+            "SOURCE_TYPE": "github",
+            "DEST_TYPE": "github",
+            "GITHUB_API_URL": f"http://127.0.0.1:{fake_port}",
+            "GITHUB_TOKEN": "load-test-1",
+            "GITHUB_TOKENS": ",".join(f"load-test-{number}" for number in range(2, args.tokens + 1)),
+            "GITHUB_SOURCE_REPO": SOURCE_REPO,
+            "GITHUB_DEST_REPO": DEST_REPO,
+        }
+        fake = start_fake_github(args, fake_port)
+        try:
+            server = start_server(LAUNCHERS[args.launcher], env, app_port)
+            try:
+                if args.warmup:
+                    mixed_load(app_port, args, args.warmup)
+                upstream_before = fake_stats(fake_port)
+                results = mixed_load(app_port, args, args.duration)
+                upstream_after = fake_stats(fake_port)
+            finally:
+                stop_server(server)
+        finally:
+            stop_server(fake)
+
+    rows = {}
+    for group, paths in (("dashboard", DASHBOARD_PATHS), ("sync", SYNC_PATHS)):
+        if group not in results:
+            continue
+        for path in paths:
+            rows[path] = summarize(results[group], [path])
+        rows[f"all {group}"] = summarize(results[group])
+
+    pages = -(-args.issues // min(args.page_size, 100))
+    print(
+        f"Fake GitHub: {args.issues} issues x 2 repos ({pages} pages per listing), "
+        f"{args.latency_ms:.0f}+{args.jitter_ms:.0f}ms latency, {args.error_rate:.0%} errors, "
+        f"{args.rate_limit} requests/token/{args.rate_window:.0f}s, {args.churn_per_second:g} edits/s"
+    )
+    print(
+        f"{args.concurrency} dashboard + {args.sync_clients} sync clients, {args.duration:.0f}s, "
+        f"{args.launcher} launcher, {os.cpu_count()} CPUs"
+    )
+    print_table(rows, heading="endpoint")
+
+    errors = Counter(error for result in results.values() for error in result["errors"])
+    for error, count in errors.most_common(5):
+        print(f"  {count:>6} x {error}")
+
+    upstream = {
+        "requests": upstream_after["total_requests"] - upstream_before["total_requests"],
+        "injected_errors": upstream_after["injected_errors"] - upstream_before["injected_errors"],
+        "rate_limited": upstream_after["rate_limited"] - upstream_before["rate_limited"],
+    }
+    print(
+        f"GitHub calls: {upstream['requests']} ({upstream['requests'] / args.duration:.0f}/s), "
+        f"{upstream['injected_errors']} injected errors, {upstream['rate_limited']} rate-limited"
+    )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"options": vars(args), "endpoints": rows, "errors": dict(errors), "upstream": upstream}, f, indent=2)
+
+    dashboard = rows["all dashboard"]
+    failures = []
+    if args.max_p99_ms and dashboard["p99"] > args.max_p99_ms:
+        failures.append(f"dashboard p99 {dashboard['p99']:.1f}ms > {args.max_p99_ms:.1f}ms")
+    if args.min_rps and dashboard["rps"] < args.min_rps:
+        failures.append(f"dashboard throughput {dashboard['rps']:.1f} req/s < {args.min_rps:.1f} req/s")
+    if failures:
+        print("FAIL: " + "; ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: compiled SyncRule transform vs naive per-task interpretation
+
+Applies a rule with filters and the Jira -> GitHub field-mapping template
+to a batch of synthetic tasks and reports per-task overhead.
+
+Usage (from backend/):
+    python -m benchmarks.bench_rules --tasks 100000
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from app.models.task import Task
+from app.services.rule_compiler import FIELD_ALIASES, TASK_FIELDS, CompiledRule
+
+RULE = {
+    "id": "bench",
+    "filters": {"state": "open", "labels": ["bug"], "priority": ["high", "medium"]},
+    "field_mappings": {
+        "summary": "title",
+        "description": "body",
+        "status": "state",
+        "priority": "labels",
+        "assignee": "assignees",
+    },
+}
+
+
+def make_tasks(count: int) -> List[Task]:
+    """Synthetic tasks with a mix of statuses, priorities and labels"""
+    base = datetime(2026, 1, 1)
+    statuses = ["todo", "in_progress", "done", "blocked"]
+    priorities = ["low", "medium", "high", "urgent"]
+    return [
+        Task(
+            id=f"task-{i}",
+            title=f"Task {i}",
+            description="Body text",
+            status=statuses[i % 4],
+            priority=priorities[(i // 4) % 4],
+            updated_at=base + timedelta(minutes=i),
+            metadata={"labels": ["bug"] if i % 3 else ["feature"]},
+        )
+        for i in range(count)
+    ]
+
+
+def naive_apply(rule: Dict[str, Any], tasks: List[Task]) -> List[Task]:
+    """Interpret filters and mappings from the rule dict for every task and field"""
+    out = []
+    for task in tasks:
+        filters = rule["filters"]
+        if filters.get("state") == "open" and task.status == "done":
+            continue
+        labels = [label.lower() for label in task.tags + task.metadata.get("labels", [])]
+        if any(label.lower() not in labels for label in filters.get("labels", [])):
+            continue
+        if filters.get("priority") and task.priority not in filters["priority"]:
+            continue
+        for source_field, dest_field in rule["field_mappings"].items():
+            source = FIELD_ALIASES.get(source_field, source_field)
+            dest = FIELD_ALIASES.get(dest_field, dest_field)
+            if source == dest:
+                continue
+            value = getattr(task, source) if source in TASK_FIELDS else task.metadata.get(source)
+            if dest == "tags":
+                task = task.model_copy(update={"tags": task.tags + [str(value)]})
+            else:
+                task = task.model_copy(update={dest: value})
+        out.append(task)
+    return out
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=100000)
+    args = parser.parse_args()
+
+    # Compiled mappings update tasks in place, so each run gets a fresh batch
+    compiled, compile_seconds = timed(CompiledRule, RULE)
+    compiled_out, compiled_seconds = timed(compiled.transform, make_tasks(args.tasks))
+    naive_out, naive_seconds = timed(naive_apply, RULE, make_tasks(args.tasks))
+    assert len(compiled_out) == len(naive_out)
+
+    print(f"{args.tasks} tasks, {len(compiled_out)} selected")
+    print(f"compile once:      {compile_seconds * 1e3:8.3f} ms")
+    print(f"compiled transform: {compiled_seconds:7.3f} s  ({compiled_seconds / args.tasks * 1e6:6.2f} us/task)")
+    print(f"naive interpreter:  {naive_seconds:7.3f} s  ({naive_seconds / args.tasks * 1e6:6.2f} us/task)")
+
+
+if __name__ == "__main__":
+    main()
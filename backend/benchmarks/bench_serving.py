@@ -0,0 +1,251 @@
+"""
+Benchmark: API throughput and latency of the development vs production launcher
+
+Starts the server twice, each time in a fresh process on a free port:
+- dev: `python run.py` (DEBUG=True, i.e. the reloader)
+- production: `python run.py --production`
+
+and drives both with the same closed-loop load: `--concurrency` keep-alive
+clients, each sending its next request as soon as the previous answer
+arrives, spread over the read endpoints dashboards poll (/api/health,
+/api/sync/status, /api/sync/history). Reports requests per second and
+latency percentiles per launcher.
+
+The client runs on the same machine, so on few CPUs it competes with the
+server; compare launchers within one run rather than across machines.
+Storage and journal paths point at a temporary directory so the run
+leaves nothing behind.
+
+Usage (from backend/):
+    python -m benchmarks.bench_serving --duration 10 --concurrency 32
+    python -m benchmarks.bench_serving --launchers production --workers 4
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LAUNCHERS = {
+    "dev": [sys.executable, "run.py"],
+    "production": [sys.executable, "run.py", "--production"],
+}
+
+READ_PATHS = ["/api/health", "/api/sync/status", "/api/sync/history"]
+
+
+def free_port() -> int:
+    """Pick an unused local TCP port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(command: Sequence[str], env: dict, port: int, timeout: float = 30.0) -> subprocess.Popen:
+    """
+    Start a server process and wait until its engine is ready
+
+    Args:
+        command: Command line (run from backend/)
+        env: Environment (HOST and PORT are set here)
+        port: Port to listen on
+        timeout: Seconds to wait for readiness
+
+    Returns:
+        subprocess.Popen: Running server
+    """
+    server = subprocess.Popen(
+        list(command), cwd=BACKEND_DIR, env={**env, "HOST": "127.0.0.1", "PORT": str(port)},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"server exited with code {server.returncode}: {' '.join(command)}")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/api/health")
+            body = json.loads(connection.getresponse().read())
+            connection.close()
+            if body.get("engine_ready"):
+                return server
+        except (OSError, ValueError, http.client.HTTPException):
+            pass
+        time.sleep(0.05)
+    stop_server(server)
+    raise TimeoutError(f"server did not become ready: {' '.join(command)}")
+
+
+def stop_server(server: subprocess.Popen, timeout: float = 30.0):
+    """Stop a server the way a process manager does (SIGTERM, then SIGKILL)"""
+    server.terminate()
+    try:
+        server.wait(timeout)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+def run_load(
+    port: int,
+    paths: Sequence[str],
+    concurrency: int,
+    duration: float,
+    method: str = "GET",
+    body_for: Optional[Dict[str, bytes]] = None,
+    pause: float = 0.0
+) -> Dict[str, object]:
+    """
+    Closed-loop load: each client sends its next request once the last one is answered
+
+    Every client keeps one connection open and cycles through `paths`
+    (starting at a different one), reconnecting if the server closes it.
+
+    Args:
+        port: Server port on 127.0.0.1
+        paths: Request paths ("METHOD /path" entries override `method`)
+        concurrency: Number of clients
+        duration: Seconds to run
+        method: Default HTTP method
+        body_for: Request body per path entry (sent as JSON)
+        pause: Seconds each client waits between requests
+
+    Returns:
+        dict: seconds, latencies (per path entry, in seconds) and errors
+    """
+    latencies: Dict[str, List[float]] = {path: [] for path in paths}
+    errors: List[str] = []
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client(offset: int):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        samples: Dict[str, List[float]] = {path: [] for path in paths}
+        failed: List[str] = []
+        for entry in itertools.islice(itertools.cycle(paths), offset, None):
+            if time.monotonic() >= stop_at:
+                break
+            verb, _, path = entry.partition(" ") if " " in entry else (method, "", entry)
+            body = (body_for or {}).get(entry)
+            headers = {"Content-Type": "application/json"} if body is not None else {}
+            start = time.perf_counter()
+            try:
+                connection.request(verb, path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException) as e:
+                failed.append(f"{entry}: {type(e).__name__}")
+                connection.close()
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                continue
+            if response.status >= 400:
+                failed.append(f"{entry}: HTTP {response.status}")
+            else:
+                samples[entry].append(time.perf_counter() - start)
+            if pause:
+                time.sleep(pause)
+        connection.close()
+        with lock:
+            for entry, values in samples.items():
+                latencies[entry].extend(values)
+            errors.extend(failed)
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {"seconds": time.monotonic() - start, "latencies": latencies, "errors": errors}
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of unsorted samples (0 if there are none)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(result: Dict[str, object], paths: Optional[Sequence[str]] = None) -> Dict[str, float]:
+    """
+    Throughput and latency percentiles (milliseconds)
+
+    Args:
+        result: From run_load
+        paths: Path entries to include (default: all)
+
+    Returns:
+        dict: requests, errors, rps, p50, p95, p99 and mean
+    """
+    paths = list(result["latencies"]) if paths is None else paths
+    values = [value for path in paths for value in result["latencies"][path]]
+    return {
+        "requests": len(values),
+        "errors": sum(1 for error in result["errors"] if error.split(": ", 1)[0] in paths),
+        "rps": len(values) / result["seconds"],
+        "p50": percentile(values, 0.50) * 1000,
+        "p95": percentile(values, 0.95) * 1000,
+        "p99": percentile(values, 0.99) * 1000,
+        "mean": statistics.fmean(values) * 1000 if values else 0.0,
+    }
+
+
+def print_table(rows: Dict[str, Dict[str, float]], heading: str = "launcher"):
+    """One line per label: throughput, errors and latency percentiles"""
+    width = max([14] + [len(label) + 2 for label in rows])
+    print(f"{heading:<{width}}{'req/s':>9}{'errors':>8}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for label, row in rows.items():
+        print(
+            f"{label:<{width}}{row['rps']:>9.1f}{row['errors']:>8}"
+            f"{row['p50']:>7.1f}ms{row['p95']:>7.1f}ms{row['p99']:>7.1f}ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load per launcher")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds of unmeasured load first")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=0, help="WORKERS for the production launcher (0 = per CPU)")
+    parser.add_argument("--launchers", nargs="+", choices=sorted(LAUNCHERS), default=["dev", "production"])
+    args = parser.parse_args()
+
+    rows = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DEBUG": "True",
+            "DB_BACKEND": "sqlite",
+            "DATABASE_PATH": os.path.join(tmp, "bench.db"),
+            "JOURNAL_DIR": os.path.join(tmp, "journal"),
+            "CHANGE_LOG_DIR": os.path.join(tmp, "change_log"),
+            "WORKERS": str(args.workers),
+            "AUTO_SYNC_ENABLED": "false",
+        }
+        for launcher in args.launchers:
+            port = free_port()
+            server = start_server(LAUNCHERS[launcher], env, port)
+            try:
+                run_load(port, READ_PATHS, args.concurrency, args.warmup)
+                rows[launcher] = summarize(run_load(port, READ_PATHS, args.concurrency, args.duration))
+            finally:
+                stop_server(server)
+
+    print(f"{args.concurrency} clients, {args.duration:.0f}s per launcher, {os.cpu_count()} CPUs")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
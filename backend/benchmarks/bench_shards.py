@@ -0,0 +1,101 @@
+"""
+Benchmark: in-process vs sharded sync planning
+
+Feeds synthetic issues-API pages for a source repository and a destination
+that mostly mirrors it (a small share of issues edited or missing) through
+the shard planner: once in this process with a single shard, then through
+ShardCoordinator with a process pool. Both runs must find the same changes.
+
+Usage (from backend/):
+    python -m benchmarks.bench_shards --issues 200000 --shards 4
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import List
+
+from app.services.sharded_sync import ShardCoordinator, plan_shard, route_issue_pages
+
+
+def make_pages(issue_count: int, edited_every: int = 0, skip_every: int = 0, per_page: int = 100) -> List[bytes]:
+    """Build raw JSON pages that look like GitHub's issues API"""
+    issues = []
+    for number in range(1, issue_count + 1):
+        if skip_every and number % skip_every == 1:
+            continue
+        edited = edited_every and number % edited_every == 0
+        issues.append({
+            "number": number,
+            "title": f"Issue {number}" + (" (edited)" if edited else ""),
+            "body": "Lorem ipsum dolor sit amet. " * 20,
+            "state": "open" if number % 3 else "closed",
+            "html_url": f"https://github.com/acme/widgets/issues/{number}",
+            "created_at": "2026-01-01T10:00:00Z",
+            "updated_at": "2026-01-02T10:00:00Z",
+            "labels": [{"name": "bug"}, {"name": "priority: high" if number % 5 == 0 else "triage"}],
+        })
+    return [
+        json.dumps(issues[i:i + per_page]).encode("utf-8")
+        for i in range(0, len(issues), per_page)
+    ]
+
+
+class PageSource:
+    """Stands in for a GitHubIntegration that already has its pages"""
+
+    def __init__(self, pages: List[bytes]):
+        self.pages = pages
+
+    def fetch_issue_pages(self, state: str = "all"):
+        return iter(self.pages)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--issues", type=int, default=200000)
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--changed", type=float, default=0.01, help="share of issues edited (and as many missing)")
+    args = parser.parse_args()
+
+    step = max(1, int(1 / args.changed)) if args.changed else 0
+    source_pages = make_pages(args.issues)
+    destination_pages = make_pages(args.issues, edited_every=step, skip_every=step)
+
+    def in_process():
+        (source_json,), _ = route_issue_pages(source_pages, 1)
+        (destination_json,), _ = route_issue_pages(destination_pages, 1)
+        return plan_shard(source_json, destination_json)
+
+    single, single_time = timed(in_process)
+
+    coordinator = ShardCoordinator(args.shards)
+    source, destination = PageSource(source_pages), PageSource(destination_pages)
+    # Warm-up run starts the worker processes, which a server pays only once
+    asyncio.run(coordinator.plan(source, destination, {}))
+    sharded, sharded_time = timed(lambda: asyncio.run(coordinator.plan(source, destination, {})))
+    coordinator._executor.shutdown()
+
+    for key in ("to_add", "to_update"):
+        assert {task.id for task in single[key]} == {task.id for task in getattr(sharded, key)}, key
+    assert single["unchanged"] == sharded.unchanged
+
+    print(
+        f"{single['source_count']} source issues: {len(single['to_add'])} to add, "
+        f"{len(single['to_update'])} to update, {single['unchanged']} unchanged"
+    )
+    print(f"{'planning':<24}{'time':>10}")
+    print(f"{'in-process (1 shard)':<24}{single_time * 1000:>8.0f}ms")
+    print(f"{f'{args.shards} shard processes':<24}{sharded_time * 1000:>8.0f}ms")
+    print(f"{'speedup':<24}{single_time / sharded_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
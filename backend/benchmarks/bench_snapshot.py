@@ -0,0 +1,94 @@
+"""
+Benchmark: warm-start snapshot write and load
+
+Fills a MemoryDB with synthetic GitHub-like tasks, ID mappings and
+tombstones, writes a snapshot, then measures in a fresh store:
+- load (mmap + record index, what boot waits for)
+- first Merkle tree build from the stored digests
+- decoding every task (happens lazily at the first incremental sync)
+
+Usage (from backend/):
+    python -m benchmarks.bench_snapshot --tasks 100000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from app.db.memory_db import MemoryDB
+from app.models.task import Task
+from app.services.merkle import MerkleTree
+
+
+def fill(db: MemoryDB, task_count: int):
+    """Populate a store the way a synced GitHub repository looks"""
+    base = datetime(2026, 1, 1)
+    db.save_tasks([
+        Task(
+            id=f"github-{number}",
+            title=f"Issue {number}",
+            description="Lorem ipsum dolor sit amet. " * 10,
+            status="todo" if number % 3 else "done",
+            priority="high" if number % 5 == 0 else "medium",
+            tags=["bug"],
+            created_at=base,
+            updated_at=base + timedelta(minutes=number),
+            metadata={
+                "source": "github",
+                "github_number": number,
+                "github_url": f"https://github.com/acme/widgets/issues/{number}",
+                "labels": ["bug"]
+            }
+        )
+        for number in range(1, task_count + 1)
+    ])
+    db.save_id_mappings({f"github-{number}": f"github-{number + task_count}" for number in range(1, task_count + 1)})
+    db.add_tombstones([f"github-{task_count + number}" for number in range(1, task_count // 100 + 1)], base.isoformat())
+    db.set_high_water_marks({"source": "2026-03-01T00:00:00Z"})
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=100000)
+    args = parser.parse_args()
+
+    source = MemoryDB()
+    fill(source, args.tasks)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.snapshot")
+        size, write_time = timed(source.snapshot_writer(path))
+
+        restored = MemoryDB()
+        _, load_time = timed(lambda: restored.load_snapshot(path))
+        _, tree_time = timed(lambda: MerkleTree.from_digests(restored.task_digests()))
+        tasks, decode_time = timed(restored.get_all_tasks)
+        assert len(tasks) == args.tasks
+
+        rewritten = os.path.join(tmp, "rewrite.snapshot")
+        lazy = MemoryDB()
+        lazy.load_snapshot(path)
+        _, rewrite_time = timed(lazy.snapshot_writer(rewritten))
+
+    print(f"{args.tasks} tasks, snapshot {size / 1_000_000:.1f} MB")
+    print(f"{'step':<34}{'time':>10}")
+    for label, seconds in (
+        ("write (all decoded)", write_time),
+        ("load on boot (mmap + index)", load_time),
+        ("Merkle tree from digests", tree_time),
+        ("decode every task", decode_time),
+        ("rewrite (still encoded)", rewrite_time),
+    ):
+        print(f"{label:<34}{seconds * 1000:>8.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: import time and cold start of the API server
+
+Measures, each in a fresh interpreter:
+- time to `import app.main`
+- time from spawning uvicorn until /api/health answers
+- time until the sync engine reports ready (engine_ready in /api/health)
+
+Storage and journal paths point at a temporary directory so the run
+leaves nothing behind.
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup --runs 5
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+
+def free_port() -> int:
+    """Pick an unused local TCP port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def bench_import(env: dict) -> float:
+    """Seconds for a fresh interpreter to import app.main"""
+    code = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+    output = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def bench_cold_start(env: dict, timeout: float = 30.0) -> tuple:
+    """Seconds until /api/health answers and until the engine is ready"""
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/api/health"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    first_health = None
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    body = json.loads(response.read())
+            except OSError:
+                time.sleep(0.005)
+                continue
+            if first_health is None:
+                first_health = time.perf_counter() - start
+            if body.get("engine_ready"):
+                return first_health, time.perf_counter() - start
+            time.sleep(0.005)
+        raise TimeoutError("server did not become ready")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DATABASE_PATH": os.path.join(tmp, "bench.db"),
+            "JOURNAL_DIR": os.path.join(tmp, "journal"),
+            "AUTO_SYNC_ENABLED": "false",
+        }
+        imports = [bench_import(env) for _ in range(args.runs)]
+        starts = [bench_cold_start(env) for _ in range(args.runs)]
+
+    print(f"{'metric':<28}{'median':>10}{'max':>10}")
+    for label, values in (
+        ("import app.main", imports),
+        ("first /api/health", [first for first, _ in starts]),
+        ("engine ready", [ready for _, ready in starts]),
+    ):
+        print(f"{label:<28}{statistics.median(values) * 1000:>8.0f}ms{max(values) * 1000:>8.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
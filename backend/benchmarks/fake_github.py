@@ -0,0 +1,368 @@
+"""
+Local fake of the GitHub REST API, for load tests
+
+Serves the calls the GitHub integration makes: paginated issue listings
+(state, since, per_page, page with Link headers), issue create / get /
+update, and labels, milestones and assignees (with ETags). Every response
+carries X-RateLimit-* headers for the token that sent it, and requests
+over a token's budget get GitHub's 403. Configurable:
+
+- latency per request (fixed plus random jitter)
+- issues per repository and page size (so, the page count per listing)
+- rate-limit budget per token and window length
+- error injection: a fraction of requests answered with a 5xx
+- churn: source issues edited in the background, so each sync has work
+
+Every `--repo` is seeded with the same issues, so destination issue N
+mirrors source issue N; churn edits the first repository only.
+GET /_fake/stats returns request, error and rate-limit counters.
+
+Point the app at it with GITHUB_API_URL=http://127.0.0.1:<port> (any
+token is accepted). benchmarks/bench_load.py starts it for you.
+
+Usage (from backend/):
+    python -m benchmarks.fake_github --port 9100 --issues 2000 --latency-ms 40 --jitter-ms 20
+    python -m benchmarks.fake_github --port 9100 --error-rate 0.02 --rate-limit 500
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+DEFAULT_REPOS = ["load/source", "load/destination"]
+
+ISSUE_PATH = re.compile(r"^/repos/([^/]+/[^/]+)/issues(?:/(\d+))?$")
+METADATA_PATH = re.compile(r"^/repos/([^/]+/[^/]+)/(labels|milestones|assignees)$")
+
+CREATED_AT = "2026-01-01T00:00:00Z"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def make_issue(repo: str, number: int, **fields) -> Dict[str, Any]:
+    """An issue as the issues API returns it"""
+    issue = {
+        "number": number,
+        "title": f"Issue {number}",
+        "body": f"Body of issue {number}",
+        "state": "open",
+        "html_url": f"https://github.com/{repo}/issues/{number}",
+        "created_at": CREATED_AT,
+        "updated_at": CREATED_AT,
+        "labels": [],
+        "assignee": None,
+        "milestone": None,
+    }
+    issue.update(fields)
+    return issue
+
+
+class FakeGitHubState:
+    """Repositories, per-token budgets and counters shared by every handler thread"""
+
+    def __init__(self, repos: List[str], issues: int, rate_limit: int, rate_window: float):
+        self.lock = threading.Lock()
+        self.issues: Dict[str, Dict[int, Dict[str, Any]]] = {
+            repo: {number: make_issue(repo, number) for number in range(1, issues + 1)}
+            for repo in repos
+        }
+        self.labels: Dict[str, List[Dict[str, Any]]] = {repo: [] for repo in repos}
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.window_start = time.time()
+        self.used: Counter = Counter()  # token -> requests in the current window
+        self.requests: Counter = Counter()  # "METHOD route" -> count
+        self.injected_errors = 0
+        self.rate_limited = 0
+        self.churned = 0
+
+    def repo_issues(self, repo: str) -> Dict[int, Dict[str, Any]]:
+        return self.issues.setdefault(repo, {})
+
+    def charge(self, token: str) -> Tuple[bool, Dict[str, str]]:
+        """
+        Count one request against a token's budget
+
+        Returns:
+            tuple: (allowed, X-RateLimit-* headers)
+        """
+        with self.lock:
+            now = time.time()
+            if now - self.window_start >= self.rate_window:
+                self.window_start = now
+                self.used.clear()
+            allowed = self.used[token] < self.rate_limit
+            if allowed:
+                self.used[token] += 1
+            else:
+                self.rate_limited += 1
+            used = self.used[token]
+            headers = {
+                "X-RateLimit-Limit": str(self.rate_limit),
+                "X-RateLimit-Remaining": str(max(0, self.rate_limit - used)),
+                "X-RateLimit-Used": str(used),
+                "X-RateLimit-Reset": str(int(self.window_start + self.rate_window)),
+                "X-RateLimit-Resource": "core",
+            }
+            return allowed, headers
+
+    def churn(self, repo: str):
+        """Edit one random issue, the way a person working in the source would"""
+        with self.lock:
+            issues = self.repo_issues(repo)
+            if not issues:
+                return
+            issue = issues[random.choice(list(issues))]
+            issue["title"] = f"Issue {issue['number']} (edit {self.churned})"
+            if random.random() < 0.1:
+                issue["state"] = "closed" if issue["state"] == "open" else "open"
+            issue["updated_at"] = _now()
+            self.churned += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "requests": dict(self.requests),
+                "total_requests": sum(self.requests.values()),
+                "injected_errors": self.injected_errors,
+                "rate_limited": self.rate_limited,
+                "churned": self.churned,
+                "issues": {repo: len(issues) for repo, issues in self.issues.items()},
+            }
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    """Answers one request (the server attributes hold the options and state)"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # one line per request would dominate a load test
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+    def _send(self, status: int, body: Any = None, headers: Optional[Dict[str, str]] = None):
+        payload = b"" if body is None else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if body is not None:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def _handle(self, method: str):
+        state: FakeGitHubState = self.server.state
+        options = self.server.options
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        body = self._read_json() if method in ("POST", "PATCH") else {}
+
+        if url.path == "/_fake/stats":
+            self._send(200, state.stats())
+            return
+
+        route = ISSUE_PATH.sub(lambda m: "/repos/{repo}/issues" + ("/{number}" if m.group(2) else ""), url.path)
+        route = METADATA_PATH.sub(lambda m: "/repos/{repo}/" + m.group(2), route)
+        with state.lock:
+            state.requests[f"{method} {route}"] += 1
+
+        delay = options.latency_ms + random.uniform(0, options.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        token = (self.headers.get("Authorization") or "").split(" ", 1)[-1]
+        allowed, headers = state.charge(token)
+        if not allowed:
+            self._send(403, {"message": "API rate limit exceeded"}, headers)
+            return
+        if options.error_rate and random.random() < options.error_rate:
+            with state.lock:
+                state.injected_errors += 1
+            self._send(options.error_status, {"message": "Injected error"}, headers)
+            return
+
+        match = ISSUE_PATH.match(url.path)
+        if match:
+            repo, number = match.group(1), match.group(2)
+            if number is None:
+                if method == "GET":
+                    self._list_issues(repo, query, headers)
+                elif method == "POST":
+                    self._create_issue(repo, body, headers)
+                else:
+                    self._send(405, {"message": "Method not allowed"}, headers)
+            else:
+                self._issue(method, repo, int(number), body, headers)
+            return
+
+        match = METADATA_PATH.match(url.path)
+        if match:
+            self._metadata(method, match.group(1), match.group(2), body, headers)
+            return
+
+        if url.path == "/rate_limit":
+            self._send(200, {"resources": {"core": headers}}, headers)
+            return
+        self._send(404, {"message": "Not Found"}, headers)
+
+    def _list_issues(self, repo: str, query: Dict[str, str], headers: Dict[str, str]):
+        state: FakeGitHubState = self.server.state
+        wanted = query.get("state", "open")
+        since = query.get("since")
+        per_page = max(1, min(int(query.get("per_page", 30)), self.server.options.page_size))
+        page = max(1, int(query.get("page", 1)))
+        with state.lock:
+            issues = [
+                dict(issue) for _, issue in sorted(state.repo_issues(repo).items(), reverse=True)
+                if (wanted == "all" or issue["state"] == wanted) and (not since or issue["updated_at"] >= since)
+            ]
+        pages = max(1, -(-len(issues) // per_page))
+        links = []
+        base = f"http://{self.headers.get('Host')}{urlsplit(self.path).path}"
+        for rel, target in (("next", page + 1), ("last", pages)):
+            if page < pages:
+                links.append(f'<{base}?{urlencode({**query, "per_page": per_page, "page": target})}>; rel="{rel}"')
+        if links:
+            headers = {**headers, "Link": ", ".join(links)}
+        self._send(200, issues[(page - 1) * per_page:page * per_page], headers)
+
+    def _create_issue(self, repo: str, body: Dict[str, Any], headers: Dict[str, str]):
+        state: FakeGitHubState = self.server.state
+        with state.lock:
+            issues = state.repo_issues(repo)
+            number = max(issues, default=0) + 1
+            issue = make_issue(
+                repo, number,
+                title=body.get("title", ""),
+                body=body.get("body"),
+                labels=[{"name": name} for name in body.get("labels", [])],
+                created_at=_now(),
+                updated_at=_now()
+            )
+            issues[number] = issue
+        self._send(201, issue, headers)
+
+    def _issue(self, method: str, repo: str, number: int, body: Dict[str, Any], headers: Dict[str, str]):
+        state: FakeGitHubState = self.server.state
+        with state.lock:
+            issue = state.repo_issues(repo).get(number)
+            if issue is not None and method == "PATCH":
+                for field in ("title", "body", "state"):
+                    if field in body:
+                        issue[field] = body[field]
+                if "labels" in body:
+                    issue["labels"] = [{"name": name} for name in body["labels"]]
+                issue["updated_at"] = _now()
+            issue = dict(issue) if issue is not None else None
+        if issue is None:
+            self._send(404, {"message": "Not Found"}, headers)
+        elif method in ("GET", "PATCH"):
+            self._send(200, issue, headers)
+        else:
+            self._send(405, {"message": "Method not allowed"}, headers)
+
+    def _metadata(self, method: str, repo: str, kind: str, body: Dict[str, Any], headers: Dict[str, str]):
+        state: FakeGitHubState = self.server.state
+        with state.lock:
+            labels = state.labels.setdefault(repo, [])
+            if kind == "labels" and method == "POST":
+                label = {"name": body.get("name"), "color": body.get("color", "ededed")}
+                labels.append(label)
+                self._send(201, label, headers)
+                return
+            items = list(labels) if kind == "labels" else []
+        etag = f'W/"{kind}-{len(items)}"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, None, {**headers, "ETag": etag})
+            return
+        self._send(200, items, {**headers, "ETag": etag})
+
+
+def serve(options: argparse.Namespace) -> ThreadingHTTPServer:
+    """
+    Start the fake on a background thread
+
+    Args:
+        options: Parsed command-line options (see main)
+
+    Returns:
+        ThreadingHTTPServer: Running server (call shutdown() to stop it)
+    """
+    server = ThreadingHTTPServer((options.host, options.port), FakeGitHubHandler)
+    server.daemon_threads = True
+    server.options = options
+    server.state = FakeGitHubState(options.repo or DEFAULT_REPOS, options.issues, options.rate_limit, options.rate_window)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    if options.churn_per_second > 0:
+        source = (options.repo or DEFAULT_REPOS)[0]
+
+        def churn():
+            while True:
+                time.sleep(1 / options.churn_per_second)
+                server.state.churn(source)
+
+        threading.Thread(target=churn, daemon=True).start()
+    return server
+
+
+# Options shared with bench_load, which passes them through
+FAKE_OPTIONS = (
+    "issues", "page_size", "latency_ms", "jitter_ms", "rate_limit", "rate_window",
+    "error_rate", "error_status", "churn_per_second",
+)
+
+
+def add_fake_options(parser: argparse.ArgumentParser):
+    """Add the behaviour options (everything but host, port and repositories)"""
+    parser.add_argument("--issues", type=int, default=1000, help="issues seeded per repository")
+    parser.add_argument("--page-size", type=int, default=100, help="largest per_page honoured")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="random extra latency, up to this much")
+    parser.add_argument("--rate-limit", type=int, default=5000, help="requests per token per window")
+    parser.add_argument("--rate-window", type=float, default=3600.0, help="rate-limit window in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=502)
+    parser.add_argument("--churn-per-second", type=float, default=0.0, help="source issue edits per second")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--repo", action="append", help="owner/name to seed (repeatable; default load/source and load/destination)")
+    add_fake_options(parser)
+    options = parser.parse_args()
+    server = serve(options)
+    print(f"Fake GitHub API on http://{options.host}:{options.port} ({options.issues} issues per repository)", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,93 @@
 """
 Run script for Task Sync Engine
+
+    python run.py                # development: one process, reloads on code changes when DEBUG=True
+    python run.py --production   # production: one worker per CPU, tuned server settings
 """
 
+import argparse
+import importlib.util
+import os
+
 import uvicorn
+from uvicorn.supervisors import Multiprocess
+
 from app.config import settings
+from app.services.logger import logger
 
-if __name__ == "__main__":
-    uvicorn.run(
+
+class DrainingServer(uvicorn.Server):
+    """
+    uvicorn server that stops sync pushes as soon as shutdown begins
+
+    uvicorn first waits for open requests (a sync started from the API is
+    one) and only then runs the app's shutdown hook, so pushes are stopped
+    here, before that wait.
+    """
+
+    async def shutdown(self, sockets=None):
+        from app.services.sync_engine import get_sync_engine, sync_engine_ready
+        if sync_engine_ready():
+            get_sync_engine().begin_drain()
+        await super().shutdown(sockets=sockets)
+
+
+def production_config() -> uvicorn.Config:
+    """
+    Server settings for production
+
+    Workers default to one per CPU (WORKERS overrides it). The memory store
+    lives in each process, so it always runs a single worker. uvloop and
+    httptools are used when installed.
+
+    Returns:
+        uvicorn.Config: Configuration
+    """
+    workers = settings.WORKERS or os.cpu_count() or 1
+    if workers > 1 and settings.DB_BACKEND != "sqlite":
+        logger.warning("⚠️  The memory store is per process; running 1 worker (set DB_BACKEND=sqlite for more)")
+        workers = 1
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    logger.info(f"🏭 Production mode: {workers} workers, {loop} event loop, {http} HTTP parser")
+
+    return uvicorn.Config(
         "app.main:app",
         host=settings.HOST,
         port=settings.PORT,
-        reload=settings.DEBUG,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.KEEP_ALIVE_SECONDS,
+        timeout_graceful_shutdown=settings.SHUTDOWN_GRACE_SECONDS,
+        access_log=False,
         log_level="info"
     )
+
+
+def serve_production():
+    """Start the production server (a worker pool when WORKERS > 1)"""
+    config = production_config()
+    server = DrainingServer(config)
+    if config.workers > 1:
+        Multiprocess(config, target=server.run, sockets=[config.bind_socket()]).run()
+    else:
+        server.run()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Start the Task Sync Engine API server")
+    parser.add_argument("--production", action="store_true", help="Production launch mode (no reloader, worker pool)")
+    args = parser.parse_args()
+
+    if args.production:
+        serve_production()
+    else:
+        uvicorn.run(
+            "app.main:app",
+            host=settings.HOST,
+            port=settings.PORT,
+            reload=settings.DEBUG,
+            log_level="info"
+        )
@@ -0,0 +1,81 @@
+"""
+Sync rules narrow what is synced; they never delete anything
+
+Run from backend/:
+    python -m pytest -q tests
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.config import settings
+from app.services import config_store
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    """Sync engine on the mock source with a destination that mirrors every push"""
+    monkeypatch.setattr(settings, "DB_BACKEND", "memory")
+    monkeypatch.setattr(settings, "SNAPSHOT_PATH", "")
+    monkeypatch.setattr(settings, "JOURNAL_DIR", str(tmp_path / "journal"))
+    monkeypatch.setattr(settings, "CHANGE_LOG_DIR", str(tmp_path / "change_log"))
+    monkeypatch.setattr(settings, "SYNC_DIRECTION", "one_way")
+    monkeypatch.setattr(config_store, "CONFIG_FILE", str(tmp_path / "user_config.json"))
+
+    from app.services import sync_engine
+    from app.services.leader_election import LeaderElection
+    monkeypatch.setattr(sync_engine, "sync_lease", LeaderElection(str(tmp_path / "lease.db"), name="sync"))
+    engine = sync_engine.SyncEngine()
+    mirrored = {}
+
+    async def load_destination_tasks():
+        return [task.model_copy() for task in mirrored.values()]
+
+    original_push = engine.data_loader.push_to_destination
+
+    async def push_to_destination(tasks, *args, **kwargs):
+        for task in tasks:
+            mirrored[task.id] = task.model_copy()
+        return await original_push(tasks, *args, **kwargs)
+
+    monkeypatch.setattr(engine.data_loader, "load_destination_tasks", load_destination_tasks)
+    monkeypatch.setattr(engine.data_loader, "push_to_destination", push_to_destination)
+    return engine
+
+
+def set_rules(rules):
+    with open(config_store.CONFIG_FILE, "w") as f:
+        json.dump({"settings": {}, "integrations": [], "sync_rules": rules}, f)
+
+
+def test_rule_added_closes_nothing(engine):
+    first = asyncio.run(engine.sync())
+    assert first["stats"]["added"] == 3
+
+    # src-2 is medium priority: it leaves the sync scope but still exists at the source
+    set_rules([{"id": "high-only", "filters": {"priority": "high"}}])
+    second = asyncio.run(engine.sync())
+
+    assert second["stats"]["deleted"] == 0
+    assert engine.db.get_tombstones() == {}
+
+
+def test_pushed_down_rule_closes_nothing(engine, monkeypatch):
+    asyncio.run(engine.sync())
+
+    # A source that evaluates the whole filter in its query
+    original_load = engine.data_loader.load_source_tasks
+
+    async def load_source_tasks(query=None):
+        tasks = await original_load()
+        return [task for task in tasks if not query or task.priority == query["priority"]]
+
+    monkeypatch.setattr(engine.data_loader, "split_source_filters", lambda filters: (dict(filters), {}))
+    monkeypatch.setattr(engine.data_loader, "load_source_tasks", load_source_tasks)
+    set_rules([{"id": "high-only", "filters": {"priority": "high"}}])
+    second = asyncio.run(engine.sync())
+
+    assert second["stats"]["deleted"] == 0
+    assert engine.db.get_tombstones() == {}
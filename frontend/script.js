@@ -1,6 +1,11 @@
 // Task Sync Engine - Frontend JavaScript
 
 const API_BASE = '/api';
+const POLL_INTERVAL_MS = 30000;
+
+let eventSource = null;
+let pollTimer = null;
+const etags = {};
 
 // Initialize on page load
 document.addEventListener('DOMContentLoaded', () => {
@@ -8,12 +13,93 @@ document.addEventListener('DOMContentLoaded', () => {
     loadSyncStatus();
     loadSyncHistory();
     
-    // Auto-refresh every 30 seconds
-    setInterval(() => {
+    // Live updates are pushed by the server; polling is only a fallback
+    subscribeToEvents();
+});
+
+// Subscribe to server-sent sync events
+function subscribeToEvents() {
+    if (!window.EventSource) {
+        startPolling();
+        return;
+    }
+
+    eventSource = new EventSource(`${API_BASE}/events`);
+
+    eventSource.addEventListener('open', () => {
+        stopPolling();
+        setLiveStatus('🟢 Live updates');
+    });
+
+    eventSource.addEventListener('stats', (event) => {
+        updateStatusDisplay(JSON.parse(event.data));
+    });
+
+    eventSource.addEventListener('sync_started', () => {
+        showProgress(0, 'Sync started...');
+    });
+
+    eventSource.addEventListener('sync_progress', (event) => {
+        const data = JSON.parse(event.data);
+        if (data.phase === 'loaded') {
+            showProgress(0, `Loaded ${data.source_count} source and ${data.destination_count} destination tasks`);
+        } else if (data.phase === 'diffed') {
+            showProgress(0, `${data.to_add} to add, ${data.to_update} to update, ${data.to_delete} to delete`);
+        } else if (data.phase === 'pushing') {
+            showProgress(data.done / data.total, `Pushed ${data.done} of ${data.total}`);
+        }
+    });
+
+    eventSource.addEventListener('sync_completed', () => {
+        hideProgress();
+        loadSyncHistory();
+    });
+
+    eventSource.addEventListener('sync_failed', () => {
+        hideProgress();
+        loadSyncHistory();
+    });
+
+    eventSource.addEventListener('error', () => {
+        // EventSource reconnects by itself; poll meanwhile
+        startPolling();
+        if (eventSource.readyState === EventSource.CLOSED) {
+            setLiveStatus('🟠 Live updates unavailable - refreshing every 30 seconds');
+            setTimeout(subscribeToEvents, POLL_INTERVAL_MS);
+        } else {
+            setLiveStatus('🟠 Reconnecting...');
+        }
+    });
+}
+
+// Fallback: conditional polling, paused while the tab is hidden
+function startPolling() {
+    if (pollTimer) return;
+    pollTimer = setInterval(() => {
+        if (document.hidden) return;
         loadSyncStatus();
         loadSyncHistory();
-    }, 30000);
-});
+    }, POLL_INTERVAL_MS);
+}
+
+function stopPolling() {
+    clearInterval(pollTimer);
+    pollTimer = null;
+}
+
+function isLive() {
+    return eventSource !== null && eventSource.readyState === EventSource.OPEN;
+}
+
+// GET that sends the last ETag; resolves to null when nothing changed (304)
+async function fetchIfChanged(url) {
+    const headers = etags[url] ? { 'If-None-Match': etags[url] } : {};
+    const response = await fetch(url, { headers });
+    if (response.status === 304) return null;
+    const etag = response.headers.get('ETag');
+    if (etag) etags[url] = etag;
+    return response.json();
+}
 
 // Load health and system info
 async function loadHealthStatus() {
@@ -32,10 +118,9 @@ async function loadHealthStatus() {
 // Load sync status
 async function loadSyncStatus() {
     try {
-        const response = await fetch(`${API_BASE}/sync/status`);
-        const data = await response.json();
+        const data = await fetchIfChanged(`${API_BASE}/sync/status`);
         
-        if (data.status === 'ok') {
+        if (data && data.status === 'ok') {
             updateStatusDisplay(data.stats);
         }
     } catch (error) {
@@ -46,10 +131,9 @@ async function loadSyncStatus() {
 // Load sync history
 async function loadSyncHistory() {
     try {
-        const response = await fetch(`${API_BASE}/sync/history?limit=10`);
-        const data = await response.json();
+        const data = await fetchIfChanged(`${API_BASE}/sync/history?limit=10`);
         
-        if (data.status === 'ok') {
+        if (data && data.status === 'ok') {
             displayHistory(data.history);
         }
     } catch (error) {
@@ -88,11 +172,13 @@ async function triggerSync() {
                 </div>
             `;
             
-            // Refresh status and history
-            setTimeout(() => {
-                loadSyncStatus();
-                loadSyncHistory();
-            }, 500);
+            // Without live updates, refresh status and history ourselves
+            if (!isLive()) {
+                setTimeout(() => {
+                    loadSyncStatus();
+                    loadSyncHistory();
+                }, 500);
+            }
         } else {
             throw new Error(data.message || 'Sync failed');
         }
@@ -246,6 +332,21 @@ function displayHistory(history) {
     }).join('');
 }
 
+// Show sync progress (fraction between 0 and 1)
+function showProgress(fraction, text) {
+    document.getElementById('syncProgress').style.display = 'block';
+    document.getElementById('syncProgressFill').style.width = `${Math.round(fraction * 100)}%`;
+    document.getElementById('syncProgressText').textContent = text;
+}
+
+function hideProgress() {
+    document.getElementById('syncProgress').style.display = 'none';
+}
+
+function setLiveStatus(text) {
+    document.getElementById('liveStatus').textContent = text;
+}
+
 // Show error notification
 function showError(message) {
     const resultSection = document.getElementById('resultSection');